@@ -1,15 +1,58 @@
 import json
 import math
+import asyncio
 from datetime import datetime, timezone
 
+from RestApi.IxOSRestInterface import IxRestException
+
+# Chassis OS detected per chassis ip: {"version": <IxOS application versions>, "os": "Linux"/"Windows"}
+# Detection needs the full /ports list, so it is only repeated when the installed
+# IxOS software changes or the entry is forgotten (chassis unreachable / rebooting).
+_chassis_os_cache = {}
+
+def _os_from_port_list(port_list):
+    """linkState field is only in Linux Based Chassis"""
+    if 'linkState' in  port_list[0]:
+        return "Linux"
+    return "Windows"
+
+def _ixos_version_key(chassis_data):
+    """Versions of everything installed on the chassis, changes on any IxOS upgrade"""
+    return tuple(sorted((app.get("name"), app.get("version"))
+                        for app in chassis_data.get("ixosApplications", [])))
+
+def _cached_chassis_os(chassisIp, chassis_data):
+    """Return the cached OS for the chassis if it is still valid for this IxOS version"""
+    entry = _chassis_os_cache.get(chassisIp)
+    if not entry:
+        return None
+    version = _ixos_version_key(chassis_data)
+    if entry["version"] is None:
+        # learned from a ports poll, adopt the current version
+        entry["version"] = version
+    elif entry["version"] != version:
+        return None
+    return entry["os"]
+
+def _remember_chassis_os(chassisIp, chassis_data, os):
+    if os != "NA":
+        _chassis_os_cache[chassisIp] = {"version": _ixos_version_key(chassis_data), "os": os}
+
+def forget_chassis_os(chassisIp):
+    """Drop the cached OS of a chassis so the next chassis poll detects it again"""
+    _chassis_os_cache.pop(chassisIp, None)
+
 def get_chassis_os(session):
     """Method to get Chassis Type based on IP from Chassis DB"""
     try:
-        port_list = session.get_ports().data
-        #linkState field is only in Linux Based Chassis
-        if 'linkState' in  port_list[0]:
-            return "Linux"
-        return "Windows"
+        return _os_from_port_list(session.get_ports().data)
+    except Exception:
+        return "NA"
+
+async def get_chassis_os_async(session):
+    """Async version of get_chassis_os for AsyncIxRestSession"""
+    try:
+        return _os_from_port_list((await session.get_ports()).data)
     except Exception:
         return "NA"
 
@@ -25,14 +68,36 @@ def convert_size(size_bytes):
 
 def get_perf_metrics(session, chassisIp):
     """Method to get Performance Metrics from Ixia Chassis"""
-    chassis_perf_dict = {}
-    # Exception Handling for Windows Chassis
+    # Windows chassis have no perf counters; errors reaching the chassis still go to the caller
     perf = {}
     try:
         perf = session.get_perfcounters().data[0]
-    except Exception:
+    except (IndexError, AttributeError):
         pass
-    
+    except IxRestException as e:
+        if str(e).startswith(("401 ", "403 ")):
+            raise
+    return _build_perf_metrics(perf, chassisIp)
+
+async def get_perf_metrics_async(session, chassisIp):
+    """Async version of get_perf_metrics for AsyncIxRestSession"""
+    # Windows chassis have no perf counters; errors reaching the chassis still go to the caller
+    perf = {}
+    try:
+        perf = (await session.get_perfcounters()).data[0]
+    except (IndexError, AttributeError):
+        pass
+    except IxRestException as e:
+        if str(e).startswith(("401 ", "403 ")):
+            raise
+    return _build_perf_metrics(perf, chassisIp)
+
+def _build_perf_metrics(perf, chassisIp):
+    """Build the chassis_utilization_details record from a perfcounters entry,
+    None when the chassis returned no counters (no 0/0 sample in the time series)"""
+    if not perf:
+        return None
+    chassis_perf_dict = {}
     mem_bytes = int(perf.get("memoryInUseBytes", "0"))
     mem_bytes_total = int(perf.get("memoryTotalBytes", "0"))
     cpu_pert_usage = perf.get("cpuUsagePercent", "0")
@@ -40,11 +105,12 @@ def get_perf_metrics(session, chassisIp):
         mem_util = 0
     else:
         mem_util = (mem_bytes/mem_bytes_total)*100
-    last_update_at = datetime.now(timezone.utc).strftime("%m/%d/%Y, %H:%M:%S")
+    sampled_at = datetime.now(timezone.utc)
     chassis_perf_dict.update({"chassisIp": chassisIp,
                               "mem_utilization": mem_util, 
                               "cpu_utilization": cpu_pert_usage,
-                              "lastUpdatedAt_UTC": last_update_at})
+                              "lastUpdatedAt_UTC": sampled_at.strftime("%m/%d/%Y, %H:%M:%S"),
+                              "sampledAt": int(sampled_at.timestamp())})
     
     return chassis_perf_dict
     
@@ -52,26 +118,60 @@ def get_chassis_information(session):
     """ Fetch chassis information from RestPy
     We also get the perf counters in the same call
     """
-    temp_dict = {}
-    chassis_filter_dict = {}
-    no_serial_string = ""
-    mem_bytes = "NA"
-    mem_bytes_total = "NA"
-    cpu_pert_usage =  "NA"
-    os = get_chassis_os(session)
-    
     chassisInfo = session.get_chassis()
+    chassis_data = chassisInfo.data[0]
+    os = _cached_chassis_os(session.chassis_ip, chassis_data)
+    if os is None:
+        os = get_chassis_os(session)
+        _remember_chassis_os(session.chassis_ip, chassis_data, os)
+    perf = None
     try:
         # Exception Handling for Windows Chassis
         perf = session.get_perfcounters().data[0]
-        mem_bytes = convert_size(perf["memoryInUseBytes"])
-        mem_bytes_total = convert_size(perf["memoryTotalBytes"])
-        cpu_pert_usage = perf["cpuUsagePercent"]
     except Exception:
        pass
-        
+    return _build_chassis_information(chassis_data, perf, os)
+
+async def get_chassis_information_async(session):
+    """Async version of get_chassis_information for AsyncIxRestSession.
+    The chassis and perf counter requests are issued concurrently; the OS probe
+    only runs when the cached OS is missing or the IxOS version changed.
+    """
+    chassisInfo, perf = await asyncio.gather(
+        session.get_chassis(),
+        session.get_perfcounters(),
+        return_exceptions=True)
+    if isinstance(chassisInfo, BaseException):
+        raise chassisInfo
+    chassis_data = chassisInfo.data[0]
+    try:
+        # Exception Handling for Windows Chassis
+        perf = perf.data[0]
+    except Exception:
+        perf = None
+    os = _cached_chassis_os(session.chassis_ip, chassis_data)
+    if os is None:
+        os = await get_chassis_os_async(session)
+        _remember_chassis_os(session.chassis_ip, chassis_data, os)
+    return _build_chassis_information(chassis_data, perf, os)
+
+def _build_chassis_information(chassis_data, perf, os):
+    """Build the chassis_summary_details record from /chassis and /perfcounters entries"""
+    temp_dict = {}
+    chassis_filter_dict = {}
+    no_serial_string = ""
+    mem_bytes = "NA"
+    mem_bytes_total = "NA"
+    cpu_pert_usage =  "NA"
+    if perf:
+        try:
+            mem_bytes = convert_size(perf["memoryInUseBytes"])
+            mem_bytes_total = convert_size(perf["memoryTotalBytes"])
+            cpu_pert_usage = perf["cpuUsagePercent"]
+        except Exception:
+            pass
     
-    chassis_data = json.loads(json.dumps(chassisInfo.data[0]))
+    chassis_data = json.loads(json.dumps(chassis_data))
     last_update_at = datetime.now(timezone.utc).strftime("%m/%d/%Y, %H:%M:%S")
     
     if chassis_data["type"] == "Ixia_Virtual_Test_Appliance":
@@ -102,7 +202,14 @@ def get_chassis_information(session):
     
 def get_chassis_cards_information(session, ip, type_of_chassis):
     """Method to get chassis card information from Ixia Chassis using RestPy"""
-    card_list= session.get_cards().data
+    return _build_cards_information(session.get_cards().data, ip, type_of_chassis)
+
+async def get_chassis_cards_information_async(session, ip, type_of_chassis):
+    """Async version of get_chassis_cards_information for AsyncIxRestSession"""
+    return _build_cards_information((await session.get_cards()).data, ip, type_of_chassis)
+
+def _build_cards_information(card_list, ip, type_of_chassis):
+    """Build chassis_card_details records from the /cards list"""
     final_card_details_list= []
     last_update_at = datetime.now(timezone.utc).strftime("%m/%d/%Y, %H:%M:%S")
     # Cards on Chassis
@@ -123,13 +230,28 @@ def get_chassis_cards_information(session, ip, type_of_chassis):
     
 def get_chassis_ports_information(session, chassisIp, chassisType):
     """Method to get chassis port information from Ixia Chassis using RestPy"""
+    return _build_ports_information(session.get_ports().data, chassisIp, chassisType)
+
+async def get_chassis_ports_information_async(session, chassisIp, chassisType):
+    """Async version of get_chassis_ports_information for AsyncIxRestSession"""
+    return _build_ports_information((await session.get_ports()).data, chassisIp, chassisType)
+
+def _build_ports_information(port_list, chassisIp, chassisType):
+    """Build chassis_port_details records from the /ports list"""
+    if port_list:
+        # The ports poll already has the list the OS detection needs
+        os = _os_from_port_list(port_list)
+        entry = _chassis_os_cache.get(chassisIp)
+        if entry:
+            entry["os"] = os
+        else:
+            _chassis_os_cache[chassisIp] = {"version": None, "os": os}
     port_data_list = []
     used_port_details = []
     total_ports = 0
     used_ports = 0
     
     last_update_at = datetime.now(timezone.utc).strftime("%m/%d/%Y, %H:%M:%S")
-    port_list = session.get_ports().data
     
     keys_to_keep = ['owner', 
                     'transceiverModel', 
@@ -189,6 +311,16 @@ def get_license_activation(session, ip, type_chassis):
     """Method to get license information from Ixia Chassis using RestPy"""
     host_id = session.get_license_server_host_id()
     license_info = session.get_license_activation().json()
+    return _build_license_information(license_info, host_id, ip, type_chassis)
+
+async def get_license_activation_async(session, ip, type_chassis):
+    """Async version of get_license_activation for AsyncIxRestSession"""
+    host_id = await session.get_license_server_host_id()
+    license_info = (await session.get_license_activation()).json()
+    return _build_license_information(license_info, host_id, ip, type_chassis)
+
+def _build_license_information(license_info, host_id, ip, type_chassis):
+    """Build license_details_records records from the retrieved license list"""
     last_update_at = datetime.now(timezone.utc).strftime("%m/%d/%Y, %H:%M:%S")
     license_info_list= []
     for item in license_info:
@@ -209,7 +341,14 @@ def get_license_activation(session, ip, type_chassis):
 
 def get_sensor_information(session, chassis, type_chassis):
     """Method to get sensor information from Ixia Chassis using RestPy"""
-    sensor_list = session.get_sensors().json()
+    return _build_sensor_information(session.get_sensors().json(), chassis, type_chassis)
+
+async def get_sensor_information_async(session, chassis, type_chassis):
+    """Async version of get_sensor_information for AsyncIxRestSession"""
+    return _build_sensor_information((await session.get_sensors()).json(), chassis, type_chassis)
+
+def _build_sensor_information(sensor_list, chassis, type_chassis):
+    """Build chassis_sensor_details records from the /sensors list"""
     keys_to_remove = ["criticalValue", "maxValue", 'parentId', 'id','adapterName','minValue','sensorSetName', 'cpuName']
     for record in sensor_list:
         for item in keys_to_remove:
@@ -0,0 +1,228 @@
+"""
+An asyncio interface to IxOS REST APIs, the async counterpart of
+IxOSRestInterface.IxRestSession built on httpx.AsyncClient.
+
+Requests are awaited on the event loop instead of occupying a worker
+thread, so the number of chassis polled at once is bounded by sockets
+rather than by the default thread pool size.
+"""
+
+import os
+import json
+import time
+import asyncio
+import httpx
+
+from RestApi.IxOSRestInterface import IxRestException, DEFAULT_POOL_SIZE
+
+
+class AsyncIxRestSession(object):
+    """
+    class for handling HTTP requests/response for IxOS REST APIs with asyncio
+    Constructor arguments:
+    chassis_address:    addrress of the chassis
+    Optional arguments:
+        username/password:  credentials used by authenticate() and to \
+                            renew the API key on 401.
+        api_key:            API key, if already known.
+        timeout:            Time to wait (in seconds) while polling \
+                            for async operation.
+        poll_interval:      Polling inteval in seconds.
+        pool_size:          Number of keep-alive connections kept to the chassis.
+        request_timeout:    Timeout (in seconds) of a single HTTP request.
+
+    Use AsyncIxRestSession.create(...) to get an authenticated session.
+    """
+
+    def __init__(self, chassis_address, username=None, password=None, api_key=None, timeout=1200,
+                 poll_interval=2, verbose=False, pool_size=None, request_timeout=10):
+
+        self.chassis_ip = chassis_address
+        self.api_key = api_key
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.verbose = verbose
+        self._authUri = '/platform/api/v1/auth/session'
+        self.username = username
+        self.password = password
+        self.pool_size = pool_size or DEFAULT_POOL_SIZE
+        self._http = httpx.AsyncClient(
+            verify=False,
+            timeout=request_timeout,
+            limits=httpx.Limits(max_connections=self.pool_size,
+                                max_keepalive_connections=self.pool_size)
+        )
+
+    @classmethod
+    async def create(cls, chassis_address, username=None, password=None, api_key=None, **kwargs):
+        """
+        build a session and authenticate it if no api_key was provided
+        """
+        session = cls(chassis_address, username=username, password=password, api_key=api_key, **kwargs)
+        if not api_key:
+            try:
+                await session.authenticate(username=username, password=password)
+            except BaseException:
+                await session.close()
+                raise
+        return session
+
+    def get_ixos_uri(self):
+        return 'https://%s/chassis/api/v2/ixos' % self.chassis_ip
+
+    def get_headers(self):
+        # headers should at least contain these two
+        return {
+            "Content-Type": "application/json",
+            'x-api-key': self.api_key or ''
+        }
+
+    async def authenticate(self, username="admin", password="admin"):
+        """
+        we need to obtain API key to be able to perform any REST
+        calls on IxOS
+        """
+        payload = {
+            'username': username,
+            'password': password,
+            'rememberMe': False,
+            'resetWeakPassword': False,
+            'ignorePolicy': True
+        }
+        response = await self.http_request(
+            'POST',
+            'https://{address}{uri}'.format(address=self.chassis_ip,
+                                            uri=self._authUri),
+            payload=payload
+        )
+        self.api_key = response.data['apiKey']
+
+    def can_reauthenticate(self, uri):
+        """
+        a request can transparently re-authenticate when credentials are known
+        and it is not itself the authentication request
+        """
+        return bool(self.username and self.password) and uri[-len(self._authUri):] != self._authUri
+
+    async def http_request(self, method, uri, payload=None, params=None, reauthenticate=True):
+        """
+        same contract as IxRestSession.http_request: returns the response with
+        the decoded body in response.data, or the async operation result for 202
+        """
+        if not uri.startswith('http'):
+            uri = self.get_ixos_uri() + uri
+
+        body = None
+        if payload is not None:
+            body = json.dumps(payload, indent=2, sort_keys=True)
+        # the sync client sends params=" " for some operations, httpx wants a mapping
+        if not isinstance(params, dict):
+            params = None
+
+        response = await self._http.request(
+            method, uri, content=body, params=params, headers=self.get_headers()
+        )
+
+        data = None
+        try:
+            data = response.content.decode()
+            data = json.loads(data) if data else None
+        except Exception:
+            print('Invalid/Non-JSON payload received: %s' % data)
+            data = None
+
+        if response.status_code == 401 and reauthenticate and self.can_reauthenticate(uri):
+            await self.authenticate(username=self.username, password=self.password)
+            return await self.http_request(method, uri, payload=payload, params=params,
+                                           reauthenticate=False)
+
+        if str(response.status_code)[0] == '4':
+            raise IxRestException("{code} {reason}: {data}.{extraInfo}".format(
+                code=response.status_code,
+                reason=response.reason_phrase,
+                data=data,
+                extraInfo="{sep}{msg}".format(
+                    sep=os.linesep,
+                    msg="Please check that your API key is correct or call AsyncIxRestSession.authenticate(username, password) in order to obtain a new API key."
+                ) if response.status_code == 401 and uri[-len(self._authUri):] != self._authUri else ''
+            ))
+
+        if response.status_code == 202:
+            return await self.wait_for_async_operation(data)
+        response.data = data
+        return response
+
+    async def wait_for_async_operation(self, response_body):
+        """
+        method for handeling intermediate async operation results
+        """
+        operation_status = response_body['state']
+        start_time = int(time.time())
+        response = None
+        while operation_status == 'IN_PROGRESS':
+            response = await self.http_request('GET', response_body['url'])
+            response_body = response.data
+            operation_status = response_body['state']
+            if int(time.time() - start_time) > self.timeout:
+                raise IxRestException(
+                    'timeout occured while polling for async operation')
+
+            await asyncio.sleep(self.poll_interval)
+
+        if operation_status in ('SUCCESS', 'COMPLETED'):
+            return response_body['resultUrl']
+        elif operation_status == 'ERROR':
+            return response_body['message']
+        else:
+            raise IxRestException("async failed")
+
+    async def close(self):
+        """
+        close the pooled connections of this session
+        """
+        await self._http.aclose()
+
+    async def get_chassis(self, params=None):
+        return await self.http_request('GET', self.get_ixos_uri() + '/chassis', params=params)
+
+    async def get_sensors(self, params=None):
+        return await self.http_request('GET', self.get_ixos_uri() + '/sensors', params=params)
+
+    async def get_cards(self, params=None):
+        return await self.http_request('GET', self.get_ixos_uri() + '/cards', params=params)
+
+    async def get_ports(self, params=None):
+        return await self.http_request('GET', self.get_ixos_uri() + '/ports', params=params)
+
+    async def get_services(self, params=None):
+        return await self.http_request('GET', self.get_ixos_uri() + '/services', params=params)
+
+    async def get_perfcounters(self, params=None):
+        return await self.http_request('GET', self.get_ixos_uri() + '/perfcounters', params=params)
+
+    async def get_portstats(self, params=None):
+        return await self.http_request('GET', self.get_ixos_uri() + '/portstats', params=params)
+
+    async def get_license_server_host_id(self, params=None):
+        hids = []
+        url = f'https://{self.chassis_ip}/platform/api/v2/licensing/servers'
+        output = (await self.http_request('GET', url, params=params)).data
+        for lic_s in output:
+            url_for_info_fetch = f'https://{self.chassis_ip}/platform/api/v2/licensing/servers/{lic_s["id"]}/operations/retrievehostid'
+
+            resultUrl = await self.http_request('POST', url_for_info_fetch)
+            if isinstance(resultUrl, str) and "http" in resultUrl:
+                host_id_info = (await self.http_request('GET', resultUrl)).json().get("hostId", "NA")
+                hids.append(host_id_info)
+        return "::".join(hids)
+
+    async def get_license_activation(self, params=None):
+        url = f'https://{self.chassis_ip}/platform/api/v2/licensing/servers/1/operations/retrievelicenses'
+        url = await self.http_request('POST', url, params=params)
+        if isinstance(url, str):
+            # Linux Chassis: async operation returned the result url
+            return await self.http_request('GET', url, params=params)
+        else:
+            # Windows Chassis
+            id_url = f'https://{self.chassis_ip}/platform/api/v2/licensing/servers/1/operations/retrievelicenses/1/result'
+            return await self.http_request('GET', id_url, params=params)
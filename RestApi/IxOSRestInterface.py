@@ -9,6 +9,7 @@ import os
 import json
 import time
 import requests
+from requests.adapters import HTTPAdapter
 
 # handle urllib3 differences between python versions
 if sys.version_info[0] == 2 and ((sys.version_info[1] == 7 and sys.version_info[2] < 9) or sys.version_info[1] < 7):
@@ -16,6 +17,9 @@ if sys.version_info[0] == 2 and ((sys.version_info[1] == 7 and sys.version_info[
 else:
     import urllib3
 
+# default number of keep-alive connections each session keeps to its chassis
+DEFAULT_POOL_SIZE = int(os.getenv("IXOS_HTTP_POOL_SIZE", "4"))
+
 class IxRestException(Exception):
     pass
 
@@ -32,10 +36,12 @@ class IxRestSession(object):
         timeout:        Time to wait (in seconds) while polling \
                         for async operation.
         poll_interval:  Polling inteval in seconds.
+        pool_size:      Number of keep-alive connections kept to the \
+                        chassis (default IXOS_HTTP_POOL_SIZE env or 4).
     """
 
     def __init__(self, chassis_address, username=None, password=None, api_key=None,timeout=1200, 
-                 poll_interval=2, verbose=False, insecure_request_warning=False):
+                 poll_interval=2, verbose=False, insecure_request_warning=False, pool_size=None):
 
         self.chassis_ip = chassis_address
         self.api_key = api_key
@@ -46,6 +52,14 @@ class IxRestSession(object):
         self.username = username
         self.password = password
 
+        # one pooled HTTP client per session: every call after the first reuses
+        # an open TCP+TLS connection instead of paying a new handshake
+        self.pool_size = pool_size or DEFAULT_POOL_SIZE
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        self._http.mount('https://', adapter)
+        self._http.mount('http://', adapter)
+
         # ignore self sign certificate warning(s) if insecure_request_warning=False
         if not insecure_request_warning:
             try:
@@ -90,21 +104,31 @@ class IxRestSession(object):
         )
         self.api_key = response.data['apiKey']
 
-    def http_request(self, method, uri, payload=None, params=None):
+    def can_reauthenticate(self, uri):
+        """
+        a request can transparently re-authenticate when credentials are known
+        and it is not itself the authentication request
+        """
+        return bool(self.username and self.password) and uri[-len(self._authUri):] != self._authUri
+
+    def http_request(self, method, uri, payload=None, params=None, reauthenticate=True):
         """
         wrapper over requests.requests to pretty-print debug info
         and invoke async operation polling depending on HTTP status code (e.g. 202)
+        An expired API key (401) is renewed once with the stored credentials
+        so long-lived sessions can be reused across polls.
         """
         try:
             # lines with 'debug_string' can be removed without affecting the code
             if not uri.startswith('http'):
                 uri = self.get_ixos_uri() + uri
 
+            request_payload = payload
             if payload is not None:
                 payload = json.dumps(payload, indent=2, sort_keys=True)
 
             headers = self.get_headers()
-            response = requests.request(
+            response = self._http.request(
                 method, uri, data=payload, params=params,
                 headers=headers, verify=False, timeout=10
             )
@@ -118,6 +142,11 @@ class IxRestSession(object):
                 print('Invalid/Non-JSON payload received: %s' % data)
                 data = None
 
+            if response.status_code == 401 and reauthenticate and self.can_reauthenticate(uri):
+                self.authenticate(username=self.username, password=self.password)
+                return self.http_request(method, uri, payload=request_payload, params=params,
+                                         reauthenticate=False)
+
             if str(response.status_code)[0] == '4':
                 raise IxRestException("{code} {reason}: {data}.{extraInfo}".format(
                     code=response.status_code,
@@ -139,6 +168,12 @@ class IxRestSession(object):
         except:
             raise
 
+    def close(self):
+        """
+        close the pooled connections of this session
+        """
+        self._http.close()
+
     def wait_for_async_operation(self, response_body):
         """
         method for handeling intermediate async operation results
@@ -0,0 +1,111 @@
+"""
+Cache of authenticated asyncio IxOS REST sessions (AsyncIxRestSession)
+shared by all poll categories.
+
+Sessions are keyed by chassis IP and remember the credentials they were
+created with. A cached session keeps its API key between polls and only
+logs in again when the chassis answers 401 (see AsyncIxRestSession.http_request).
+Entries are dropped when the chassis is removed from chassis_credentials or its
+credentials change.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from RestApi.IxOSAsyncRestInterface import AsyncIxRestSession
+
+
+class AsyncIxRestSessionCache(object):
+    """
+    asyncio map of chassis ip -> authenticated AsyncIxRestSession
+    Concurrent callers for the same chassis share a single login. Callers
+    using a session across awaits hold it with lease(): a session evicted
+    while leased is closed once its last lease ends, not under its requests.
+    Optional arguments:
+        session_kwargs: extra keyword arguments passed to \
+                        AsyncIxRestSession.create when a new session is needed.
+    """
+
+    def __init__(self, **session_kwargs):
+        self._sessions = {}
+        self._locks = {}
+        self._leases = {}
+        self._retired = set()
+        self._session_kwargs = session_kwargs
+
+    @staticmethod
+    def _credentials(chassis):
+        return (chassis["ip"], chassis["username"], chassis["password"])
+
+    async def get(self, chassis):
+        """
+        return a cached session for the chassis dict (ip/username/password),
+        authenticating a new one if there is none or the credentials changed
+        """
+        credentials = self._credentials(chassis)
+        entry = self._sessions.get(chassis["ip"])
+        if entry and entry[0] == credentials:
+            return entry[1]
+
+        lock = self._locks.setdefault(chassis["ip"], asyncio.Lock())
+        async with lock:
+            # another task may have logged in while we waited for the lock
+            entry = self._sessions.get(chassis["ip"])
+            if entry and entry[0] == credentials:
+                return entry[1]
+            session = await AsyncIxRestSession.create(
+                chassis["ip"], chassis["username"], chassis["password"], **self._session_kwargs)
+            self._sessions[chassis["ip"]] = (credentials, session)
+        if entry:
+            await self._retire(entry[1])
+        return session
+
+    @asynccontextmanager
+    async def lease(self, chassis):
+        """
+        async with cache.lease(chassis) as session: use the session returned
+        by get(), keeping it open until the block exits even if it is evicted
+        """
+        session = await self.get(chassis)
+        self._leases[session] = self._leases.get(session, 0) + 1
+        try:
+            yield session
+        finally:
+            self._leases[session] -= 1
+            if not self._leases[session]:
+                del self._leases[session]
+                if session in self._retired:
+                    self._retired.discard(session)
+                    await session.close()
+
+    async def _retire(self, session):
+        """close an evicted session now, or when its last lease ends"""
+        if self._leases.get(session):
+            self._retired.add(session)
+        else:
+            await session.close()
+
+    async def invalidate(self, chassis_ip, session=None):
+        """
+        forget the session of a chassis, next get() logs in again
+        With session, only that instance is evicted: a caller reporting a
+        failed session must not throw away a newer one another task created.
+        """
+        entry = self._sessions.get(chassis_ip)
+        if not entry or (session is not None and entry[1] is not session):
+            return
+        del self._sessions[chassis_ip]
+        await self._retire(entry[1])
+
+    async def prune(self, chassis_list):
+        """drop sessions for chassis no longer configured or whose credentials changed"""
+        current = {c["ip"]: self._credentials(c) for c in chassis_list}
+        for ip in list(self._sessions):
+            if current.get(ip) != self._sessions[ip][0]:
+                await self.invalidate(ip)
+        for ip in list(self._locks):
+            if ip not in current:
+                del self._locks[ip]
+
+    def __len__(self):
+        return len(self._sessions)
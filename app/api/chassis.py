@@ -1,69 +1,99 @@
 """
 Chassis API endpoints
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import List
-from app.models.chassis import ChassisResponse, ChassisListResponse
+from app.models.chassis import ChassisResponse, ChassisListResponse, ChassisPollStateResponse
 from app.database import read_data_from_database, read_tags, delete_chassis_from_database
+from app.inventory_views import inventory_views, view_response
 
 router = APIRouter(prefix="/api/chassis", tags=["chassis"])
 
 
-@router.get("")
-async def get_chassis():
-    """Get chassis summary details"""
-    try:
-        # Get tags for chassis
-        ip_tags_dict = await read_tags(type_of_update="chassis")
+async def _build_chassis_view() -> dict:
+    """Build the chassis list response from the database"""
+    # Get tags for chassis
+    ip_tags_dict = await read_tags(type_of_update="chassis")
+    
+    # Read chassis data from database
+    records = await read_data_from_database(table_name="chassis_summary_details")
+    
+    # Transform records to response format
+    list_of_chassis = []
+    for record in records:
+        tags = record.get("tags", "")
+        tags_list = tags.split(",") if tags else []
         
-        # Read chassis data from database
-        records = await read_data_from_database(table_name="chassis_summary_details")
+        # Merge tags from ip_tags_dict if available
+        if record["ip"] in ip_tags_dict:
+            tags_list = ip_tags_dict[record["ip"]]
         
-        # Transform records to response format
-        list_of_chassis = []
-        for record in records:
-            tags = record.get("tags", "")
-            tags_list = tags.split(",") if tags else []
-            
-            # Merge tags from ip_tags_dict if available
-            if record["ip"] in ip_tags_dict:
-                tags_list = ip_tags_dict[record["ip"]]
-            
-            # Convert physicalCards to string (handles None, "NA", or numeric values)
-            physical_cards = record["physicalCards"]
-            if physical_cards is None:
-                physical_cards = "NA"
-            else:
-                physical_cards = str(physical_cards)
-            
-            # Create chassis data using field names (not aliases) so frontend can use dot notation
-            chassis_data = {
-                "chassisIp": record["ip"],
-                "chassisSerialNumber": record["chassisSN"],  # Use field name, not alias
-                "controllerSerialNumber": record["controllerSN"],  # Use field name, not alias
-                "chassisType": record["type_of_chassis"],
-                "physicalCardsNumber": physical_cards,  # Use field name, not alias
-                "chassisStatus": record["status_status"],
-                "lastUpdatedAt_UTC": record["lastUpdatedAt_UTC"],
-                "IxOS": record["ixOS"],
-                "IxNetworkProtocols": record["ixNetwork_Protocols"],  # Use field name
-                "IxOSREST": record["ixOS_REST"],  # Use field name
-                "tags": tags_list,
-                "mem_bytes": str(record["mem_bytes"]),
-                "mem_bytes_total": str(record["mem_bytes_total"]),
-                "cpu_pert_usage": str(record["cpu_pert_usage"]),
-                "os": record["os"],
-                "chassisRole": record.get("chassisRole", "NA")
-            }
-            # Use dict directly (already using field names, not aliases)
-            # This ensures the frontend gets consistent field names
-            list_of_chassis.append(chassis_data)
+        # Convert physicalCards to string (handles None, "NA", or numeric values)
+        physical_cards = record["physicalCards"]
+        if physical_cards is None:
+            physical_cards = "NA"
+        else:
+            physical_cards = str(physical_cards)
         
-        return {"chassis": list_of_chassis, "count": len(list_of_chassis)}
+        # Create chassis data using field names (not aliases) so frontend can use dot notation
+        chassis_data = {
+            "chassisIp": record["ip"],
+            "chassisSerialNumber": record["chassisSN"],  # Use field name, not alias
+            "controllerSerialNumber": record["controllerSN"],  # Use field name, not alias
+            "chassisType": record["type_of_chassis"],
+            "physicalCardsNumber": physical_cards,  # Use field name, not alias
+            "chassisStatus": record["status_status"],
+            "lastUpdatedAt_UTC": record["lastUpdatedAt_UTC"],
+            "IxOS": record["ixOS"],
+            "IxNetworkProtocols": record["ixNetwork_Protocols"],  # Use field name
+            "IxOSREST": record["ixOS_REST"],  # Use field name
+            "tags": tags_list,
+            "mem_bytes": str(record["mem_bytes"]),
+            "mem_bytes_total": str(record["mem_bytes_total"]),
+            "cpu_pert_usage": str(record["cpu_pert_usage"]),
+            "os": record["os"],
+            "chassisRole": record.get("chassisRole", "NA")
+        }
+        # Use dict directly (already using field names, not aliases)
+        # This ensures the frontend gets consistent field names
+        list_of_chassis.append(chassis_data)
+    
+    return {"chassis": list_of_chassis, "count": len(list_of_chassis)}
+
+
+@router.get("")
+async def get_chassis(request: Request):
+    """Get chassis summary details"""
+    try:
+        body, etag = await inventory_views().get_json(
+            "chassis", ("chassis_summary_details", "user_ip_tags"), _build_chassis_view)
+        return view_response(request, body, etag)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching chassis data: {str(e)}")
 
 
+@router.get("/poll-state", response_model=List[ChassisPollStateResponse])
+async def get_chassis_poll_state():
+    """Get the poller circuit breaker state of every chassis that has failed to respond"""
+    try:
+        records = await read_data_from_database(table_name="chassis_poll_state")
+    except Exception as e:
+        if "no such table" in str(e):
+            return []
+        raise HTTPException(status_code=500, detail=f"Error fetching chassis poll state: {str(e)}")
+    return [
+        {
+            "chassisIp": record["ip"],
+            "state": record["state"],
+            "consecutiveFailures": record["consecutiveFailures"] or 0,
+            "nextProbeAt": record["nextProbeAt"],
+            "lastError": record["lastError"] or "",
+            "lastUpdatedAt_UTC": record["lastUpdatedAt_UTC"]
+        }
+        for record in records
+    ]
+
+
 @router.delete("/{chassis_ip}")
 async def delete_chassis(chassis_ip: str):
     """Delete a chassis and all related data from the database"""
@@ -104,7 +104,9 @@ async def set_polling_intervals(request: PollingIntervalsRequest):
             sensors=request.sensors,
             licensing=request.licensing,
             perf=request.perf,
-            data_purge=request.purge
+            data_purge=request.purge,
+            max_concurrency=request.maxConcurrency,
+            per_chassis_concurrency=request.perChassisConcurrency
         )
         
         return PollingIntervalsResponse(
@@ -1,39 +1,46 @@
 """
 Licenses API endpoints
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from app.models.licenses import LicenseResponse, LicenseListResponse
 from app.database import read_data_from_database
+from app.inventory_views import inventory_views, view_response
 
 router = APIRouter(prefix="/api/licenses", tags=["licenses"])
 
 
+async def _build_licenses_view() -> LicenseListResponse:
+    """Build the license list response from the database"""
+    # Read license data from database
+    records = await read_data_from_database(table_name="license_details_records")
+    
+    # Transform records to response format
+    list_of_licenses = []
+    for record in records:
+        license_data = {
+            "chassisIp": record["chassisIp"],
+            "typeOfChassis": record["typeOfChassis"],
+            "hostId": record["hostId"],
+            "partNumber": record["partNumber"],
+            "activationCode": record["activationCode"],
+            "quantity": record["quantity"],
+            "description": record["description"],
+            "maintenanceDate": record["maintenanceDate"],
+            "expiryDate": record["expiryDate"],
+            "isExpired": record["isExpired"],
+            "lastUpdatedAt_UTC": record["lastUpdatedAt_UTC"]
+        }
+        list_of_licenses.append(LicenseResponse(**license_data))
+    
+    return LicenseListResponse(licenses=list_of_licenses, count=len(list_of_licenses))
+
+
 @router.get("", response_model=LicenseListResponse)
-async def get_licenses():
+async def get_licenses(request: Request):
     """Get license details"""
     try:
-        # Read license data from database
-        records = await read_data_from_database(table_name="license_details_records")
-        
-        # Transform records to response format
-        list_of_licenses = []
-        for record in records:
-            license_data = {
-                "chassisIp": record["chassisIp"],
-                "typeOfChassis": record["typeOfChassis"],
-                "hostId": record["hostId"],
-                "partNumber": record["partNumber"],
-                "activationCode": record["activationCode"],
-                "quantity": record["quantity"],
-                "description": record["description"],
-                "maintenanceDate": record["maintenanceDate"],
-                "expiryDate": record["expiryDate"],
-                "isExpired": record["isExpired"],
-                "lastUpdatedAt_UTC": record["lastUpdatedAt_UTC"]
-            }
-            list_of_licenses.append(LicenseResponse(**license_data))
-        
-        return LicenseListResponse(licenses=list_of_licenses, count=len(list_of_licenses))
+        body, etag = await inventory_views().get_json("licenses", ("license_details_records",), _build_licenses_view)
+        return view_response(request, body, etag)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching license data: {str(e)}")
 
@@ -1,14 +1,58 @@
 """
 Performance metrics API endpoints
 """
-from fastapi import APIRouter, HTTPException
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from typing import Dict, List, Literal, Optional
 import json
-from app.models.performance import PerformanceMetricResponse, PerformanceMetricListResponse, ChassisListForMetrics, ChassisListItem
-from app.database import get_perf_metrics_from_db, read_username_password_from_database
+from datetime import datetime, timezone
+import pandas as pd
+import time
+from app.models.performance import (PerformanceMetricResponse, PerformanceMetricListResponse, ChassisListForMetrics,
+                                    ChassisListItem, FleetSeries, FleetMetricsResponse)
+from app.database import (get_perf_metrics_from_db, get_fleet_perf_metrics_from_db, read_username_password_from_database,
+                          FLEET_BUCKET_SECONDS)
 
 router = APIRouter(prefix="/api/performance", tags=["performance"])
 
+# Upper bound on points per request, keeps every response a bounded index scan
+PERF_METRICS_MAX_LIMIT = 5000
+
+
+def format_sampled_at(sampled_at: int) -> str:
+    """Render an epoch sample time in the UTC string format the UI has always received"""
+    return datetime.fromtimestamp(sampled_at, timezone.utc).strftime("%m/%d/%Y, %H:%M:%S")
+
+
+def _none_if_nan(value):
+    return None if pd.isna(value) else float(value)
+
+
+def aggregate_metrics(records: List[Dict], window: Optional[int] = None) -> Dict[str, Dict]:
+    """Vectorized mem/cpu percentiles over records, plus moving averages when window is set
+    
+    The moving averages are added to each record in place as mem_moving_avg / cpu_moving_avg.
+    """
+    if not records:
+        return {}
+    frame = pd.DataFrame.from_records(records, columns=["mem_utilization", "cpu_utilization"]).astype(float)
+    quantiles = frame.quantile([0.5, 0.95, 0.99])
+    summary = {}
+    for name, column in (("mem", "mem_utilization"), ("cpu", "cpu_utilization")):
+        summary[name] = {
+            "min": _none_if_nan(frame[column].min()),
+            "avg": _none_if_nan(frame[column].mean()),
+            "max": _none_if_nan(frame[column].max()),
+            "p50": _none_if_nan(quantiles.at[0.5, column]),
+            "p95": _none_if_nan(quantiles.at[0.95, column]),
+            "p99": _none_if_nan(quantiles.at[0.99, column]),
+        }
+    if window:
+        moving = frame.rolling(window, min_periods=1).mean()
+        for record, mem_avg, cpu_avg in zip(records, moving["mem_utilization"], moving["cpu_utilization"]):
+            record["mem_moving_avg"] = _none_if_nan(mem_avg)
+            record["cpu_moving_avg"] = _none_if_nan(cpu_avg)
+    return summary
+
 
 @router.get("/chassis-list", response_model=ChassisListForMetrics)
 async def get_chassis_list():
@@ -26,8 +70,19 @@ async def get_chassis_list():
 
 
 @router.get("/metrics/{ip}", response_model=PerformanceMetricListResponse)
-async def get_performance_metrics_by_ip(ip: str):
-    """Get performance metrics for a specific chassis IP"""
+async def get_performance_metrics_by_ip(
+    ip: str,
+    start: Optional[int] = Query(None, alias="from", description="Oldest sample time, unix epoch seconds"),
+    end: Optional[int] = Query(None, alias="to", description="Exclusive newest sample time, unix epoch seconds"),
+    limit: int = Query(10, ge=1, le=PERF_METRICS_MAX_LIMIT, description="Newest points of the range to return"),
+    bucket: Literal["raw", "5m", "1h"] = Query("raw", description="Raw samples or 5 minute / 1 hour rollups"),
+    window: Optional[int] = Query(None, ge=2, le=PERF_METRICS_MAX_LIMIT, description="Moving average window in points"),
+):
+    """Get performance metrics for a specific chassis IP
+    
+    Returns the newest `limit` points in [from, to), oldest first, with mem/cpu
+    percentiles over those points and optional moving averages.
+    """
     try:
         if ip == "fresh":
             return PerformanceMetricListResponse(
@@ -36,27 +91,69 @@ async def get_performance_metrics_by_ip(ip: str):
                 chassisIp=None
             )
         
-        records = await get_perf_metrics_from_db(ip)
+        records = await get_perf_metrics_from_db(ip, start=start, end=end, limit=limit, bucket=bucket)
+        summary = aggregate_metrics(records, window)
         
         # Transform records to response format
         metrics_list = []
         for record in records:
-            metric_data = {
-                "chassisIp": record["chassisIp"],
-                "mem_utilization": float(record["mem_utilization"]),
-                "cpu_utilization": float(record["cpu_utilization"]),
-                "lastUpdatedAt_UTC": record["lastUpdatedAt_UTC"]
-            }
-            metrics_list.append(PerformanceMetricResponse(**metric_data))
-        
-        # Return last 10 records
-        metrics_list = metrics_list[-10:]
+            record["lastUpdatedAt_UTC"] = format_sampled_at(record["sampledAt"])
+            metrics_list.append(PerformanceMetricResponse(**record))
         
         return PerformanceMetricListResponse(
             metrics=metrics_list,
             count=len(metrics_list),
-            chassisIp=ip
+            chassisIp=ip,
+            bucket=bucket,
+            summary=summary
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching performance metrics: {str(e)}")
 
+
+@router.get("/fleet", response_model=FleetMetricsResponse)
+async def get_fleet_performance_metrics(
+    ips: Optional[str] = Query(None, description="Comma separated chassis IPs"),
+    tag: Optional[str] = Query(None, description="Include every chassis carrying this tag"),
+    start: Optional[int] = Query(None, alias="from", description="Oldest bucket start, unix epoch seconds"),
+    end: Optional[int] = Query(None, alias="to", description="Exclusive end, unix epoch seconds (default now)"),
+    limit: int = Query(288, ge=1, le=PERF_METRICS_MAX_LIMIT, description="Maximum buckets per chassis"),
+    bucket: Literal["1m", "5m", "1h"] = Query("5m", description="Bucket size the series are aligned on"),
+):
+    """Get aligned utilization series for several chassis in one columnar response
+    
+    The range is [from, to) trimmed to the newest `limit` buckets, so payload size
+    is bounded by limit times the number of chassis.
+    """
+    ip_list = [ip.strip() for ip in ips.split(",") if ip.strip()] if ips else []
+    if not ip_list and not tag:
+        raise HTTPException(status_code=400, detail="Either 'ips' or 'tag' must be provided")
+    try:
+        size = FLEET_BUCKET_SECONDS[bucket]
+        end = int(time.time()) if end is None else end
+        oldest = ((end - 1) // size - (limit - 1)) * size
+        start = oldest if start is None else max(start, oldest)
+        
+        records = await get_fleet_perf_metrics_from_db(ip_list, tag, start, end, bucket)
+        timestamps: List[int] = []
+        chassis = {}
+        if records:
+            frame = pd.DataFrame.from_records(records)
+            # One row per bucket, one column per chassis; missing buckets become null
+            mem = frame.pivot(index="bucketStart", columns="chassisIp", values="mem_utilization")
+            cpu = frame.pivot(index="bucketStart", columns="chassisIp", values="cpu_utilization")
+            mem = mem.astype(object).where(mem.notna(), None)
+            cpu = cpu.astype(object).where(cpu.notna(), None)
+            timestamps = [int(ts) for ts in mem.index]
+            chassis = {ip: FleetSeries(mem=mem[ip].tolist(), cpu=cpu[ip].tolist()) for ip in mem.columns}
+        
+        return FleetMetricsResponse(
+            bucket=bucket,
+            start=start,
+            end=end,
+            timestamps=timestamps,
+            chassis=chassis,
+            count=len(chassis)
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching fleet performance metrics: {str(e)}")
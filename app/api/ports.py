@@ -4,15 +4,19 @@ Ports API endpoints
 import asyncio
 import json
 import os
-from fastapi import APIRouter, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Request
 import httpx
 from app.models.ports import PortResponse, PortListResponse, ReleaseOwnershipRequest, ReleaseOwnershipResponse
 from app.database import read_data_from_database, read_username_password_from_database
+from app.inventory_views import encode_view, inventory_views, view_response
 from RestApi.IxOSRestInterface import IxRestSession
 
 router = APIRouter(prefix="/api/ports", tags=["ports"])
 
 SESSIONS_URL = os.getenv("SESSIONS_URL", "http://host.docker.internal:8080/sessions/")
+# The session map is shared by port list requests for this many seconds
+SESSIONS_CACHE_TTL = float(os.getenv("SESSIONS_CACHE_TTL", "10"))
 
 
 async def _build_session_map() -> dict:
@@ -37,6 +41,28 @@ async def _build_session_map() -> dict:
         return {}
 
 
+# (loaded at, session map) of the last /sessions/ fetch
+_session_map_cache: Optional[tuple] = None
+_session_map_lock = asyncio.Lock()
+
+
+async def _cached_session_map() -> dict:
+    """_build_session_map() fetched at most once per SESSIONS_CACHE_TTL.
+    An unchanged map keeps the previous object, so responses built from it stay valid."""
+    global _session_map_cache
+    loop = asyncio.get_running_loop()
+    if _session_map_cache is not None and loop.time() - _session_map_cache[0] < SESSIONS_CACHE_TTL:
+        return _session_map_cache[1]
+    async with _session_map_lock:
+        if _session_map_cache is not None and loop.time() - _session_map_cache[0] < SESSIONS_CACHE_TTL:
+            return _session_map_cache[1]
+        session_map = await _build_session_map()
+        if _session_map_cache is not None and _session_map_cache[1] == session_map:
+            session_map = _session_map_cache[1]
+        _session_map_cache = (loop.time(), session_map)
+        return session_map
+
+
 def _lookup_session(session_map: dict, record: dict) -> str:
     """Return session name for a port record, or 'NA' if not found."""
     if not session_map:
@@ -81,64 +107,82 @@ def _lookup_session(session_map: dict, record: dict) -> str:
     return "NA"
 
 
+async def _build_ports_view() -> List[tuple]:
+    """Build the port list from the database, as (port fields, record) pairs: the live
+    ixNetworkSession of each port is looked up from the record per request"""
+    records = await read_data_from_database(table_name="chassis_port_details")
+    
+    # Helper function to convert 'NA' or invalid values to None for integers
+    def to_int_or_none(value):
+        if value is None or value == '' or value == 'NA':
+            return None
+        try:
+            return int(value)
+        except (ValueError, TypeError):
+            return None
+    
+    # Helper function to handle portNumber as either int or string (for fullyQualifiedPortName like "4.2")
+    def to_port_number(value):
+        if value is None or value == '' or value == 'NA':
+            return None
+        # If it's already a string that looks like a fully qualified name (e.g., "4.2"), return as-is
+        if isinstance(value, str) and '.' in value:
+            return value
+        # Try to convert to int, but if it fails, return as string
+        try:
+            return int(value)
+        except (ValueError, TypeError):
+            # If conversion fails, return as string (might be a fully qualified name)
+            return str(value) if value else None
+    
+    # Transform records to response format
+    port_list = []
+    for record in records:
+        port_data = {
+            "chassisIp": record["chassisIp"],
+            "typeOfChassis": record["typeOfChassis"],
+            "cardNumber": to_int_or_none(record.get("cardNumber")),
+            "portNumber": to_port_number(record.get("portNumber")),
+            "linkState": record.get("linkState", "NA"),
+            "phyMode": record.get("phyMode", "NA"),
+            "transceiverModel": record.get("transceiverModel", "NA"),
+            "transceiverManufacturer": record.get("transceiverManufacturer", "NA"),
+            "owner": record.get("owner", "Free"),
+            "speed": record.get("speed", "NA"),
+            "type": record.get("type", "NA"),
+            "totalPorts": to_int_or_none(record.get("totalPorts")),
+            "ownedPorts": to_int_or_none(record.get("ownedPorts")),
+            "freePorts": to_int_or_none(record.get("freePorts")),
+            "transmitState": record.get("transmitState", "NA"),
+            "lastUpdatedAt_UTC": record.get("lastUpdatedAt_UTC", ""),
+        }
+        port_list.append((port_data, record))
+    return port_list
+
+
+# (port view, session map, body, ETag) of the last encoded response
+_ports_response: Optional[tuple] = None
+
+
 @router.get("", response_model=PortListResponse)
-async def get_ports():
+async def get_ports(request: Request):
     """Get port details"""
+    global _ports_response
     try:
-        # Read port data from database and fetch live session mapping in parallel
-        records, session_map = await asyncio.gather(
-            read_data_from_database(table_name="chassis_port_details"),
-            _build_session_map()
+        # Read the port view and the cached live session mapping in parallel
+        ports, session_map = await asyncio.gather(
+            inventory_views().get("ports", ("chassis_port_details",), _build_ports_view),
+            _cached_session_map()
         )
-        
-        # Helper function to convert 'NA' or invalid values to None for integers
-        def to_int_or_none(value):
-            if value is None or value == '' or value == 'NA':
-                return None
-            try:
-                return int(value)
-            except (ValueError, TypeError):
-                return None
-        
-        # Helper function to handle portNumber as either int or string (for fullyQualifiedPortName like "4.2")
-        def to_port_number(value):
-            if value is None or value == '' or value == 'NA':
-                return None
-            # If it's already a string that looks like a fully qualified name (e.g., "4.2"), return as-is
-            if isinstance(value, str) and '.' in value:
-                return value
-            # Try to convert to int, but if it fails, return as string
-            try:
-                return int(value)
-            except (ValueError, TypeError):
-                # If conversion fails, return as string (might be a fully qualified name)
-                return str(value) if value else None
-        
-        # Transform records to response format
-        port_list = []
-        for record in records:
-            port_data = {
-                "chassisIp": record["chassisIp"],
-                "typeOfChassis": record["typeOfChassis"],
-                "cardNumber": to_int_or_none(record.get("cardNumber")),
-                "portNumber": to_port_number(record.get("portNumber")),
-                "linkState": record.get("linkState", "NA"),
-                "phyMode": record.get("phyMode", "NA"),
-                "transceiverModel": record.get("transceiverModel", "NA"),
-                "transceiverManufacturer": record.get("transceiverManufacturer", "NA"),
-                "owner": record.get("owner", "Free"),
-                "speed": record.get("speed", "NA"),
-                "type": record.get("type", "NA"),
-                "totalPorts": to_int_or_none(record.get("totalPorts")),
-                "ownedPorts": to_int_or_none(record.get("ownedPorts")),
-                "freePorts": to_int_or_none(record.get("freePorts")),
-                "transmitState": record.get("transmitState", "NA"),
-                "lastUpdatedAt_UTC": record.get("lastUpdatedAt_UTC", ""),
-                "ixNetworkSession": _lookup_session(session_map, record),
-            }
-            port_list.append(PortResponse(**port_data))
-        
-        return PortListResponse(ports=port_list, count=len(port_list))
+        # Encoded once per (port view, session map) pair, not once per request
+        if _ports_response is None or _ports_response[0] is not ports or _ports_response[1] is not session_map:
+            port_list = [
+                PortResponse(**port_data, ixNetworkSession=_lookup_session(session_map, record))
+                for port_data, record in ports
+            ]
+            response = PortListResponse(ports=port_list, count=len(port_list))
+            _ports_response = (ports, session_map, *encode_view(response))
+        return view_response(request, _ports_response[2], _ports_response[3])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching port data: {str(e)}")
 
@@ -1,35 +1,42 @@
 """
 Sensors API endpoints
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from app.models.sensors import SensorResponse, SensorListResponse
 from app.database import read_data_from_database
+from app.inventory_views import inventory_views, view_response
 
 router = APIRouter(prefix="/api/sensors", tags=["sensors"])
 
 
+async def _build_sensors_view() -> SensorListResponse:
+    """Build the sensor list response from the database"""
+    # Read sensor data from database
+    records = await read_data_from_database(table_name="chassis_sensor_details")
+    
+    # Transform records to response format
+    sensor_list = []
+    for record in records:
+        sensor_data = {
+            "chassisIp": record["chassisIp"],
+            "typeOfChassis": record["typeOfChassis"],
+            "sensorType": record["sensorType"],
+            "sensorName": record["sensorName"],
+            "sensorValue": record["sensorValue"],
+            "unit": record["unit"],
+            "lastUpdatedAt_UTC": record["lastUpdatedAt_UTC"]
+        }
+        sensor_list.append(SensorResponse(**sensor_data))
+    
+    return SensorListResponse(sensors=sensor_list, count=len(sensor_list))
+
+
 @router.get("", response_model=SensorListResponse)
-async def get_sensors():
+async def get_sensors(request: Request):
     """Get sensor details"""
     try:
-        # Read sensor data from database
-        records = await read_data_from_database(table_name="chassis_sensor_details")
-        
-        # Transform records to response format
-        sensor_list = []
-        for record in records:
-            sensor_data = {
-                "chassisIp": record["chassisIp"],
-                "typeOfChassis": record["typeOfChassis"],
-                "sensorType": record["sensorType"],
-                "sensorName": record["sensorName"],
-                "sensorValue": record["sensorValue"],
-                "unit": record["unit"],
-                "lastUpdatedAt_UTC": record["lastUpdatedAt_UTC"]
-            }
-            sensor_list.append(SensorResponse(**sensor_data))
-        
-        return SensorListResponse(sensors=sensor_list, count=len(sensor_list))
+        body, etag = await inventory_views().get_json("sensors", ("chassis_sensor_details",), _build_sensors_view)
+        return view_response(request, body, etag)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching sensor data: {str(e)}")
 
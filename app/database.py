@@ -4,22 +4,59 @@ Async database utilities for SQLite
 import aiosqlite
 import json
 import os
+import time
 import asyncio
-from typing import List, Dict, Optional, Any
+import weakref
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import List, Dict, Optional, Any, Tuple
 
 DATABASE_PATH = os.getenv("DATABASE_PATH", "inventory.db")
 
-# Semaphore to limit concurrent database writes and prevent locking
-# SQLite doesn't handle concurrent writes well, so we serialize them
-_db_write_semaphore = asyncio.Semaphore(1)
+# Connection pool sizing: SQLite allows a single writer, WAL lets readers run alongside it
+DB_POOL_READERS = int(os.getenv("DB_POOL_READERS", "4"))
+# Idle connections are checked with a trivial query before reuse after this many seconds
+DB_POOL_HEALTH_CHECK_SECONDS = float(os.getenv("DB_POOL_HEALTH_CHECK_SECONDS", "30"))
+# How long a writer waits for another process (API vs. poller) to release the write lock
+DB_BUSY_TIMEOUT_SECONDS = float(os.getenv("DB_BUSY_TIMEOUT_SECONDS", "30"))
+# Write batches submitted within this window of the first one share a transaction and fsync
+DB_GROUP_COMMIT_WINDOW_MS = float(os.getenv("DB_GROUP_COMMIT_WINDOW_MS", "100"))
+# Group commits are only logged when a batch failed or waited longer than this to commit
+DB_GROUP_COMMIT_LOG_MS = float(os.getenv("DB_GROUP_COMMIT_LOG_MS", "1000"))
 
-# Semaphore for reads - allows more concurrency
-_db_read_semaphore = asyncio.Semaphore(10)
+# Process-local cache of chassis metadata (type, os, role) from chassis_summary_details.
+# Dropped whenever this process writes that table; the TTL picks up writes made by
+# other processes (API manual polls vs. the background poller).
+CHASSIS_METADATA_TTL = float(os.getenv("CHASSIS_METADATA_TTL", "300"))
+_chassis_metadata_cache: Optional[Dict[str, Dict[str, str]]] = None
+_chassis_metadata_loaded_at = 0.0
 
+# Performance metrics retention: raw samples are rolled up into 5 minute and 1 hour
+# buckets and only kept for PERF_RAW_RETENTION_HOURS. Buckets younger than
+# PERF_ROLLUP_GRACE_SECONDS are left open for samples still being written.
+PERF_RAW_RETENTION_HOURS = float(os.getenv("PERF_RAW_RETENTION_HOURS", "48"))
+PERF_ROLLUP_5M_RETENTION_DAYS = float(os.getenv("PERF_ROLLUP_5M_RETENTION_DAYS", "30"))
+PERF_ROLLUP_1H_RETENTION_DAYS = float(os.getenv("PERF_ROLLUP_1H_RETENTION_DAYS", "400"))
+PERF_ROLLUP_GRACE_SECONDS = int(os.getenv("PERF_ROLLUP_GRACE_SECONDS", "120"))
 
-async def get_db_connection(timeout: float = 30.0):
-    """Get async connection to sqlite3 database with timeout"""
-    conn = await aiosqlite.connect(DATABASE_PATH, timeout=timeout)
+# (bucket seconds, table, source table): each rollup reads the one before it
+UTILIZATION_ROLLUPS = (
+    (300, "chassis_utilization_rollup_5m", "chassis_utilization_details"),
+    (3600, "chassis_utilization_rollup_1h", "chassis_utilization_rollup_5m"),
+)
+
+
+async def get_db_connection(timeout: float = DB_BUSY_TIMEOUT_SECONDS, daemon: bool = False):
+    """Get async connection to sqlite3 database with timeout (the SQLite busy_timeout)
+    
+    daemon=True is for long-lived (pooled) connections: their worker thread must not keep
+    the interpreter alive at exit if the event loop stops without closing them.
+    """
+    connector = aiosqlite.connect(DATABASE_PATH, timeout=timeout)
+    if daemon:
+        # aiosqlite < 0.20 connections are threads themselves, newer ones own a _thread
+        getattr(connector, "_thread", connector).daemon = True
+    conn = await connector
     conn.row_factory = aiosqlite.Row
     # Enable WAL mode for better concurrency
     try:
@@ -30,356 +67,654 @@ async def get_db_connection(timeout: float = 30.0):
     return conn
 
 
-async def write_data_to_database(table_name: str, records: List[Dict], ip_tags_dict: Optional[Dict] = None, max_retries: int = 3, retry_count: int = 0):
-    """Write polled data inside sqlite3 DB with proper error handling and retry logic for locking"""
-    # Use semaphore to serialize writes and prevent database locking
-    async with _db_write_semaphore:
-        conn = None
+class ConnectionPool:
+    """Long-lived aiosqlite connections: one writer and up to `readers` readers.
+
+    Connections are opened (and their pragmas applied) once and then reused, so a
+    query no longer pays for a connect and a WAL pragma round trip. A connection
+    idle for more than DB_POOL_HEALTH_CHECK_SECONDS, or whose last user hit an
+    error, is checked with SELECT 1 before reuse and reopened if it is broken.
+    """
+
+    def __init__(self, database_path: str, readers: int):
+        self.database_path = database_path
+        self.readers = readers
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._writer_lock = asyncio.Lock()
+        self._reader_slots = asyncio.Semaphore(readers)
+        self._idle_readers: List[aiosqlite.Connection] = []
+        self._last_used: Dict[int, float] = {}
+        self._suspect = set()
+        self._watcher: Optional[aiosqlite.Connection] = None
+        self._watcher_lock = asyncio.Lock()
+        self._watcher_opened = 0
+        self.group_commit = GroupCommitQueue(self)
+
+    async def _open(self) -> aiosqlite.Connection:
+        conn = await get_db_connection(daemon=True)
+        self._last_used[id(conn)] = time.monotonic()
+        return conn
+
+    async def _discard(self, conn: aiosqlite.Connection):
+        self._last_used.pop(id(conn), None)
+        self._suspect.discard(id(conn))
         try:
-            conn = await get_db_connection()
-            tags = ""
-            
-            # For chassis_summary_details, use selective update with grace period for failures
-            # This ensures we only update records we actually polled, preventing race conditions
-            # where background poller overwrites data from manual refresh
-            if table_name == "chassis_summary_details":
-                # Get list of IPs we're updating
-                chassis_ips_to_update = [r["chassisIp"] for r in records]
-                
-                # For failed chassis, check if we have recent good data (within last 5 minutes)
-                # If so, preserve the good data instead of overwriting with "Not Reachable"
-                failed_chassis = [r for r in records if r.get("chassisStatus") == "Not Reachable"]
-                successful_chassis = [r for r in records if r.get("chassisStatus") != "Not Reachable"]
-                
-                # Get existing data for failed chassis to check timestamps
-                if failed_chassis:
-                    failed_ips = [r["chassisIp"] for r in failed_chassis]
-                    placeholders_failed = ','.join('?' * len(failed_ips))
-                    cursor = await conn.execute(
-                        f"SELECT ip, lastUpdatedAt_UTC, status_status FROM {table_name} WHERE ip IN ({placeholders_failed})",
-                        failed_ips
-                    )
-                    existing_failed = await cursor.fetchall()
-                    await cursor.close()
-                    
-                    # Filter out failed chassis that have recent good data (within 5 minutes)
-                    # This prevents overwriting good data with temporary failures
-                    from datetime import datetime, timedelta
-                    grace_period = timedelta(minutes=5)
-                    now = datetime.now()
-                    
-                    chassis_to_skip = set()
-                    for existing in existing_failed:
-                        # Row objects support dictionary-like access
-                        ip = existing["ip"]
-                        last_updated_str = existing["lastUpdatedAt_UTC"]
-                        # Safely access status_status (Row objects support dict-like access)
-                        try:
-                            status = existing["status_status"]
-                        except (KeyError, AttributeError, IndexError):
-                            status = ""
-                        
-                        # Only preserve if status was good (not "Not Reachable") and data is recent
-                        if status != "Not Reachable" and status and last_updated_str:
-                            try:
-                                # Try parsing different datetime formats
-                                try:
-                                    last_updated = datetime.strptime(last_updated_str, "%Y-%m-%d %H:%M:%S")
-                                except:
-                                    try:
-                                        last_updated = datetime.strptime(last_updated_str, "%m/%d/%Y, %H:%M:%S")
-                                    except:
-                                        # If we can't parse, skip preservation logic
-                                        continue
-                                
-                                if now - last_updated < grace_period:
-                                    chassis_to_skip.add(ip)
-                                    print(f"[DB] Preserving recent good data for {ip} (updated {last_updated_str}, status: {status})")
-                            except Exception as e:
-                                # If datetime parsing fails, continue without preserving
-                                pass
-                    
-                    # Filter out chassis we're skipping from failed list
-                    failed_chassis = [r for r in failed_chassis if r["chassisIp"] not in chassis_to_skip]
-                    # Add skipped chassis back to records to process as successful (preserve existing)
-                    for existing in existing_failed:
-                        if existing["ip"] in chassis_to_skip:
-                            # Don't add back, we'll keep the existing record
-                            pass
-                
-                # Delete only records for IPs we're actually updating (successful + failed without grace period)
-                all_update_ips = [r["chassisIp"] for r in successful_chassis + failed_chassis]
-                if all_update_ips:
-                    placeholders = ','.join('?' * len(all_update_ips))
-                    await conn.execute(f"DELETE FROM {table_name} WHERE ip IN ({placeholders})", all_update_ips)
-                
-                # Insert successful records and failed records (that didn't have recent good data)
-                for record in (successful_chassis + failed_chassis):
-                    if ip_tags_dict:
-                        tags = ip_tags_dict.get(record["chassisIp"])
-                        if tags:
-                            tags = ",".join(tags)
-                        else:
-                            tags = ""
-                    else:
-                        tags = ""
-                    
-                    record.update({"tags": tags})
-                    
-                    # Insert all records, including failed ones with "Not Reachable" status
-                    # This ensures the UI always shows the latest state for polled chassis
-                    await conn.execute(f"""INSERT INTO {table_name} (ip, chassisSN, controllerSN, type_of_chassis,
-                        physicalCards, status_status, ixOS, ixNetwork_Protocols, ixOS_REST, tags, lastUpdatedAt_UTC,
-                        mem_bytes, mem_bytes_total, cpu_pert_usage, os, chassisRole) VALUES
-                        (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'), ?, ?, ?, ?, ?)""",
-                        (record["chassisIp"], record['chassisSerial#'],
-                        record['controllerSerial#'], record['chassisType'], record['physicalCards#'],
-                        record['chassisStatus'],
-                        record.get('IxOS', "NA"), record.get('IxNetwork Protocols',"NA"), record.get('IxOS REST',"NA"), record['tags'],
-                        record.get('mem_bytes', '0'), record.get('mem_bytes_total', '0'), record.get('cpu_pert_usage', '0'),
-                        record['os'], record.get('chassisRole', 'NA')))
-            elif table_name != "chassis_utilization_details":
-                # For other tables, clear all records as before
-                await conn.execute(f"DELETE FROM {table_name}")
+            await conn.close()
+        except Exception:
+            pass
+
+    async def _checked(self, conn: Optional[aiosqlite.Connection]) -> aiosqlite.Connection:
+        """Return conn if it is usable, otherwise a freshly opened connection"""
+        if conn is None:
+            return await self._open()
+        idle = time.monotonic() - self._last_used.get(id(conn), 0.0)
+        if id(conn) in self._suspect or idle > DB_POOL_HEALTH_CHECK_SECONDS:
+            try:
+                await conn.execute("SELECT 1")
+                self._suspect.discard(id(conn))
+            except Exception:
+                await self._discard(conn)
+                return await self._open()
+        return conn
+
+    @asynccontextmanager
+    async def writer(self):
+        """Exclusive use of the writer connection inside a BEGIN IMMEDIATE transaction
         
-                # Process other table types (only if not chassis_summary_details, which we handled above)
-                for record in records:
-                    if table_name == "license_details_records":
-                        for rcd in record:
-                            await conn.execute(f"""INSERT INTO {table_name} (chassisIp, typeOfChassis, hostId, partNumber, 
-                                activationCode, quantity, description, maintenanceDate, expiryDate, isExpired, lastUpdatedAt_UTC) VALUES 
-                                (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))""",
-                                (rcd["chassisIp"], rcd["typeOfChassis"],
-                                rcd["hostId"], rcd["partNumber"],
-                                rcd["activationCode"], str(rcd["quantity"]), rcd["description"],
-                                rcd["maintenanceDate"], rcd["expiryDate"], str(rcd["isExpired"])))
-                    
-                    if table_name == "chassis_card_details":
-                        for rcd in record:
-                            if ip_tags_dict:
-                                tags = ip_tags_dict.get(rcd.get("chassisIp"))
-                                if tags:
-                                    tags = ",".join(tags)
-                                else:
-                                    tags = ""
-                            else:
-                                tags = ""    
-                            rcd.update({"tags": tags})
-                            await conn.execute(f"""INSERT INTO {table_name} (chassisIp,typeOfChassis,cardNumber,serialNumber,cardType,cardState,numberOfPorts,tags,
-                                lastUpdatedAt_UTC) VALUES 
-                                (?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))""",
-                                (rcd["chassisIp"], rcd["chassisType"], rcd["cardNumber"], rcd["serialNumber"],
-                                rcd["cardType"], rcd["cardState"], rcd["numberOfPorts"], rcd['tags']))
-                    
-                    if table_name == "chassis_port_details":
-                        for rcd in record:
-                            await conn.execute(f"""INSERT INTO {table_name} (chassisIp,typeOfChassis,cardNumber,portNumber,linkState,phyMode,transceiverModel,
-                                transceiverManufacturer,owner, speed, type, totalPorts,ownedPorts,freePorts, transmitState, lastUpdatedAt_UTC) VALUES 
-                                (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))""",
-                                (rcd["chassisIp"], rcd["typeOfChassis"], rcd["cardNumber"], rcd["portNumber"], rcd.get("linkState", "NA"),
-                                rcd.get("phyMode","NA"), rcd.get("transceiverModel", "NA"), rcd.get("transceiverManufacturer", "NA"), rcd["owner"],
-                                rcd.get("speed", "NA"), rcd.get("type", "NA"), rcd["totalPorts"], rcd["ownedPorts"], rcd["freePorts"], rcd.get('transmitState','NA')))
-                    
-                    if table_name == "chassis_sensor_details":
-                        for rcd in record:
-                            unit = rcd["unit"]
-                            if rcd["unit"] == "CELSIUS": 
-                                unit = f'{rcd["value"]} {chr(176)}C'
-                            if rcd["unit"] == "AMPERSEND": 
-                                unit = "AMP"
-                            await conn.execute(f"""INSERT INTO {table_name} (chassisIp,typeOfChassis,sensorType,sensorName,sensorValue,unit,lastUpdatedAt_UTC) VALUES 
-                                (?, ?, ?, ?, ?, ?, datetime('now'))""",
-                                (rcd["chassisIp"], rcd["typeOfChassis"], rcd.get("type", "NA"), rcd["name"],
-                                rcd["value"], unit))
-            
-            if table_name == "chassis_utilization_details":
-                for record in records:
-                    await conn.execute(f"""INSERT INTO {table_name} (chassisIp,mem_utilization,cpu_utilization,lastUpdatedAt_UTC) VALUES 
-                        (?, ?, ?, ?)""",
-                        (record["chassisIp"], record["mem_utilization"], record["cpu_utilization"], record["lastUpdatedAt_UTC"]))
-            
-            await conn.commit()
-        except Exception as e:
-            if conn:
+        Work left uncommitted is committed on exit and rolled back on error.
+        """
+        async with self._writer_lock:
+            conn = self._writer = await self._checked(self._writer)
+            try:
+                # Take the database write lock up front: waiting for another process goes
+                # through busy_timeout instead of failing when a deferred transaction upgrades
+                await conn.execute("BEGIN IMMEDIATE")
+                yield conn
+                if conn.in_transaction:
+                    await conn.commit()
+            except BaseException:
+                self._suspect.add(id(conn))
                 try:
                     await conn.rollback()
                 except Exception:
                     pass
-            
-            # Handle SQLite locking errors - retry with exponential backoff
-            error_str = str(e).lower()
-            if ("locking" in error_str or "database is locked" in error_str or 
-                ("operationalerror" in error_str and "locking" in error_str)):
-                retry_count += 1
-                if retry_count < max_retries:
-                    wait_time = 0.5 * retry_count  # Exponential backoff: 0.5s, 1s, 1.5s
-                    print(f"[DB] Database locking error for {table_name}, retrying in {wait_time}s ({retry_count}/{max_retries})...")
-                    await asyncio.sleep(wait_time)
-                    # Close connection before retry
-                    if conn:
-                        try:
-                            await conn.close()
-                        except Exception:
-                            pass
-                    # Retry the entire write operation
-                    return await write_data_to_database(table_name, records, ip_tags_dict, max_retries, retry_count)
-                else:
-                    print(f"[DB] Database locking error persisted after {max_retries} retries for {table_name}: {e}")
-            
-            raise e
-        finally:
-            if conn:
-                try:
-                    await conn.close()
-                except Exception:
-                    pass
+                raise
+            finally:
+                self._last_used[id(conn)] = time.monotonic()
+
+    @asynccontextmanager
+    async def reader(self):
+        """Use of an idle reader connection, opening one if fewer than `readers` exist"""
+        async with self._reader_slots:
+            conn = await self._checked(self._idle_readers.pop() if self._idle_readers else None)
+            try:
+                yield conn
+            except BaseException:
+                self._suspect.add(id(conn))
+                raise
+            finally:
+                self._last_used[id(conn)] = time.monotonic()
+                self._idle_readers.append(conn)
+
+    async def data_version(self) -> Tuple[int, int]:
+        """PRAGMA data_version of a dedicated connection that never writes, so it changes
+        whenever any other connection (this pool's writer or another process) commits.
+        
+        Returned with the number of times the connection was opened: the counter starts
+        over on a reopened connection.
+        """
+        async with self._watcher_lock:
+            conn = await self._checked(self._watcher)
+            if conn is not self._watcher:
+                self._watcher = conn
+                self._watcher_opened += 1
+            try:
+                cursor = await conn.execute("PRAGMA data_version")
+                row = await cursor.fetchone()
+            except BaseException:
+                self._suspect.add(id(conn))
+                raise
+            finally:
+                self._last_used[id(conn)] = time.monotonic()
+        return self._watcher_opened, row[0]
+
+    async def close(self):
+        await self.group_commit.drain()
+        async with self._writer_lock:
+            if self._writer is not None:
+                await self._discard(self._writer)
+                self._writer = None
+        async with self._watcher_lock:
+            if self._watcher is not None:
+                await self._discard(self._watcher)
+                self._watcher = None
+        while self._idle_readers:
+            await self._discard(self._idle_readers.pop())
+
+
+class GroupCommitQueue:
+    """Write batches submitted by every caller on the loop, committed together.
+
+    The first batch of a group waits DB_GROUP_COMMIT_WINDOW_MS for others (poll
+    categories finishing close together) and the whole group is applied in
+    submission order in a single BEGIN IMMEDIATE transaction on the pool's writer
+    connection. Each batch runs in its own savepoint, so a failing batch is rolled
+    back and reported to its caller without affecting the others. Every group
+    commit logs the latency of each batch from submission to commit.
+    """
+
+    def __init__(self, pool: "ConnectionPool", window_ms: float = DB_GROUP_COMMIT_WINDOW_MS):
+        self.pool = pool
+        self.window = window_ms / 1000
+        self._pending: List[Tuple[Any, asyncio.Future, str, float]] = []
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def submit(self, write, label: str = "") -> Any:
+        """Run `await write(conn)` in the next group commit and return its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((write, future, label, loop.time()))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush())
+        return await future
+
+    async def drain(self):
+        """Wait until every submitted batch is committed"""
+        while self._flusher is not None and not self._flusher.done():
+            await asyncio.shield(self._flusher)
+
+    async def _flush(self):
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            # Keep the group open until the window of its oldest batch has passed
+            delay = self._pending[0][3] + self.window - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            batches, self._pending = self._pending, []
+            await self._commit(batches)
+
+    async def _commit(self, batches: List[Tuple[Any, asyncio.Future, str, float]]):
+        outcomes = []
+        try:
+            async with self.pool.writer() as conn:
+                for write, future, _, _ in batches:
+                    await conn.execute("SAVEPOINT write_batch")
+                    try:
+                        result = await write(conn)
+                    except Exception as e:
+                        await conn.execute("ROLLBACK TO write_batch")
+                        outcomes.append((future, None, e))
+                    else:
+                        outcomes.append((future, result, None))
+                    await conn.execute("RELEASE write_batch")
+                await conn.commit()
+        except Exception as e:
+            # Nothing was committed: every batch of the group gets the error
+            outcomes = [(future, None, e) for _, future, _, _ in batches]
+        committed = asyncio.get_running_loop().time()
+        failed = sum(1 for _, _, error in outcomes if error is not None)
+        if failed or (committed - min(submitted for *_, submitted in batches)) * 1000 > DB_GROUP_COMMIT_LOG_MS:
+            # Submission to commit latency of the batches, per label
+            latencies: Dict[str, List[float]] = {}
+            for _, _, label, submitted in batches:
+                latencies.setdefault(label or "write", []).append((committed - submitted) * 1000)
+            report = ", ".join(
+                f"{label} {values[0]:.0f}ms" if len(values) == 1 else
+                f"{label} x{len(values)} avg {sum(values) / len(values):.0f}ms max {max(values):.0f}ms"
+                for label, values in latencies.items())
+            print(f"[DB] Group commit of {len(batches)} batch(es), {failed} failed: {report}")
+        for future, result, error in outcomes:
+            if future.done():
+                continue  # caller was cancelled
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+# One pool per event loop: asyncio locks and aiosqlite futures belong to the loop that
+# created them, and the API, the poller and scripts using asyncio.run each have their own
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ConnectionPool]" = weakref.WeakKeyDictionary()
+
+
+def db_pool() -> ConnectionPool:
+    """Get the connection pool of the running event loop"""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = ConnectionPool(DATABASE_PATH, DB_POOL_READERS)
+    return pool
+
+
+def db_reader():
+    """async with db_reader() as conn: run queries on a pooled reader connection"""
+    return db_pool().reader()
+
+
+def db_writer():
+    """async with db_writer() as conn: run writes on the pooled writer connection (commit explicitly)"""
+    return db_pool().writer()
+
+
+async def db_write(write, label: str = "") -> Any:
+    """await db_write(write): run `await write(conn)` as one batch of the next group commit.
+    write must not commit; its result is returned once the group is committed.
+    label names the batch in the group commit latency log."""
+    return await db_pool().group_commit.submit(write, label)
+
+
+async def close_db_pool():
+    """Close the pooled connections of the running event loop"""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.close()
+
+
+async def _bump_inventory_generation(conn, *tables: str):
+    """Mark tables as changed for the API inventory views, inside the writer's transaction"""
+    await conn.executemany("""INSERT INTO inventory_generation (tableName, generation) VALUES (?, 1)
+        ON CONFLICT (tableName) DO UPDATE SET generation = generation + 1""", [(table,) for table in tables])
+
+
+async def read_inventory_generations() -> Dict[str, int]:
+    """Get the generation of every inventory table written since the database was created"""
+    async with db_reader() as conn:
+        cursor = await conn.execute("SELECT tableName, generation FROM inventory_generation")
+        return {table: generation for table, generation in await cursor.fetchall()}
+
+
+def _tags_for(ip_tags_dict: Optional[Dict], chassis_ip: str) -> str:
+    """Comma separated user tags of a chassis, "" when there are none"""
+    if ip_tags_dict:
+        tags = ip_tags_dict.get(chassis_ip)
+        if tags:
+            return ",".join(tags)
+    return ""
+
+
+def _sensor_unit(rcd: Dict) -> str:
+    unit = rcd["unit"]
+    if rcd["unit"] == "CELSIUS": 
+        unit = f'{rcd["value"]} {chr(176)}C'
+    if rcd["unit"] == "AMPERSEND": 
+        unit = "AMP"
+    return unit
+
+
+def _sampled_at(record: Dict) -> int:
+    """Epoch seconds of a perf record, falling back to its "%m/%d/%Y, %H:%M:%S" UTC string"""
+    if record.get("sampledAt") is not None:
+        return int(record["sampledAt"])
+    sampled = datetime.strptime(record["lastUpdatedAt_UTC"], "%m/%d/%Y, %H:%M:%S")
+    return int(sampled.replace(tzinfo=timezone.utc).timestamp())
+
+
+_SUMMARY_INSERT = """INSERT INTO chassis_summary_details (ip, chassisSN, controllerSN, type_of_chassis,
+        physicalCards, status_status, ixOS, ixNetwork_Protocols, ixOS_REST, tags, lastUpdatedAt_UTC,
+        mem_bytes, mem_bytes_total, cpu_pert_usage, os, chassisRole, pollGeneration) VALUES
+        (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'), ?, ?, ?, ?, ?, ?)"""
+
+# Summary rows of chassis that could not be polled: a new chassis gets the placeholder row,
+# a known one keeps its last good data and timestamp
+_SUMMARY_FAILURE_UPSERT = _SUMMARY_INSERT + """
+        ON CONFLICT(ip) DO UPDATE SET status_status = excluded.status_status, pollGeneration = excluded.pollGeneration
+        WHERE excluded.pollGeneration > chassis_summary_details.pollGeneration"""
+
+# INSERT statement and row builder of each polled table. Rows are built before the
+# writer connection is taken, so the write lock only covers the executemany calls.
+_INVENTORY_INSERTS = {
+    "chassis_summary_details": (
+        _SUMMARY_INSERT + """
+        ON CONFLICT(ip) DO UPDATE SET chassisSN = excluded.chassisSN, controllerSN = excluded.controllerSN,
+        type_of_chassis = excluded.type_of_chassis, physicalCards = excluded.physicalCards,
+        status_status = excluded.status_status, ixOS = excluded.ixOS, ixNetwork_Protocols = excluded.ixNetwork_Protocols,
+        ixOS_REST = excluded.ixOS_REST, tags = excluded.tags, lastUpdatedAt_UTC = excluded.lastUpdatedAt_UTC,
+        mem_bytes = excluded.mem_bytes, mem_bytes_total = excluded.mem_bytes_total,
+        cpu_pert_usage = excluded.cpu_pert_usage, os = excluded.os, chassisRole = excluded.chassisRole,
+        pollGeneration = excluded.pollGeneration
+        WHERE excluded.pollGeneration > chassis_summary_details.pollGeneration""",
+        lambda record, ip_tags_dict: (
+            record["chassisIp"], record['chassisSerial#'],
+            record['controllerSerial#'], record['chassisType'], record['physicalCards#'],
+            record['chassisStatus'],
+            record.get('IxOS', "NA"), record.get('IxNetwork Protocols',"NA"), record.get('IxOS REST',"NA"),
+            _tags_for(ip_tags_dict, record["chassisIp"]),
+            record.get('mem_bytes', '0'), record.get('mem_bytes_total', '0'), record.get('cpu_pert_usage', '0'),
+            record['os'], record.get('chassisRole', 'NA'), record.get('pollGeneration') or time.time_ns())
+    ),
+    "license_details_records": (
+        """INSERT INTO license_details_records (chassisIp, typeOfChassis, hostId, partNumber, 
+        activationCode, quantity, description, maintenanceDate, expiryDate, isExpired, lastUpdatedAt_UTC) VALUES 
+        (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))""",
+        lambda rcd, ip_tags_dict: (
+            rcd["chassisIp"], rcd["typeOfChassis"],
+            rcd["hostId"], rcd["partNumber"],
+            rcd["activationCode"], str(rcd["quantity"]), rcd["description"],
+            rcd["maintenanceDate"], rcd["expiryDate"], str(rcd["isExpired"]))
+    ),
+    "chassis_card_details": (
+        """INSERT INTO chassis_card_details (chassisIp,typeOfChassis,cardNumber,serialNumber,cardType,cardState,numberOfPorts,tags,
+        lastUpdatedAt_UTC) VALUES 
+        (?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+        ON CONFLICT(chassisIp, cardNumber) DO UPDATE SET typeOfChassis = excluded.typeOfChassis,
+        serialNumber = excluded.serialNumber, cardType = excluded.cardType, cardState = excluded.cardState,
+        numberOfPorts = excluded.numberOfPorts, tags = excluded.tags, lastUpdatedAt_UTC = excluded.lastUpdatedAt_UTC""",
+        lambda rcd, ip_tags_dict: (
+            rcd["chassisIp"], rcd["chassisType"], rcd["cardNumber"], rcd["serialNumber"],
+            rcd["cardType"], rcd["cardState"], rcd["numberOfPorts"], _tags_for(ip_tags_dict, rcd.get("chassisIp")))
+    ),
+    "chassis_port_details": (
+        """INSERT INTO chassis_port_details (chassisIp,typeOfChassis,cardNumber,portNumber,linkState,phyMode,transceiverModel,
+        transceiverManufacturer,owner, speed, type, totalPorts,ownedPorts,freePorts, transmitState, lastUpdatedAt_UTC) VALUES 
+        (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+        ON CONFLICT(chassisIp, cardNumber, portNumber) DO UPDATE SET typeOfChassis = excluded.typeOfChassis,
+        linkState = excluded.linkState, phyMode = excluded.phyMode, transceiverModel = excluded.transceiverModel,
+        transceiverManufacturer = excluded.transceiverManufacturer, owner = excluded.owner, speed = excluded.speed,
+        type = excluded.type, totalPorts = excluded.totalPorts, ownedPorts = excluded.ownedPorts,
+        freePorts = excluded.freePorts, transmitState = excluded.transmitState, lastUpdatedAt_UTC = excluded.lastUpdatedAt_UTC""",
+        lambda rcd, ip_tags_dict: (
+            rcd["chassisIp"], rcd["typeOfChassis"], rcd["cardNumber"], rcd["portNumber"], rcd.get("linkState", "NA"),
+            rcd.get("phyMode","NA"), rcd.get("transceiverModel", "NA"), rcd.get("transceiverManufacturer", "NA"), rcd["owner"],
+            rcd.get("speed", "NA"), rcd.get("type", "NA"), rcd["totalPorts"], rcd["ownedPorts"], rcd["freePorts"], rcd.get('transmitState','NA'))
+    ),
+    "chassis_sensor_details": (
+        """INSERT INTO chassis_sensor_details (chassisIp,typeOfChassis,sensorType,sensorName,sensorValue,unit,lastUpdatedAt_UTC) VALUES 
+        (?, ?, ?, ?, ?, ?, datetime('now'))
+        ON CONFLICT(chassisIp, sensorName) DO UPDATE SET typeOfChassis = excluded.typeOfChassis,
+        sensorType = excluded.sensorType, sensorValue = excluded.sensorValue, unit = excluded.unit,
+        lastUpdatedAt_UTC = excluded.lastUpdatedAt_UTC""",
+        lambda rcd, ip_tags_dict: (
+            rcd["chassisIp"], rcd["typeOfChassis"], rcd.get("type", "NA"), rcd["name"],
+            rcd["value"], _sensor_unit(rcd))
+    ),
+    "chassis_utilization_details": (
+        """INSERT INTO chassis_utilization_details (chassisIp,mem_utilization,cpu_utilization,sampledAt) VALUES 
+        (?, ?, ?, ?)""",
+        lambda record, ip_tags_dict: (
+            record["chassisIp"], float(record["mem_utilization"]), float(record["cpu_utilization"]),
+            _sampled_at(record))
+    ),
+}
+
+# Tables whose records are lists of rows per chassis
+_PER_CHASSIS_TABLES = ("license_details_records", "chassis_card_details", "chassis_port_details", "chassis_sensor_details")
+
+# Natural keys (besides chassisIp) of the upserted tables, as (column, position in the row).
+# Each has a unique index on (chassisIp, key columns), see db_queries.inventory_key_indexes.
+# Licenses have no reliable key and are replaced per chassis instead.
+_INVENTORY_KEYS = {
+    "chassis_card_details": (("cardNumber", 2),),
+    "chassis_port_details": (("cardNumber", 2), ("portNumber", 3)),
+    "chassis_sensor_details": (("sensorName", 3),),
+}
+
+
+async def _delete_missing_keys(conn, table_name: str, chassis_ips: List[str], rows: List[tuple]):
+    """Delete rows of the polled chassis_ips whose key was not written in this batch
+    (a card pulled out, a port gone), so upserts leave no leftovers behind. A polled
+    chassis without any row in `rows` loses all of its rows."""
+    key = _INVENTORY_KEYS[table_name]
+    columns = ", ".join(column for column, _ in key)
+    written: Dict[str, set] = {chassis_ip: set() for chassis_ip in chassis_ips}
+    for row in rows:
+        # Key columns have TEXT affinity, compare with the stored text
+        written.setdefault(row[0], set()).add(tuple(None if row[i] is None else str(row[i]) for _, i in key))
+    for chassis_ip, keys in written.items():
+        if not keys:
+            await conn.execute(f"DELETE FROM {table_name} WHERE chassisIp = ?", (chassis_ip,))
+            continue
+        values = ", ".join(["(" + ", ".join("?" * len(key)) + ")"] * len(keys))
+        params = [chassis_ip] + [value for k in keys for value in k]
+        await conn.execute(
+            f"DELETE FROM {table_name} WHERE chassisIp = ? AND ({columns}) NOT IN (VALUES {values})", params)
+
+
+def build_inventory_rows(table_name: str, records: List, ip_tags_dict: Optional[Dict] = None) -> List[tuple]:
+    """Turn polled records into INSERT parameter tuples for table_name.
+    
+    Per-chassis tables take one (chassis ip, list of records) pair per polled chassis,
+    the others one record per chassis.
+    """
+    build_row = _INVENTORY_INSERTS[table_name][1]
+    if table_name in _PER_CHASSIS_TABLES:
+        return [build_row(rcd, ip_tags_dict) for _, chassis_records in records for rcd in chassis_records]
+    return [build_row(record, ip_tags_dict) for record in records]
+
+
+async def write_data_to_database(table_name: str, records: List, ip_tags_dict: Optional[Dict] = None):
+    """Write polled data inside sqlite3 DB as one batch of the next group commit
+    
+    For per-chassis tables the rows of every chassis in records are replaced, also
+    when its list is empty: a chassis that now has no licenses keeps none.
+    """
+    insert_sql = _INVENTORY_INSERTS[table_name][0]
+    # Build every row before queueing so the write lock only covers the SQL
+    rows = build_inventory_rows(table_name, records, ip_tags_dict)
+    
+    async def _write(conn):
+        if table_name == "chassis_summary_details":
+            # Rows carry the generation of the poll that produced them and only replace rows
+            # of older polls, so manual refreshes and background polls can't clobber each
+            # other. Failed polls keep the last good data and only update status and generation.
+            failed_ips = {r["chassisIp"] for r in records if r.get("chassisStatus") == "Not Reachable"}
+            polled_rows = [row for row in rows if row[0] not in failed_ips]
+            failed_rows = [row for row in rows if row[0] in failed_ips]
+            if polled_rows:
+                await conn.executemany(insert_sql, polled_rows)
+            if failed_rows:
+                await conn.executemany(_SUMMARY_FAILURE_UPSERT, failed_rows)
+            await _bump_inventory_generation(conn, table_name)
+            return
+        if table_name == "license_details_records":
+            # Replace only the chassis present in this batch, so results can be written
+            # as each chassis completes without emptying the table for readers.
+            # Chassis that are no longer configured are removed by delete_stale_chassis_rows.
+            batch_ips = sorted({chassis_ip for chassis_ip, _ in records})
+            if batch_ips:
+                placeholders = ','.join('?' * len(batch_ips))
+                await conn.execute(f"DELETE FROM {table_name} WHERE chassisIp IN ({placeholders})", batch_ips)
+        
+        # One executemany per batch instead of one round trip per row. Keyed tables are
+        # upserted in place, then keys that disappeared from a polled chassis are deleted.
+        if rows:
+            await conn.executemany(insert_sql, rows)
+        if table_name in _INVENTORY_KEYS:
+            await _delete_missing_keys(conn, table_name, [chassis_ip for chassis_ip, _ in records], rows)
+        await _bump_inventory_generation(conn, table_name)
+    
+    await db_write(_write, table_name)
+    if table_name == "chassis_summary_details":
+        invalidate_chassis_metadata()
+
+
+async def delete_stale_chassis_rows(table_name: str, chassis_ips: List[str]) -> int:
+    """Delete rows of chassis that are not in chassis_ips (no longer configured/polled)
+    
+    Returns:
+        Number of rows deleted
+    """
+    async def _delete(conn):
+        if chassis_ips:
+            placeholders = ','.join('?' * len(chassis_ips))
+            cursor = await conn.execute(
+                f"DELETE FROM {table_name} WHERE chassisIp NOT IN ({placeholders})", chassis_ips)
+        else:
+            cursor = await conn.execute(f"DELETE FROM {table_name}")
+        if cursor.rowcount:
+            await _bump_inventory_generation(conn, table_name)
+        return cursor.rowcount
+    
+    return await db_write(_delete, f"{table_name} stale rows")
+
+
+async def write_chassis_poll_state(records: List[Dict]):
+    """Persist circuit breaker state of chassis (ip, state, consecutiveFailures, nextProbeAt, lastError)"""
+    if not records:
+        return
+    async def _write(conn):
+        await conn.executemany("""INSERT OR REPLACE INTO chassis_poll_state
+            (ip, state, consecutiveFailures, nextProbeAt, lastError, lastUpdatedAt_UTC)
+            VALUES (?, ?, ?, ?, ?, datetime('now'))""",
+            [(record["ip"], record["state"], record["consecutiveFailures"],
+              record.get("nextProbeAt"), record.get("lastError", "")) for record in records])
+    
+    await db_write(_write, "chassis_poll_state")
+
+
+async def mark_chassis_suspended(chassis_ips: List[str]):
+    """Show chassis whose polling is suspended by the circuit breaker as 'Suspended',
+    keeping the rest of their last known summary data"""
+    if not chassis_ips:
+        return
+    placeholders = ','.join('?' * len(chassis_ips))
+    
+    async def _write(conn):
+        await conn.execute(
+            f"UPDATE chassis_summary_details SET status_status = 'Suspended' WHERE ip IN ({placeholders})",
+            chassis_ips)
+        await _bump_inventory_generation(conn, "chassis_summary_details")
+    
+    await db_write(_write, "chassis_summary_details suspended")
 
 
 async def read_data_from_database(table_name: str) -> List[Dict]:
     """Read polled data from sqlite3 DB"""
-    async with _db_read_semaphore:
-        conn = None
-        try:
-            conn = await get_db_connection()
-            cursor = await conn.execute(f"SELECT * FROM {table_name}")
-            rows = await cursor.fetchall()
-            
-            # Convert Row objects to dictionaries
-            records = [dict(row) for row in rows]
-            return records
-        finally:
-            if conn:
-                try:
-                    await conn.close()
-                except Exception:
-                    pass
+    async with db_reader() as conn:
+        cursor = await conn.execute(f"SELECT * FROM {table_name}")
+        rows = await cursor.fetchall()
+        
+        # Convert Row objects to dictionaries
+        records = [dict(row) for row in rows]
+        return records
 
 
 async def write_tags(ip: str, tags: str, type_of_update: str, operation: str) -> str:
     """Write tags to sqlite3 DB"""
-    async with _db_write_semaphore:
-        conn = None
-        try:
-            updated_tags = ""
-            if type_of_update == "chassis":
-                table = 'user_ip_tags'
-                field = 'ip'
-            elif type_of_update == "card":
-                table = 'user_card_tags'
-                field = 'serialNumber'
-            else:
-                return "Invalid type_of_update"
-            
-            conn = await get_db_connection()
-            
-            # Get Present Tags from DB
-            ip_tags_dict = await read_tags(type_of_update)
-            currenttags = ip_tags_dict.get(ip)
-            new_tags = tags.split(",")
-            
-            # There is a record present
-            if currenttags: 
-                if operation == "add":
-                    updated_tags = ",".join(currenttags + new_tags)
-                elif operation == "remove":
-                    for t in new_tags:
-                        if t in currenttags:
-                            currenttags.remove(t)
-                    updated_tags = ",".join(currenttags)
-                
-                await conn.execute(f"UPDATE {table} SET tags = ? where {field} = ?", (updated_tags, ip))
-                if type_of_update == "chassis":
-                    await conn.execute(f"UPDATE chassis_summary_details SET tags = ? where ip = ?", (updated_tags, ip))
-            else:  # New Record
-                await conn.execute(f"INSERT INTO {table} ({field}, tags) VALUES (?, ?)", (ip, tags))
+    async with db_writer() as conn:
+        updated_tags = ""
+        if type_of_update == "chassis":
+            table = 'user_ip_tags'
+            field = 'ip'
+        elif type_of_update == "card":
+            table = 'user_card_tags'
+            field = 'serialNumber'
+        else:
+            return "Invalid type_of_update"
+        
+        # Get Present Tags from DB
+        ip_tags_dict = await read_tags(type_of_update)
+        currenttags = ip_tags_dict.get(ip)
+        new_tags = tags.split(",")
+        
+        # There is a record present
+        if currenttags: 
+            if operation == "add":
+                updated_tags = ",".join(currenttags + new_tags)
+            elif operation == "remove":
+                for t in new_tags:
+                    if t in currenttags:
+                        currenttags.remove(t)
+                updated_tags = ",".join(currenttags)
             
-            await conn.commit()
-            return "Records successfully updated"
-        except Exception as e:
-            if conn:
-                try:
-                    await conn.rollback()
-                except Exception:
-                    pass
-            raise e
-        finally:
-            if conn:
-                try:
-                    await conn.close()
-                except Exception:
-                    pass
+            await conn.execute(f"UPDATE {table} SET tags = ? where {field} = ?", (updated_tags, ip))
+            if type_of_update == "chassis":
+                await conn.execute(f"UPDATE chassis_summary_details SET tags = ? where ip = ?", (updated_tags, ip))
+                await _bump_inventory_generation(conn, "chassis_summary_details")
+        else:  # New Record
+            await conn.execute(f"INSERT INTO {table} ({field}, tags) VALUES (?, ?)", (ip, tags))
+        
+        await _bump_inventory_generation(conn, table)
+        await conn.commit()
+        return "Records successfully updated"
         
 
 async def read_tags(type_of_update: str) -> Dict[str, List[str]]:
     """Read tags from sqlite3 DB"""
-    async with _db_read_semaphore:
-        conn = None
-        try:
-            ip_tags_dict = {}
-            if type_of_update == "chassis":
-                table = "user_ip_tags"
-                field = "ip"
-            elif type_of_update == "card":
-                table = "user_card_tags"
-                field = "serialNumber"
-            else:
-                return {}
-            
-            conn = await get_db_connection()
-            cursor = await conn.execute(f"SELECT * FROM {table}")
-            posts = await cursor.fetchall()
-            
-            for post in posts:
-                tags_str = post["tags"] if post["tags"] else ""
-                ip_tags_dict.update({post[field]: tags_str.split(",") if tags_str else []})
-            return ip_tags_dict
-        finally:
-            if conn:
-                try:
-                    await conn.close()
-                except Exception:
-                    pass
+    async with db_reader() as conn:
+        ip_tags_dict = {}
+        if type_of_update == "chassis":
+            table = "user_ip_tags"
+            field = "ip"
+        elif type_of_update == "card":
+            table = "user_card_tags"
+            field = "serialNumber"
+        else:
+            return {}
+        
+        cursor = await conn.execute(f"SELECT * FROM {table}")
+        posts = await cursor.fetchall()
+        
+        for post in posts:
+            tags_str = post["tags"] if post["tags"] else ""
+            ip_tags_dict.update({post[field]: tags_str.split(",") if tags_str else []})
+        return ip_tags_dict
+
+
+def invalidate_chassis_metadata():
+    """Drop the chassis metadata cache, the next lookup reads chassis_summary_details again"""
+    global _chassis_metadata_cache
+    _chassis_metadata_cache = None
+
+
+async def read_chassis_metadata() -> Dict[str, Dict[str, str]]:
+    """Get type, os and role of every chassis keyed by IP, from the cache or with a single query"""
+    global _chassis_metadata_cache, _chassis_metadata_loaded_at
+    loop = asyncio.get_running_loop()
+    if _chassis_metadata_cache is not None and loop.time() - _chassis_metadata_loaded_at < CHASSIS_METADATA_TTL:
+        return _chassis_metadata_cache
+    async with db_reader() as conn:
+        # SELECT * so databases created before the chassisRole column still work
+        cursor = await conn.execute("SELECT * FROM chassis_summary_details")
+        rows = await cursor.fetchall()
+        metadata = {}
+        for row in rows:
+            row = dict(row)
+            metadata[row["ip"]] = {
+                "type": row.get("type_of_chassis") or "NA",
+                "os": row.get("os") or "NA",
+                "role": row.get("chassisRole") or "NA"
+            }
+    _chassis_metadata_cache = metadata
+    _chassis_metadata_loaded_at = loop.time()
+    return metadata
+
+
+async def get_chassis_types_from_ips(chassis_ips: List[str]) -> List[str]:
+    """Get types of Ixia Chassis for a list of IPs, in the same order"""
+    metadata = await read_chassis_metadata()
+    return [metadata.get(ip, {}).get("type", "NA") for ip in chassis_ips]
 
 
 async def get_chassis_type_from_ip(chassisIp: str) -> str:
     """Get type of Ixia Chassis from IP"""
-    async with _db_read_semaphore:
-        conn = None
-        try:
-            conn = await get_db_connection()
-            cursor = await conn.execute(f"SELECT type_of_chassis FROM chassis_summary_details where ip = ?", (chassisIp,))
-            post = await cursor.fetchone()
-            if post:
-                return post['type_of_chassis']
-            return "NA"
-        finally:
-            if conn:
-                try:
-                    await conn.close()
-                except Exception:
-                    pass
+    return (await get_chassis_types_from_ips([chassisIp]))[0]
     
 
+def parse_config_operations(list_of_un_pw: str) -> List[Tuple[str, str, str, str]]:
+    """(OPERATION, ip, username, password) of every well formed operation,ip,username,password line"""
+    operations = []
+    for item in list_of_un_pw.split("\n"):
+        parts = item.split(",")
+        if len(parts) == 4:
+            operation, ip, un, pw = (part.strip() for part in parts)
+            operations.append((operation.upper(), ip, un, pw))
+    return operations
+
+
 async def write_username_password_to_database(list_of_un_pw: str):
-    """Write user information about ixia servers into database
+    """Apply ADD/UPDATE/DELETE lines to the chassis_credentials table
     
-    When DELETE operations are detected, also deletes all chassis inventory data
-    from all related tables.
+    ADD skips chassis that already exist and UPDATE skips unknown ones. The change
+    version is bumped when any row changed. When DELETE operations are detected,
+    also deletes all chassis inventory data from all related tables.
     """
-    # First, identify chassis IPs that need to be deleted from inventory
-    chassis_to_delete = []
-    config = list_of_un_pw.split("\n")
-    for item in config:
-        if item:
-            parts = item.split(",")
-            if len(parts) == 4:
-                operation, ip, un, pw = parts
-                if operation.strip().upper() == "DELETE":
-                    chassis_to_delete.append(ip.strip())
+    operations = parse_config_operations(list_of_un_pw)
     
     # Delete chassis inventory data for each DELETE operation
     # Do this before updating credentials to ensure consistency
-    for chassis_ip in chassis_to_delete:
+    for operation, chassis_ip, _, _ in operations:
+        if operation != "DELETE":
+            continue
         try:
             await delete_chassis_from_database(chassis_ip)
             print(f"[CONFIG] Deleted chassis inventory data for {chassis_ip}")
@@ -387,186 +722,249 @@ async def write_username_password_to_database(list_of_un_pw: str):
             # Log error but continue - chassis might not exist in inventory yet
             print(f"[CONFIG] Warning: Could not delete inventory data for {chassis_ip}: {e}")
     
-    # Now update credentials as before
-    async with _db_write_semaphore:
-        conn = None
-        try:
-            conn = await get_db_connection()
-            await conn.execute("DELETE from user_db")
-            user_pw_dict = await create_config_dict(list_of_un_pw)
-            user_pw_dict = list({v['ip']:v for v in user_pw_dict}.values())
-            json_str_data = json.dumps(user_pw_dict)
-            await conn.execute(f"INSERT INTO user_db (ixia_servers_json) VALUES (?)", (json_str_data,))
-            await conn.commit()
-        except Exception as e:
-            if conn:
-                try:
-                    await conn.rollback()
-                except Exception:
-                    pass
-            raise e
-        finally:
-            if conn:
-                try:
-                    await conn.close()
-                except Exception:
-                    pass
+    async with db_writer() as conn:
+        changed = 0
+        for operation, ip, un, pw in operations:
+            if operation == "ADD":
+                cursor = await conn.execute("""INSERT INTO chassis_credentials (ip, username, password, lastUpdatedAt_UTC)
+                    VALUES (?, ?, ?, datetime('now')) ON CONFLICT(ip) DO NOTHING""", (ip, un, pw))
+            elif operation == "UPDATE":
+                cursor = await conn.execute("""UPDATE chassis_credentials SET username = ?, password = ?,
+                    lastUpdatedAt_UTC = datetime('now') WHERE ip = ?""", (un, pw, ip))
+            elif operation == "DELETE":
+                cursor = await conn.execute("DELETE FROM chassis_credentials WHERE ip = ?", (ip,))
+            else:
+                continue
+            changed += cursor.rowcount
+        if changed:
+            await _bump_chassis_credentials_version(conn)
+        await conn.commit()
+
+
+async def _bump_chassis_credentials_version(conn):
+    await conn.execute("INSERT OR IGNORE INTO chassis_credentials_version (id, version) VALUES (1, 0)")
+    await conn.execute("UPDATE chassis_credentials_version SET version = version + 1")
+
+
+async def read_chassis_credentials() -> List[Dict]:
+    """Configured chassis as ip/username/password dicts, in the order they were added"""
+    async with db_reader() as conn:
+        cursor = await conn.execute("SELECT ip, username, password FROM chassis_credentials ORDER BY rowid")
+        return [dict(post) for post in await cursor.fetchall()]
+
+
+async def read_chassis_credentials_version() -> int:
+    """Change counter of chassis_credentials, bumped by every write"""
+    async with db_reader() as conn:
+        cursor = await conn.execute("SELECT version FROM chassis_credentials_version WHERE id = 1")
+        post = await cursor.fetchone()
+        return post["version"] if post else 0
    
     
 async def read_username_password_from_database() -> str:
-    """Read user information about ixia servers from database"""
-    async with _db_read_semaphore:
-        conn = None
-        try:
-            conn = await get_db_connection()
-            cursor = await conn.execute("SELECT * FROM user_db")
-            post = await cursor.fetchone()
-            if post:
-                return post['ixia_servers_json']
-            return "[]"
-        finally:
-            if conn:
-                try:
-                    await conn.close()
-                except Exception:
-                    pass
+    """Read user information about ixia servers from database as a JSON list of ip/username/password"""
+    return json.dumps(await read_chassis_credentials())
 
 
-async def create_config_dict(list_of_un_pw: str) -> List[Dict]:
-    """Helper function to assist with writing json into DB based on user ADD/DELETE"""
-    config_now_str = await read_username_password_from_database()
-    # Converting String to List
-    config = list_of_un_pw.split("\n")
-    config_now = []
+# bucket -> (table, time column, value columns) read by get_perf_metrics_from_db
+_PERF_METRICS_SOURCES = {
+    "raw": ("chassis_utilization_details", "sampledAt", "mem_utilization, cpu_utilization"),
+    "5m": ("chassis_utilization_rollup_5m", "bucketStart",
+           "mem_avg AS mem_utilization, cpu_avg AS cpu_utilization, samples, mem_min, mem_max, cpu_min, cpu_max"),
+    "1h": ("chassis_utilization_rollup_1h", "bucketStart",
+           "mem_avg AS mem_utilization, cpu_avg AS cpu_utilization, samples, mem_min, mem_max, cpu_min, cpu_max"),
+}
+
+
+async def get_perf_metrics_from_db(ip: str, start: Optional[int] = None, end: Optional[int] = None,
+                                   limit: Optional[int] = None, bucket: str = "raw") -> List[Dict]:
+    """Fetch Ixia Chassis Performance Metrics, oldest sample first
     
-    if config_now_str:
-        config_now = json.loads(config_now_str)
-        for item in config:
-            if item:
-                parts = item.split(",")
-                if len(parts) == 4:
-                    operation, ip, un, pw = parts
-                    if operation == "DELETE":
-                        config_now = [c for c in config_now if c["ip"] != ip]
-                    elif operation == "ADD":
-                        if ip not in [c["ip"] for c in config_now]:
-                            config_now.append({
-                                "ip": ip.strip(),
-                                "username": un.strip(),
-                                "password": pw.strip(),
-                            })
-                    elif operation == "UPDATE":
-                        # Update existing entry
-                        for idx, chassis_config in enumerate(config_now):
-                            if ip == chassis_config["ip"]:
-                                config_now[idx] = {
-                                    "ip": ip.strip(),
-                                    "username": un.strip(),
-                                    "password": pw.strip(),
-                                }
-                                break
-    else:
-        for item in config:
-            if item:
-                parts = item.split(",")
-                if len(parts) == 4:
-                    operation, ip, un, pw = parts
-                    config_now.append({
-                        "ip": ip.strip(),
-                        "username": un.strip(),
-                        "password": pw.strip(),
-                    })
-    return config_now
+    start/end bound sampledAt in epoch seconds (end exclusive) and limit keeps the newest
+    rows of that range, so the read is an index range scan of at most limit rows.
+    bucket selects raw samples or the "5m" / "1h" rollups, whose bucketStart is
+    returned as sampledAt and mem/cpu averages as mem_utilization/cpu_utilization.
+    """
+    table, time_column, columns = _PERF_METRICS_SOURCES[bucket]
+    query = f"SELECT chassisIp, {time_column} AS sampledAt, {columns} FROM {table} WHERE chassisIp=?"
+    params: List[Any] = [ip]
+    if start is not None:
+        query += f" AND {time_column} >= ?"
+        params.append(start)
+    if end is not None:
+        query += f" AND {time_column} < ?"
+        params.append(end)
+    query += f" ORDER BY {time_column} DESC"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    async with db_reader() as conn:
+        cursor = await conn.execute(query, params)
+        posts = await cursor.fetchall()
+        
+        records = [dict(post) for post in reversed(posts)]
+        return records
+    
+    
+# Fleet queries align every chassis on these bucket boundaries, 1m averages raw samples
+FLEET_BUCKET_SECONDS = {"1m": 60, "5m": 300, "1h": 3600}
 
+_FLEET_METRICS_SQL = {
+    "1m": """SELECT chassisIp, (sampledAt / 60) * 60 AS bucketStart,
+        AVG(mem_utilization) AS mem_utilization, AVG(cpu_utilization) AS cpu_utilization
+        FROM chassis_utilization_details WHERE ({chassis_filter}) AND sampledAt >= ? AND sampledAt < ?
+        GROUP BY chassisIp, sampledAt / 60 ORDER BY bucketStart""",
+    "5m": """SELECT chassisIp, bucketStart, mem_avg AS mem_utilization, cpu_avg AS cpu_utilization
+        FROM chassis_utilization_rollup_5m WHERE ({chassis_filter}) AND bucketStart >= ? AND bucketStart < ?
+        ORDER BY bucketStart""",
+    "1h": """SELECT chassisIp, bucketStart, mem_avg AS mem_utilization, cpu_avg AS cpu_utilization
+        FROM chassis_utilization_rollup_1h WHERE ({chassis_filter}) AND bucketStart >= ? AND bucketStart < ?
+        ORDER BY bucketStart""",
+}
 
-async def get_perf_metrics_from_db(ip: str) -> List[Dict]:
-    """Fetch Ixia Chassis Performance Metrics"""
-    async with _db_read_semaphore:
-        conn = None
-        try:
-            conn = await get_db_connection()
-            cursor = await conn.execute(f"SELECT * FROM chassis_utilization_details where chassisIp=?", (ip,))
-            posts = await cursor.fetchall()
-            
-            records = [dict(post) for post in posts]
-            return records
-        finally:
-            if conn:
-                try:
-                    await conn.close()
-                except Exception:
-                    pass
+
+async def get_fleet_perf_metrics_from_db(ips: Optional[List[str]], tag: Optional[str], start: int, end: int,
+                                         bucket: str = "5m") -> List[Dict]:
+    """Fetch bucketed utilization of several chassis in one query
     
+    Chassis are selected by IP list and/or by a chassis tag (union of both). Returns
+    (chassisIp, bucketStart, mem_utilization, cpu_utilization) rows ordered by bucketStart
+    for buckets starting in [start, end).
+    """
+    filters = []
+    params: List[Any] = []
+    if ips:
+        filters.append(f"chassisIp IN ({','.join('?' * len(ips))})")
+        params.extend(ips)
+    if tag:
+        # Tags are stored comma separated, match whole tags only
+        filters.append("chassisIp IN (SELECT ip FROM user_ip_tags WHERE instr(',' || tags || ',', ',' || ? || ',') > 0)")
+        params.append(tag)
+    if not filters:
+        return []
+    query = _FLEET_METRICS_SQL[bucket].format(chassis_filter=" OR ".join(filters))
+    async with db_reader() as conn:
+        cursor = await conn.execute(query, params + [start, end])
+        posts = await cursor.fetchall()
+        return [dict(post) for post in posts]
+
+
+async def write_polling_intervals_into_database(chassis: int, cards: int, ports: int, sensors: int, licensing: int, perf: int, data_purge: int,
+                                                max_concurrency: Optional[int] = None, per_chassis_concurrency: Optional[int] = None):
+    """Write the polling intervals for different data categories
     
-async def write_polling_intervals_into_database(chassis: int, cards: int, ports: int, sensors: int, licensing: int, perf: int, data_purge: int):
-    """Write the polling intervals for different data categories"""
-    async with _db_write_semaphore:
-        conn = None
-        try:
-            conn = await get_db_connection()
-            await conn.execute("DELETE from poll_setting")
-            await conn.execute(f"""INSERT INTO poll_setting (chassis, cards, ports, sensors, perf, licensing, data_purge) VALUES 
-                (?, ?, ?, ?, ?, ?, ?)""", (chassis, cards, ports, sensors, perf, licensing, data_purge))
-            await conn.commit()
-        except Exception as e:
-            if conn:
-                try:
-                    await conn.rollback()
-                except Exception:
-                    pass
-            raise e
-        finally:
-            if conn:
-                try:
-                    await conn.close()
-                except Exception:
-                    pass
+    max_concurrency / per_chassis_concurrency bound the poll sweeps. None keeps the
+    stored value (the settings page only posts intervals); a column that was never
+    set is NULL and the poller uses its POLL_MAX_CONCURRENCY / POLL_PER_CHASSIS_CONCURRENCY defaults.
+    """
+    async with db_writer() as conn:
+        cursor = await conn.execute("SELECT max_concurrency, per_chassis_concurrency FROM poll_setting LIMIT 1")
+        stored = await cursor.fetchone()
+        if stored:
+            if max_concurrency is None:
+                max_concurrency = stored["max_concurrency"]
+            if per_chassis_concurrency is None:
+                per_chassis_concurrency = stored["per_chassis_concurrency"]
+        await conn.execute("DELETE from poll_setting")
+        await conn.execute(f"""INSERT INTO poll_setting (chassis, cards, ports, sensors, perf, licensing, data_purge,
+            max_concurrency, per_chassis_concurrency) VALUES 
+            (?, ?, ?, ?, ?, ?, ?, ?, ?)""", (chassis, cards, ports, sensors, perf, licensing, data_purge,
+                                             max_concurrency, per_chassis_concurrency))
+        await conn.commit()
     
     
 async def read_poll_setting_from_database() -> Optional[Dict]:
     """Read the polling intervals for different data categories"""
-    async with _db_read_semaphore:
-        conn = None
-        try:
-            conn = await get_db_connection()
-            cursor = await conn.execute("SELECT * FROM poll_setting")
-            post = await cursor.fetchone()
-            if post:
-                return dict(post)
-            return None
-        finally:
-            if conn:
-                try:
-                    await conn.close()
-                except Exception:
-                    pass
+    async with db_reader() as conn:
+        cursor = await conn.execute("SELECT * FROM poll_setting")
+        post = await cursor.fetchone()
+        if post:
+            return dict(post)
+        return None
 
 
-async def delete_half_data_from_performance_metric_table():
-    """This function will delete half the records from performance metrics data"""
-    async with _db_write_semaphore:
-        conn = None
-        try:
-            conn = await get_db_connection()
-            query = """DELETE FROM chassis_utilization_details 
-                WHERE rowid IN 
-                (SELECT rowid FROM chassis_utilization_details ORDER BY lastUpdatedAt_UTC DESC
-                LIMIT (SELECT COUNT(*)/2 FROM chassis_utilization_details))"""
-            await conn.execute(query)
-            await conn.commit()
-        except Exception as e:
-            if conn:
-                try:
-                    await conn.rollback()
-                except Exception:
-                    pass
-            raise e
-        finally:
-            if conn:
-                try:
-                    await conn.close()
-                except Exception:
-                    pass
+_ROLLUP_FROM_RAW_SQL = """SELECT chassisIp, (sampledAt / {size}) * {size}, COUNT(*),
+    MIN(mem_utilization), AVG(mem_utilization), MAX(mem_utilization),
+    MIN(cpu_utilization), AVG(cpu_utilization), MAX(cpu_utilization)
+    FROM chassis_utilization_details WHERE sampledAt >= ? AND sampledAt < ?
+    GROUP BY chassisIp, sampledAt / {size}"""
+
+_ROLLUP_FROM_ROLLUP_SQL = """SELECT chassisIp, (bucketStart / {size}) * {size}, SUM(samples),
+    MIN(mem_min), SUM(mem_avg * samples) / SUM(samples), MAX(mem_max),
+    MIN(cpu_min), SUM(cpu_avg * samples) / SUM(samples), MAX(cpu_max)
+    FROM {source} WHERE bucketStart >= ? AND bucketStart < ?
+    GROUP BY chassisIp, bucketStart / {size}"""
+
+# Buckets are normally written once, merging keeps them right if a range is rolled up twice
+_ROLLUP_UPSERT_SQL = """INSERT INTO {table} (chassisIp, bucketStart, samples, mem_min, mem_avg, mem_max,
+    cpu_min, cpu_avg, cpu_max) {select}
+    ON CONFLICT(chassisIp, bucketStart) DO UPDATE SET
+    samples = samples + excluded.samples,
+    mem_min = MIN(mem_min, excluded.mem_min),
+    mem_avg = (mem_avg * samples + excluded.mem_avg * excluded.samples) / (samples + excluded.samples),
+    mem_max = MAX(mem_max, excluded.mem_max),
+    cpu_min = MIN(cpu_min, excluded.cpu_min),
+    cpu_avg = (cpu_avg * samples + excluded.cpu_avg * excluded.samples) / (samples + excluded.samples),
+    cpu_max = MAX(cpu_max, excluded.cpu_max)"""
+
+
+async def _rollup_watermarks(conn) -> Dict[int, int]:
+    cursor = await conn.execute("SELECT bucketSeconds, watermark FROM utilization_rollup_state")
+    return {row["bucketSeconds"]: row["watermark"] for row in await cursor.fetchall()}
+
+
+async def rollup_performance_metrics(now: Optional[float] = None) -> Dict[str, int]:
+    """Roll raw utilization samples up into the 5 minute and 1 hour bucket tables
+    
+    Incremental: each rollup only aggregates the closed buckets between its watermark
+    and the end of the data rolled up by the level below it, then advances the watermark.
+    Returns the number of buckets written per rollup table.
+    """
+    now = time.time() if now is None else now
+    written = {}
+    async with db_writer() as conn:
+        watermarks = await _rollup_watermarks(conn)
+        # Raw samples are complete once the grace period has passed
+        source_end = int(now) - PERF_ROLLUP_GRACE_SECONDS
+        for size, table, source in UTILIZATION_ROLLUPS:
+            start = watermarks.get(size, 0)
+            end = (source_end // size) * size
+            written[table] = 0
+            if end > start:
+                select = (_ROLLUP_FROM_RAW_SQL if source == "chassis_utilization_details"
+                          else _ROLLUP_FROM_ROLLUP_SQL).format(size=size, source=source)
+                cursor = await conn.execute(_ROLLUP_UPSERT_SQL.format(table=table, select=select), (start, end))
+                written[table] = cursor.rowcount
+                await conn.execute("INSERT OR REPLACE INTO utilization_rollup_state (bucketSeconds, watermark) VALUES (?, ?)",
+                                   (size, end))
+                start = end
+            source_end = start
+        await conn.commit()
+    return written
+
+
+async def purge_expired_performance_metrics(now: Optional[float] = None) -> Dict[str, int]:
+    """Delete raw samples and rollup buckets older than their retention window
+    
+    Rows that have not been rolled up into the next level yet are always kept.
+    Returns the number of rows deleted per table.
+    """
+    now = time.time() if now is None else now
+    deleted = {}
+    async with db_writer() as conn:
+        watermarks = await _rollup_watermarks(conn)
+        # (table, time column, retention seconds, rolled up into the next level until)
+        levels = (
+            ("chassis_utilization_details", "sampledAt", PERF_RAW_RETENTION_HOURS * 3600, watermarks.get(300, 0)),
+            ("chassis_utilization_rollup_5m", "bucketStart", PERF_ROLLUP_5M_RETENTION_DAYS * 86400, watermarks.get(3600, 0)),
+            ("chassis_utilization_rollup_1h", "bucketStart", PERF_ROLLUP_1H_RETENTION_DAYS * 86400, now),
+        )
+        for table, column, keep_seconds, rolled_up_until in levels:
+            cutoff = int(min(now - keep_seconds, rolled_up_until))
+            cursor = await conn.execute(f"DELETE FROM {table} WHERE {column} < ?", (cutoff,))
+            deleted[table] = cursor.rowcount
+        await conn.commit()
+    return deleted
 
 
 async def delete_chassis_from_database(chassis_ip: str) -> Dict[str, int]:
@@ -578,122 +976,114 @@ async def delete_chassis_from_database(chassis_ip: str) -> Dict[str, int]:
     Returns:
         Dictionary with deletion counts per table
     """
-    async with _db_write_semaphore:
-        conn = None
-        deletion_counts = {}
+    deletion_counts = {}
+    async with db_writer() as conn:
+        # Delete from all tables that reference chassis IP
+        # Order matters: delete child records first, then parent
+        
+        # 1. Delete utilization details (performance metrics)
+        cursor = await conn.execute(
+            "DELETE FROM chassis_utilization_details WHERE chassisIp = ?",
+            (chassis_ip,)
+        )
+        deletion_counts["chassis_utilization_details"] = cursor.rowcount
+        for _, table, _ in UTILIZATION_ROLLUPS:
+            cursor = await conn.execute(f"DELETE FROM {table} WHERE chassisIp = ?", (chassis_ip,))
+            deletion_counts[table] = cursor.rowcount
+        
+        # 2. Delete port details
+        cursor = await conn.execute(
+            "DELETE FROM chassis_port_details WHERE chassisIp = ?",
+            (chassis_ip,)
+        )
+        deletion_counts["chassis_port_details"] = cursor.rowcount
+        
+        # 3. Delete sensor details
+        cursor = await conn.execute(
+            "DELETE FROM chassis_sensor_details WHERE chassisIp = ?",
+            (chassis_ip,)
+        )
+        deletion_counts["chassis_sensor_details"] = cursor.rowcount
+        
+        # 4. Delete license details
+        cursor = await conn.execute(
+            "DELETE FROM license_details_records WHERE chassisIp = ?",
+            (chassis_ip,)
+        )
+        deletion_counts["license_details_records"] = cursor.rowcount
+        
+        # 5. Delete card details
+        cursor = await conn.execute(
+            "DELETE FROM chassis_card_details WHERE chassisIp = ?",
+            (chassis_ip,)
+        )
+        deletion_counts["chassis_card_details"] = cursor.rowcount
+        
+        # 6. Delete chassis summary details
+        cursor = await conn.execute(
+            "DELETE FROM chassis_summary_details WHERE ip = ?",
+            (chassis_ip,)
+        )
+        deletion_counts["chassis_summary_details"] = cursor.rowcount
+        
+        # 7. Delete poll circuit breaker state (if any)
         try:
-            conn = await get_db_connection()
-            
-            # Delete from all tables that reference chassis IP
-            # Order matters: delete child records first, then parent
-            
-            # 1. Delete utilization details (performance metrics)
             cursor = await conn.execute(
-                "DELETE FROM chassis_utilization_details WHERE chassisIp = ?",
+                "DELETE FROM chassis_poll_state WHERE ip = ?",
                 (chassis_ip,)
             )
-            deletion_counts["chassis_utilization_details"] = cursor.rowcount
-            
-            # 2. Delete port details
-            cursor = await conn.execute(
-                "DELETE FROM chassis_port_details WHERE chassisIp = ?",
-                (chassis_ip,)
-            )
-            deletion_counts["chassis_port_details"] = cursor.rowcount
-            
-            # 3. Delete sensor details
-            cursor = await conn.execute(
-                "DELETE FROM chassis_sensor_details WHERE chassisIp = ?",
-                (chassis_ip,)
-            )
-            deletion_counts["chassis_sensor_details"] = cursor.rowcount
-            
-            # 4. Delete license details
-            cursor = await conn.execute(
-                "DELETE FROM license_details_records WHERE chassisIp = ?",
-                (chassis_ip,)
-            )
-            deletion_counts["license_details_records"] = cursor.rowcount
-            
-            # 5. Delete card details
-            cursor = await conn.execute(
-                "DELETE FROM chassis_card_details WHERE chassisIp = ?",
-                (chassis_ip,)
-            )
-            deletion_counts["chassis_card_details"] = cursor.rowcount
-            
-            # 6. Delete chassis summary details
-            cursor = await conn.execute(
-                "DELETE FROM chassis_summary_details WHERE ip = ?",
-                (chassis_ip,)
-            )
-            deletion_counts["chassis_summary_details"] = cursor.rowcount
-            
-            # 7. Delete user IP tags (if any)
-            cursor = await conn.execute(
-                "DELETE FROM user_ip_tags WHERE ip = ?",
-                (chassis_ip,)
-            )
-            deletion_counts["user_ip_tags"] = cursor.rowcount
-            
-            await conn.commit()
-            return deletion_counts
-        except Exception as e:
-            if conn:
-                try:
-                    await conn.rollback()
-                except Exception:
-                    pass
-            raise e
-        finally:
-            if conn:
-                try:
-                    await conn.close()
-                except Exception:
-                    pass
+            deletion_counts["chassis_poll_state"] = cursor.rowcount
+        except Exception:
+            pass  # Table may not exist on databases created before it was added
+        
+        # 8. Delete user IP tags (if any)
+        cursor = await conn.execute(
+            "DELETE FROM user_ip_tags WHERE ip = ?",
+            (chassis_ip,)
+        )
+        deletion_counts["user_ip_tags"] = cursor.rowcount
+        
+        await _bump_inventory_generation(conn, *deletion_counts)
+        # Pollers forget what they last wrote for the chassis on the next version check
+        await _bump_chassis_credentials_version(conn)
+        await conn.commit()
+        invalidate_chassis_metadata()
+        return deletion_counts
 
 
 async def reset_database():
     """Delete all records from all inventory and configuration tables"""
-    async with _db_write_semaphore:
-        conn = None
-        try:
-            conn = await get_db_connection()
-            tables = [
-                "chassis_summary_details",
-                "chassis_card_details",
-                "chassis_port_details",
-                "chassis_sensor_details",
-                "license_details_records",
-                "chassis_utilization_details",
-                "user_db",
-                "user_ip_tags",
-                "user_card_tags",
-                "ixnetwork_user_db",
-                "ixnetwork_api_server_details"
-            ]
-            for table in tables:
-                # Check if table exists before deleting
-                try:
-                    await conn.execute(f"DELETE FROM {table}")
-                except Exception:
-                    pass
-            
-            await conn.commit()
-            return True
-        except Exception as e:
-            if conn:
-                try:
-                    await conn.rollback()
-                except Exception:
-                    pass
-            raise e
-        finally:
-            if conn:
-                try:
-                    await conn.close()
-                except Exception:
-                    pass
+    async with db_writer() as conn:
+        tables = [
+            "chassis_summary_details",
+            "chassis_card_details",
+            "chassis_port_details",
+            "chassis_sensor_details",
+            "license_details_records",
+            "chassis_utilization_details",
+            "chassis_utilization_rollup_5m",
+            "chassis_utilization_rollup_1h",
+            "utilization_rollup_state",
+            "chassis_poll_state",
+            "chassis_credentials",
+            "user_ip_tags",
+            "user_card_tags",
+            "ixnetwork_user_db",
+            "ixnetwork_api_server_details"
+        ]
+        for table in tables:
+            # Check if table exists before deleting
+            try:
+                await conn.execute(f"DELETE FROM {table}")
+            except Exception:
+                pass
+        # Pollers holding the old chassis list reload it on the next version check
+        await _bump_chassis_credentials_version(conn)
+        await _bump_inventory_generation(conn, *tables)
+        
+        await conn.commit()
+        invalidate_chassis_metadata()
+        return True
 
 
 def is_input_in_correct_format(ip_pw_list: str) -> bool:
@@ -713,48 +1103,23 @@ def is_input_in_correct_format(ip_pw_list: str) -> bool:
 
 async def write_ixnetwork_credentials_to_database(list_of_credentials: str):
     """Write IxNetwork API server credentials into database (ixnetwork_user_db)"""
-    async with _db_write_semaphore:
-        conn = None
-        try:
-            conn = await get_db_connection()
-            await conn.execute("DELETE from ixnetwork_user_db")
-            cred_dict = await create_ixnetwork_config_dict(list_of_credentials)
-            cred_dict = list({v['ip']:v for v in cred_dict}.values())
-            json_str_data = json.dumps(cred_dict)
-            await conn.execute("INSERT INTO ixnetwork_user_db (ixnetwork_servers_json) VALUES (?)", (json_str_data,))
-            await conn.commit()
-        except Exception as e:
-            if conn:
-                try:
-                    await conn.rollback()
-                except Exception:
-                    pass
-            raise e
-        finally:
-            if conn:
-                try:
-                    await conn.close()
-                except Exception:
-                    pass
+    async with db_writer() as conn:
+        await conn.execute("DELETE from ixnetwork_user_db")
+        cred_dict = await create_ixnetwork_config_dict(list_of_credentials)
+        cred_dict = list({v['ip']:v for v in cred_dict}.values())
+        json_str_data = json.dumps(cred_dict)
+        await conn.execute("INSERT INTO ixnetwork_user_db (ixnetwork_servers_json) VALUES (?)", (json_str_data,))
+        await conn.commit()
 
 
 async def read_ixnetwork_credentials_from_database() -> str:
     """Read IxNetwork API server credentials from database"""
-    async with _db_read_semaphore:
-        conn = None
-        try:
-            conn = await get_db_connection()
-            cursor = await conn.execute("SELECT * FROM ixnetwork_user_db")
-            post = await cursor.fetchone()
-            if post:
-                return post['ixnetwork_servers_json']
-            return "[]"
-        finally:
-            if conn:
-                try:
-                    await conn.close()
-                except Exception:
-                    pass
+    async with db_reader() as conn:
+        cursor = await conn.execute("SELECT * FROM ixnetwork_user_db")
+        post = await cursor.fetchone()
+        if post:
+            return post['ixnetwork_servers_json']
+        return "[]"
 
 
 async def create_ixnetwork_config_dict(list_of_credentials: str) -> List[Dict]:
@@ -820,54 +1185,29 @@ def is_ixnetwork_input_in_correct_format(input_list: str) -> bool:
 
 async def write_ixnetwork_server_details_to_database(records: List[Dict]):
     """Write polled IxNetwork API server details into database"""
-    async with _db_write_semaphore:
-        conn = None
-        try:
-            conn = await get_db_connection()
-            # Clear existing records for servers we're updating
-            server_ips_to_update = [r["ixnetwork_api_server_ip"] for r in records]
-            if server_ips_to_update:
-                placeholders = ','.join('?' * len(server_ips_to_update))
-                await conn.execute(f"DELETE FROM ixnetwork_api_server_details WHERE ixnetwork_api_server_ip IN ({placeholders})", server_ips_to_update)
-            
-            # Insert new records
-            for record in records:
-                await conn.execute("""INSERT INTO ixnetwork_api_server_details 
-                    (ixnetwork_api_server_ip, ixnetwork_api_server_sessions, lastUpdatedAt_UTC) 
-                    VALUES (?, ?, datetime('now'))""",
-                    (record["ixnetwork_api_server_ip"], 
-                     record.get("ixnetwork_api_server_sessions", "0")))
-            
-            await conn.commit()
-        except Exception as e:
-            if conn:
-                try:
-                    await conn.rollback()
-                except Exception:
-                    pass
-            raise e
-        finally:
-            if conn:
-                try:
-                    await conn.close()
-                except Exception:
-                    pass
+    async with db_writer() as conn:
+        # Clear existing records for servers we're updating
+        server_ips_to_update = [r["ixnetwork_api_server_ip"] for r in records]
+        if server_ips_to_update:
+            placeholders = ','.join('?' * len(server_ips_to_update))
+            await conn.execute(f"DELETE FROM ixnetwork_api_server_details WHERE ixnetwork_api_server_ip IN ({placeholders})", server_ips_to_update)
+        
+        # Insert new records
+        for record in records:
+            await conn.execute("""INSERT INTO ixnetwork_api_server_details 
+                (ixnetwork_api_server_ip, ixnetwork_api_server_sessions, lastUpdatedAt_UTC) 
+                VALUES (?, ?, datetime('now'))""",
+                (record["ixnetwork_api_server_ip"], 
+                 record.get("ixnetwork_api_server_sessions", "0")))
+        
+        await conn.commit()
 
 
 async def read_ixnetwork_server_details_from_database() -> List[Dict]:
     """Read polled IxNetwork API server details from database"""
-    async with _db_read_semaphore:
-        conn = None
-        try:
-            conn = await get_db_connection()
-            cursor = await conn.execute("SELECT * FROM ixnetwork_api_server_details")
-            rows = await cursor.fetchall()
-            records = [dict(row) for row in rows]
-            return records
-        finally:
-            if conn:
-                try:
-                    await conn.close()
-                except Exception:
-                    pass
+    async with db_reader() as conn:
+        cursor = await conn.execute("SELECT * FROM ixnetwork_api_server_details")
+        rows = await cursor.fetchall()
+        records = [dict(row) for row in rows]
+        return records
 
@@ -0,0 +1,104 @@
+"""
+In-memory views of the inventory tables served by the list endpoints
+"""
+import asyncio
+import hashlib
+import json
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.database import db_pool, read_inventory_generations
+
+
+def encode_view(view: Any) -> Tuple[bytes, str]:
+    """Encode a view the way JSONResponse does and return the body with its ETag"""
+    body = json.dumps(jsonable_encoder(view), ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode("utf-8")
+    return body, '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match comparison: "*" or any tag of the comma separated list, weak or not"""
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == "*" or tag == etag:
+            return True
+    return False
+
+
+def view_response(request: Request, body: bytes, etag: str) -> Response:
+    """Serve an encoded view, or 304 Not Modified if the client already has this ETag"""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+class InventoryViews:
+    """Ready-to-serve responses of the list endpoints, rebuilt only when their tables change.
+
+    Every read checks PRAGMA data_version on the pool's watcher connection, a memory
+    lookup in SQLite that moves on any commit. Only then is inventory_generation read,
+    and only views of tables whose generation moved are rebuilt, once, by whichever
+    request gets there first; the others wait for it and share the result. The JSON
+    encoding of a view is kept with it, so repeated reads send the same bytes.
+    """
+
+    def __init__(self):
+        self._data_version: Optional[Tuple[int, int]] = None
+        self._generations: Dict[str, int] = {}
+        self._views: Dict[str, Tuple[Tuple[int, ...], Any]] = {}
+        self._encoded: Dict[str, Tuple[Any, bytes, str]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._refresh_lock = asyncio.Lock()
+
+    async def _refresh_generations(self):
+        version = await db_pool().data_version()
+        if version == self._data_version:
+            return
+        async with self._refresh_lock:
+            if version == self._data_version:
+                return
+            # Read after data_version: a commit in between only causes one more refresh
+            self._generations = await read_inventory_generations()
+            self._data_version = version
+
+    async def get(self, name: str, tables: Sequence[str], build: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the view `name` built by `await build()` from `tables`, rebuilding it
+        if any of them was written since it was built"""
+        await self._refresh_generations()
+        key = tuple(self._generations.get(table, 0) for table in tables)
+        entry = self._views.get(name)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        async with self._locks.setdefault(name, asyncio.Lock()):
+            entry = self._views.get(name)
+            if entry is None or entry[0] != key:
+                entry = self._views[name] = (key, await build())
+        return entry[1]
+
+    async def get_json(self, name: str, tables: Sequence[str], build: Callable[[], Awaitable[Any]]) -> Tuple[bytes, str]:
+        """Like get(), but return the view encoded by encode_view(), encoding it once per rebuild"""
+        view = await self.get(name, tables, build)
+        encoded = self._encoded.get(name)
+        if encoded is None or encoded[0] is not view:
+            encoded = self._encoded[name] = (view, *encode_view(view))
+        return encoded[1], encoded[2]
+
+
+# One set of views per event loop, like the connection pools they read from
+_views: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, InventoryViews]" = weakref.WeakKeyDictionary()
+
+
+def inventory_views() -> InventoryViews:
+    """Get the inventory views of the running event loop"""
+    loop = asyncio.get_running_loop()
+    views = _views.get(loop)
+    if views is None:
+        views = _views[loop] = InventoryViews()
+    return views
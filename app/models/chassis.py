@@ -49,6 +49,28 @@ class ChassisResponse(BaseModel):
         }
 
 
+class ChassisPollStateResponse(BaseModel):
+    """Circuit breaker state of a chassis in the poller"""
+    chassisIp: str = Field(..., description="Chassis IP address")
+    state: str = Field(..., description="closed (polled normally), suspended or half-open (probing)")
+    consecutiveFailures: int = Field(..., description="Consecutive connection failures")
+    nextProbeAt: Optional[str] = Field(None, description="When a suspended chassis is probed next (UTC)")
+    lastError: str = Field("", description="Last connection error")
+    lastUpdatedAt_UTC: Optional[str] = Field(None, description="Last state change timestamp in UTC")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "chassisIp": "192.168.1.100",
+                "state": "suspended",
+                "consecutiveFailures": 3,
+                "nextProbeAt": "2024-01-01 12:02:00",
+                "lastError": "ConnectTimeout: timed out",
+                "lastUpdatedAt_UTC": "2024-01-01 12:01:00"
+            }
+        }
+
+
 class ChassisListResponse(BaseModel):
     """List of chassis response model"""
     chassis: List[ChassisResponse] = Field(..., description="List of chassis")
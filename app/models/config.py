@@ -40,6 +40,8 @@ class PollingIntervalsRequest(BaseModel):
     licensing: int = Field(..., description="Licensing polling interval in seconds", ge=1)
     perf: int = Field(..., description="Performance polling interval in seconds", ge=1)
     purge: int = Field(..., description="Data purge interval in seconds", ge=1)
+    maxConcurrency: Optional[int] = Field(None, description="Maximum chassis requests in flight across all poll sweeps, omitted keeps the current value", ge=1)
+    perChassisConcurrency: Optional[int] = Field(None, description="Maximum requests in flight to a single chassis, omitted keeps the current value", ge=1)
 
     class Config:
         json_schema_extra = {
@@ -2,7 +2,7 @@
 Pydantic models for Performance endpoints
 """
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class PerformanceMetricResponse(BaseModel):
@@ -11,6 +11,14 @@ class PerformanceMetricResponse(BaseModel):
     mem_utilization: float = Field(..., description="Memory utilization percentage")
     cpu_utilization: float = Field(..., description="CPU utilization percentage")
     lastUpdatedAt_UTC: str = Field(..., description="Last update timestamp in UTC")
+    sampledAt: Optional[int] = Field(None, description="Sample time (bucket start for rollups) as unix epoch seconds")
+    samples: Optional[int] = Field(None, description="Raw samples aggregated in the bucket")
+    mem_min: Optional[float] = Field(None, description="Lowest memory utilization in the bucket")
+    mem_max: Optional[float] = Field(None, description="Highest memory utilization in the bucket")
+    cpu_min: Optional[float] = Field(None, description="Lowest CPU utilization in the bucket")
+    cpu_max: Optional[float] = Field(None, description="Highest CPU utilization in the bucket")
+    mem_moving_avg: Optional[float] = Field(None, description="Moving average of memory utilization")
+    cpu_moving_avg: Optional[float] = Field(None, description="Moving average of CPU utilization")
 
     class Config:
         json_schema_extra = {
@@ -18,23 +26,70 @@ class PerformanceMetricResponse(BaseModel):
                 "chassisIp": "192.168.1.100",
                 "mem_utilization": 45.5,
                 "cpu_utilization": 32.1,
-                "lastUpdatedAt_UTC": "2024-01-01 12:00:00"
+                "lastUpdatedAt_UTC": "01/01/2024, 12:00:00",
+                "sampledAt": 1704110400
             }
         }
 
 
+class MetricSummary(BaseModel):
+    """Distribution of one utilization metric over the returned points"""
+    min: Optional[float] = Field(None, description="Minimum")
+    avg: Optional[float] = Field(None, description="Mean")
+    max: Optional[float] = Field(None, description="Maximum")
+    p50: Optional[float] = Field(None, description="Median")
+    p95: Optional[float] = Field(None, description="95th percentile")
+    p99: Optional[float] = Field(None, description="99th percentile")
+
+
 class PerformanceMetricListResponse(BaseModel):
     """List of performance metrics response model"""
     metrics: List[PerformanceMetricResponse] = Field(..., description="List of performance metrics")
     count: int = Field(..., description="Total number of metrics")
     chassisIp: Optional[str] = Field(None, description="Chassis IP if filtered")
+    bucket: str = Field("raw", description="raw samples or the 5m / 1h rollup the metrics come from")
+    summary: Dict[str, MetricSummary] = Field(default_factory=dict,
+                                              description="mem / cpu distribution over the returned points")
 
     class Config:
         json_schema_extra = {
             "example": {
                 "metrics": [],
                 "count": 0,
-                "chassisIp": None
+                "chassisIp": None,
+                "bucket": "raw",
+                "summary": {}
+            }
+        }
+
+
+class FleetSeries(BaseModel):
+    """Utilization of one chassis, aligned with FleetMetricsResponse.timestamps (null where no data)"""
+    mem: List[Optional[float]] = Field(..., description="Average memory utilization per bucket")
+    cpu: List[Optional[float]] = Field(..., description="Average CPU utilization per bucket")
+
+
+class FleetMetricsResponse(BaseModel):
+    """Columnar utilization of several chassis on shared bucket timestamps"""
+    bucket: str = Field(..., description="Bucket size: 1m, 5m or 1h")
+    start: int = Field(..., alias="from", description="First bucket start, unix epoch seconds")
+    end: int = Field(..., alias="to", description="Exclusive end of the range, unix epoch seconds")
+    timestamps: List[int] = Field(..., description="Bucket start times, unix epoch seconds")
+    chassis: Dict[str, FleetSeries] = Field(..., description="Series per chassis IP")
+    count: int = Field(..., description="Number of chassis with data")
+
+    class Config:
+        populate_by_name = True
+        json_schema_extra = {
+            "example": {
+                "bucket": "5m",
+                "from": 1704067200,
+                "to": 1704068100,
+                "timestamps": [1704067200, 1704067500, 1704067800],
+                "chassis": {
+                    "192.168.1.100": {"mem": [45.5, 46.0, 44.8], "cpu": [32.1, 30.4, None]}
+                },
+                "count": 1
             }
         }
 
@@ -1,357 +1,787 @@
 import click
+import os
 import time
 import json
 import asyncio
-from typing import List, Dict
+import hashlib
+from typing import List, Dict, Optional, Tuple
 
 from app.database import (
-    read_username_password_from_database, 
+    read_chassis_credentials,
+    read_chassis_credentials_version,
     write_data_to_database, 
-    get_chassis_type_from_ip, 
-    delete_half_data_from_performance_metric_table, 
+    delete_stale_chassis_rows,
+    write_chassis_poll_state,
+    mark_chassis_suspended,
+    get_chassis_types_from_ips, 
+    rollup_performance_metrics,
+    purge_expired_performance_metrics,
     read_poll_setting_from_database,
     read_ixnetwork_credentials_from_database,
-    write_ixnetwork_server_details_to_database
+    write_ixnetwork_server_details_to_database,
+    close_db_pool
 )
 import IxOSRestAPICaller as ixOSRestCaller
-from RestApi.IxOSRestInterface import IxRestSession
+from RestApi.IxOSSessionCache import AsyncIxRestSessionCache
+from RestApi.IxOSRestInterface import IxRestException
+import httpx
 from ixnetwork_restpy.testplatform.testplatform import TestPlatform 
 import urllib3
 
 # Disable SSL warnings for self-signed certificates
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Authenticated chassis sessions shared by every poll category in this process
+chassis_sessions = AsyncIxRestSessionCache()
+
+
+def is_session_error(error: BaseException) -> bool:
+    """True if a session must not be reused after this error: the chassis could not be
+    reached, or it still rejected the API key after the session logged in again.
+    Other errors (an error answer, a bad payload) leave the session to other categories."""
+    if ChassisCircuitBreaker.is_connection_error(error):
+        return True
+    return isinstance(error, IxRestException) and str(error).startswith(("401 ", "403 "))
+
+
+class ChassisListCache:
+    """Configured chassis (ip/username/password) shared by every poll category.
+
+    Each sweep only reads the chassis_credentials change version; the list itself is
+    re-read when the version moved since the last load.
+    """
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self._chassis: List[Dict] = []
+
+    async def get(self) -> List[Dict]:
+        version = await read_chassis_credentials_version()
+        if version != self.version:
+            # Read the version first: a write landing in between only causes one extra reload
+            self._chassis = await read_chassis_credentials()
+            self.version = version
+        return list(self._chassis)
+
+
+chassis_config = ChassisListCache()
+
+
+class PollSlots:
+    """Counting semaphore whose limit can change while slots are held.
+
+    Lowering the limit never revokes a slot: new callers wait until enough holders
+    have released theirs, so at no point are more than `limit` slots handed out
+    on top of those already held.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._waiting = 0
+        self._changed = asyncio.Condition()
+
+    @property
+    def idle(self) -> bool:
+        return not self.in_use and not self._waiting
+
+    async def resize(self, limit: int):
+        async with self._changed:
+            self.limit = limit
+            self._changed.notify_all()
+
+    async def __aenter__(self):
+        async with self._changed:
+            self._waiting += 1
+            try:
+                await self._changed.wait_for(lambda: self.in_use < self.limit)
+            finally:
+                self._waiting -= 1
+            self.in_use += 1
+
+    async def __aexit__(self, *exc_info):
+        async with self._changed:
+            self.in_use -= 1
+            self._changed.notify()
+
+
+class PollLimiter:
+    """Global and per-chassis in-flight request limits shared by every poll category.
+
+    The max_concurrency / per_chassis_concurrency columns of poll_setting override
+    the POLL_MAX_CONCURRENCY / POLL_PER_CHASSIS_CONCURRENCY defaults; a NULL column
+    means the default. A chassis keeps its slots while it is configured, so every
+    fetch of a chassis waits on the same slots; prune() drops those of deleted chassis.
+    """
+
+    def __init__(self, max_concurrency: int, per_chassis: int):
+        self.default_max_concurrency = self.max_concurrency = max_concurrency
+        self.default_per_chassis = self.per_chassis = per_chassis
+        self._global = PollSlots(max_concurrency)
+        self._per_chassis: Dict[str, PollSlots] = {}
+
+    async def configure(self, poll_setting: Optional[Dict] = None):
+        """Apply limits from a poll_setting row, the defaults for missing values.
+        Slots are resized in place, fetches already holding one keep it."""
+        poll_setting = poll_setting or {}
+        max_concurrency = poll_setting.get("max_concurrency") or self.default_max_concurrency
+        per_chassis = poll_setting.get("per_chassis_concurrency") or self.default_per_chassis
+        if max_concurrency != self.max_concurrency:
+            self.max_concurrency = max_concurrency
+            await self._global.resize(max_concurrency)
+        if per_chassis != self.per_chassis:
+            self.per_chassis = per_chassis
+            for slots in list(self._per_chassis.values()):
+                await slots.resize(per_chassis)
+
+    async def run(self, chassis_ip: str, stats: Dict, fetch, *args):
+        """Await fetch(*args) once a chassis slot and a global slot are free.
+        Time spent waiting is added to stats["wait"] and tracked in stats["max_wait"]."""
+        chassis_slot = self._per_chassis.setdefault(chassis_ip, PollSlots(self.per_chassis))
+        started = time.monotonic()
+        # Take the chassis slot first so a busy chassis never holds a global slot idle
+        async with chassis_slot:
+            async with self._global:
+                waited = time.monotonic() - started
+                stats["wait"] = stats.get("wait", 0.0) + waited
+                stats["max_wait"] = max(stats.get("max_wait", 0.0), waited)
+                return await fetch(*args)
+
+    def prune(self, chassis_ips: List[str]):
+        """Drop the slots of chassis that are no longer configured, once nothing uses them"""
+        keep = set(chassis_ips)
+        for ip in [ip for ip, slots in self._per_chassis.items() if ip not in keep and slots.idle]:
+            del self._per_chassis[ip]
+
+
+poll_limiter = PollLimiter(
+    max_concurrency=int(os.getenv("POLL_MAX_CONCURRENCY", "64")),
+    per_chassis=int(os.getenv("POLL_PER_CHASSIS_CONCURRENCY", "2"))
+)
+
+
+class ChassisCircuitBreaker:
+    """Per-chassis circuit breaker shared by every poll category.
+
+    After POLL_BREAKER_FAILURE_THRESHOLD consecutive connection failures a chassis is
+    suspended: no category polls it until its probe time, when a single half-open
+    probe is let through. A successful probe closes the breaker; a failed one
+    suspends the chassis again with the probe interval doubled, from
+    POLL_BREAKER_BASE_INTERVAL up to POLL_BREAKER_MAX_INTERVAL seconds.
+    Only transport errors count: a chassis that answers with an error is reachable.
+    """
+
+    CLOSED = "closed"
+    SUSPENDED = "suspended"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int, base_interval: float, max_interval: float):
+        self.failure_threshold = failure_threshold
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self._entries: Dict[str, Dict] = {}
+        self._dirty = set()
+
+    @staticmethod
+    def is_connection_error(error: BaseException) -> bool:
+        return isinstance(error, (httpx.TransportError, OSError, asyncio.TimeoutError))
+
+    def _probe_interval(self, trips: int) -> float:
+        return min(self.base_interval * (2 ** max(trips - 1, 0)), self.max_interval)
+
+    def state(self, chassis_ip: str) -> str:
+        entry = self._entries.get(chassis_ip)
+        return entry["state"] if entry else self.CLOSED
+
+    def allow(self, chassis_ip: str) -> bool:
+        """True if the chassis may be polled now. Once the probe time of a suspended
+        chassis has passed, only the first caller gets through as the half-open probe."""
+        entry = self._entries.get(chassis_ip)
+        if not entry or entry["state"] == self.CLOSED:
+            return True
+        now = time.time()
+        if now < entry["nextProbeAt"]:
+            return False
+        entry["state"] = self.HALF_OPEN
+        # Hold other categories back until this probe has had its chance
+        entry["nextProbeAt"] = now + self._probe_interval(entry["trips"])
+        self._dirty.add(chassis_ip)
+        return True
+
+    def record_success(self, chassis_ip: str):
+        entry = self._entries.pop(chassis_ip, None)
+        if entry:
+            if entry["state"] != self.CLOSED:
+                print(f"[POLL] Chassis {chassis_ip} is reachable again, resuming polling")
+            self._dirty.add(chassis_ip)
+
+    def record_failure(self, chassis_ip: str, error: BaseException):
+        """Count a failed poll. Other errors than connection errors are not counted, but
+        they show the chassis answers, so they end a probe like a success would."""
+        if not self.is_connection_error(error):
+            entry = self._entries.get(chassis_ip)
+            if entry is not None and entry["state"] == self.HALF_OPEN:
+                self.record_success(chassis_ip)
+            return
+        entry = self._entries.setdefault(chassis_ip, {"state": self.CLOSED, "failures": 0, "trips": 0,
+                                                      "nextProbeAt": 0.0, "lastError": ""})
+        entry["failures"] += 1
+        entry["lastError"] = f"{type(error).__name__}: {error}"[:255]
+        if entry["state"] == self.HALF_OPEN or entry["failures"] >= self.failure_threshold:
+            entry["trips"] += 1
+            entry["state"] = self.SUSPENDED
+            interval = self._probe_interval(entry["trips"])
+            entry["nextProbeAt"] = time.time() + interval
+            print(f"[POLL] Chassis {chassis_ip} suspended after {entry['failures']} failure(s), "
+                  f"next probe in {interval:.0f}s")
+        self._dirty.add(chassis_ip)
+
+    def prune(self, chassis_ips: List[str]):
+        """Forget chassis that are no longer configured"""
+        keep = set(chassis_ips)
+        for ip in [ip for ip in self._entries if ip not in keep]:
+            del self._entries[ip]
+            self._dirty.discard(ip)
+
+    def take_changes(self) -> List[Dict]:
+        """Return chassis_poll_state records for chassis whose state changed since the last call"""
+        records = []
+        for ip in self._dirty:
+            entry = self._entries.get(ip)
+            records.append({
+                "ip": ip,
+                "state": entry["state"] if entry else self.CLOSED,
+                "consecutiveFailures": entry["failures"] if entry else 0,
+                "nextProbeAt": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(entry["nextProbeAt"]))
+                               if entry and entry["state"] != self.CLOSED else None,
+                "lastError": entry["lastError"] if entry else ""
+            })
+        self._dirty = set()
+        return records
+
+
+chassis_breaker = ChassisCircuitBreaker(
+    failure_threshold=int(os.getenv("POLL_BREAKER_FAILURE_THRESHOLD", "3")),
+    base_interval=float(os.getenv("POLL_BREAKER_BASE_INTERVAL", "60")),
+    max_interval=float(os.getenv("POLL_BREAKER_MAX_INTERVAL", "3600"))
+)
+
+
+def split_by_breaker(chassis_list: List[Dict]) -> Tuple[List[Dict], List[str]]:
+    """Split chassis into those to poll now and the IPs suspended by the circuit breaker"""
+    allowed, suspended = [], []
+    for chassis in chassis_list:
+        if chassis_breaker.allow(chassis["ip"]):
+            allowed.append(chassis)
+        else:
+            suspended.append(chassis["ip"])
+    return allowed, suspended
+
+
+# Optional TCP connect probe on the REST port at the start of every sweep, so
+# powered off chassis are found in POLL_TCP_PROBE_TIMEOUT seconds instead of
+# after their authentication requests time out
+POLL_TCP_PROBE = os.getenv("POLL_TCP_PROBE", "false").lower() in ("1", "true", "yes")
+POLL_TCP_PROBE_TIMEOUT = float(os.getenv("POLL_TCP_PROBE_TIMEOUT", "2"))
+POLL_TCP_PROBE_PORT = 443
+
+
+async def tcp_probe(chassis_ip: str, timeout: float = POLL_TCP_PROBE_TIMEOUT) -> Optional[BaseException]:
+    """Open and close a TCP connection to the chassis REST port. Returns the error, or None if it is up."""
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(chassis_ip, POLL_TCP_PROBE_PORT), timeout)
+    except (OSError, asyncio.TimeoutError) as e:
+        return e
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return None
+
+
+async def select_chassis_to_poll(chassis_list: List[Dict]) -> Tuple[List[Dict], List[str], List[str]]:
+    """Return (chassis to poll, IPs suspended by the circuit breaker, IPs failing the TCP probe).
+
+    The TCP probe only runs when POLL_TCP_PROBE is enabled; its failures count
+    towards the circuit breaker like any other connection failure.
+    """
+    poll_list, suspended_ips = split_by_breaker(chassis_list)
+    unreachable_ips = []
+    if POLL_TCP_PROBE and poll_list:
+        errors = await asyncio.gather(*[tcp_probe(chassis["ip"]) for chassis in poll_list])
+        reachable = []
+        for chassis, error in zip(poll_list, errors):
+            if error is None:
+                reachable.append(chassis)
+                continue
+            chassis_breaker.record_failure(chassis["ip"], error)
+            await chassis_sessions.invalidate(chassis["ip"])
+            unreachable_ips.append(chassis["ip"])
+        poll_list = reachable
+    return poll_list, suspended_ips, unreachable_ips
+
+
+async def save_breaker_state(chassis_list: List[Dict]):
+    """Persist circuit breaker changes so the API can show suspended chassis"""
+    chassis_breaker.prune([chassis["ip"] for chassis in chassis_list])
+    poll_limiter.prune([chassis["ip"] for chassis in chassis_list])
+    changes = chassis_breaker.take_changes()
+    if changes:
+        try:
+            await write_chassis_poll_state(changes)
+        except Exception as e:
+            # The breaker itself lives in memory, a failed write only affects what the UI shows
+            print(f"[POLL] Could not save chassis poll state: {e}")
+
+
+# Streaming writes: results are flushed to the database every POLL_WRITE_BATCH_SIZE
+# chassis or POLL_WRITE_BATCH_SECONDS, whichever comes first
+POLL_WRITE_BATCH_SIZE = int(os.getenv("POLL_WRITE_BATCH_SIZE", "10"))
+POLL_WRITE_BATCH_SECONDS = float(os.getenv("POLL_WRITE_BATCH_SECONDS", "2"))
+
+
+class ChangeDetector:
+    """Content fingerprints of the last records written per (table, chassis).
+
+    Most card, port, license and sensor polls return what the previous poll did.
+    A chassis whose fingerprint is unchanged is not written at all, except once
+    every POLL_FINGERPRINT_MAX_AGE seconds so lastUpdatedAt_UTC does not go stale.
+    Fingerprints only hold while the chassis_credentials version they were taken
+    under is current: a reset, a chassis deleted or removed and added again all
+    bump it, and the rows they emptied have to be written again.
+    """
+
+    # Per-poll fields that change every time without the data changing
+    VOLATILE_FIELDS = ("lastUpdatedAt_UTC",)
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._fingerprints: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._version: Optional[int] = None
+
+    @classmethod
+    def fingerprint(cls, records: List[Dict]) -> str:
+        stable = [{k: v for k, v in record.items() if k not in cls.VOLATILE_FIELDS} for record in records]
+        payload = json.dumps(stable, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def is_unchanged(self, table_name: str, chassis_ip: str, fingerprint: str) -> bool:
+        entry = self._fingerprints.get((table_name, chassis_ip))
+        return bool(entry) and entry[0] == fingerprint and time.monotonic() - entry[1] < self.max_age
+
+    def remember(self, table_name: str, chassis_ip: str, fingerprint: str):
+        self._fingerprints[(table_name, chassis_ip)] = (fingerprint, time.monotonic())
+
+    def prune(self, table_name: str, chassis_ips: List[str]):
+        """Forget chassis that are no longer polled, so a re-added chassis is written again"""
+        keep = set(chassis_ips)
+        for key in [k for k in self._fingerprints if k[0] == table_name and k[1] not in keep]:
+            del self._fingerprints[key]
+
+    def sync(self, version: Optional[int], table_name: str, chassis_ips: List[str]):
+        """Forget every fingerprint if the chassis_credentials version moved, then prune.
+        Called at the start of every sweep, including those with no chassis configured."""
+        if version != self._version:
+            self._fingerprints.clear()
+            self._version = version
+        self.prune(table_name, chassis_ips)
+
+
+change_detector = ChangeDetector(max_age=float(os.getenv("POLL_FINGERPRINT_MAX_AGE", "900")))
+
+
+async def stream_to_database(table_name: str, tasks: List, ip_tags_dict: Optional[Dict] = None, on_result=None,
+                             detect_changes: bool = False, stats: Optional[Dict] = None) -> int:
+    """Write fetch results in small batched transactions as each chassis completes.
+    
+    Fast chassis show up in the UI without waiting for the slowest one, and only one
+    batch of results is held in memory at a time. on_result, if given, is called with
+    every result before it is queued. A None result is a chassis that failed or had
+    nothing to report: nothing is written for it, so it keeps its last good rows; the
+    count goes to stats["failed"].
+    With detect_changes, results are (chassis ip, records) pairs and chassis whose
+    content is unchanged, an empty list included, are skipped; the count goes to
+    stats["unchanged"].
+    Returns the number of results written.
+    """
+    batch = []
+    fingerprints = []
+    written = 0
+    last_flush = time.monotonic()
+    
+    async def _flush():
+        await write_data_to_database(table_name=table_name, records=batch, ip_tags_dict=ip_tags_dict)
+        # Only remember fingerprints once they are safely in the database
+        for chassis_ip, fingerprint in fingerprints:
+            change_detector.remember(table_name, chassis_ip, fingerprint)
+    
+    for next_done in asyncio.as_completed(tasks):
+        result = await next_done
+        if result is None:
+            if stats is not None:
+                stats["failed"] = stats.get("failed", 0) + 1
+            continue
+        if on_result:
+            on_result(result)
+        if detect_changes:
+            chassis_ip, records = result
+            fingerprint = change_detector.fingerprint(records)
+            if change_detector.is_unchanged(table_name, chassis_ip, fingerprint):
+                if stats is not None:
+                    stats["unchanged"] = stats.get("unchanged", 0) + 1
+                continue
+            fingerprints.append((chassis_ip, fingerprint))
+        batch.append(result)
+        if len(batch) >= POLL_WRITE_BATCH_SIZE or time.monotonic() - last_flush >= POLL_WRITE_BATCH_SECONDS:
+            await _flush()
+            written += len(batch)
+            batch = []
+            fingerprints = []
+            last_flush = time.monotonic()
+    if batch:
+        await _flush()
+        written += len(batch)
+    return written
+
+
+def log_sweep_stats(category: str, count: int, started: float, stats: Dict):
+    """Print how long a sweep took and how much of it was spent waiting on the limiter"""
+    print(f"[POLL] {category} sweep: {count} target(s) in {time.monotonic() - started:.1f}s, "
+          f"limiter wait total {stats.get('wait', 0.0):.1f}s (max {stats.get('max_wait', 0.0):.1f}s, "
+          f"limits {poll_limiter.max_concurrency} global / {poll_limiter.per_chassis} per chassis)"
+          + (f", {stats['unchanged']} unchanged chassis skipped" if stats.get("unchanged") else "")
+          + (f", {stats['failed']} chassis without a result left as they were" if stats.get("failed") else "")
+          + (f", {stats['suspended']} suspended chassis skipped" if stats.get("suspended") else "")
+          + (f", {stats['unreachable']} chassis failed the TCP probe" if stats.get("unreachable") else ""))
+
 
 async def fetch_chassis_summary_for_one(chassis: Dict, retry_count: int = 3) -> Dict:
     """Fetch chassis summary data for a single chassis with retry logic and better error handling"""
-    def _sync_fetch():
-        import requests
-        from requests.exceptions import Timeout, ConnectionError as RequestsConnectionError
-        
-        last_exception = None
-        for attempt in range(retry_count):
-            try:
-                # Create session with longer timeout for slow chassis
-                session = IxRestSession(
-                    chassis["ip"], chassis["username"], chassis["password"], 
-                    verbose=False, timeout=30)  # Increased timeout to 30 seconds
-                out = ixOSRestCaller.get_chassis_information(session)
-                out["chassisIp"] = chassis["ip"]
-                if attempt > 0:
-                    print(f"[POLL] Chassis {chassis['ip']} succeeded on retry attempt {attempt + 1}")
-                return out
-            except Timeout as e:
-                last_exception = e
-                error_msg = f"Timeout after {30 if attempt == 0 else 30 * (attempt + 1)}s"
-                print(f"[POLL] Chassis {chassis['ip']} attempt {attempt + 1}/{retry_count}: {error_msg}")
-                if attempt < retry_count - 1:
-                    # Wait a bit before retrying (exponential backoff: 2s, 4s)
-                    import time
-                    wait_time = 2 * (attempt + 1)
-                    time.sleep(wait_time)
-                    continue
-            except RequestsConnectionError as e:
-                last_exception = e
-                print(f"[POLL] Chassis {chassis['ip']} attempt {attempt + 1}/{retry_count}: Connection error: {str(e)}")
-                if attempt < retry_count - 1:
-                    import time
-                    wait_time = 3 * (attempt + 1)
-                    time.sleep(wait_time)
-                    continue
-            except Exception as e:
-                last_exception = e
-                error_type = type(e).__name__
-                print(f"[POLL] Chassis {chassis['ip']} attempt {attempt + 1}/{retry_count}: {error_type}: {str(e)}")
-                if attempt < retry_count - 1:
-                    import time
-                    wait_time = 2 * (attempt + 1)
-                    time.sleep(wait_time)
-                    continue
-        
-        # If all retries failed, return error response
-        print(f"[POLL] Chassis {chassis['ip']} FAILED after {retry_count} attempts. Last error: {type(last_exception).__name__ if last_exception else 'Unknown'}")
-        return {
-            "chassisIp": chassis["ip"],
-                    "chassisSerial#": "NA",
-                    "controllerSerial#": "NA",
-                    "chassisType": "NA",
-                    "physicalCards#": "NA",
-                    "chassisStatus": "Not Reachable",
-                    "lastUpdatedAt_UTC": "NA",
-                    "mem_bytes": "NA", 
-                    "mem_bytes_total": "NA", 
-                    "cpu_pert_usage": "NA",
-                    "os": "NA",
-                    "IxOS": "NA",
-                    "IxNetwork Protocols": "NA",
-            "IxOS REST": "NA",
-            "chassisRole": "NA"
-        }
+    generation = poll_generation()
+    last_exception = None
+    if chassis_breaker.state(chassis["ip"]) == ChassisCircuitBreaker.HALF_OPEN:
+        # A half-open probe gets a single attempt, the breaker does the backing off
+        retry_count = 1
+    for attempt in range(retry_count):
+        session = None
+        try:
+            async with chassis_sessions.lease(chassis) as session:
+                out = await ixOSRestCaller.get_chassis_information_async(session)
+            out["chassisIp"] = chassis["ip"]
+            out["pollGeneration"] = generation
+            chassis_breaker.record_success(chassis["ip"])
+            if attempt > 0:
+                print(f"[POLL] Chassis {chassis['ip']} succeeded on retry attempt {attempt + 1}")
+            return out
+        except httpx.TimeoutException as e:
+            last_exception = e
+            if session is not None:
+                await chassis_sessions.invalidate(chassis["ip"], session)
+            print(f"[POLL] Chassis {chassis['ip']} attempt {attempt + 1}/{retry_count}: Timeout")
+            if attempt < retry_count - 1:
+                # Wait a bit before retrying (backoff: 2s, 4s)
+                await asyncio.sleep(2 * (attempt + 1))
+                continue
+        except httpx.TransportError as e:
+            last_exception = e
+            if session is not None:
+                await chassis_sessions.invalidate(chassis["ip"], session)
+            print(f"[POLL] Chassis {chassis['ip']} attempt {attempt + 1}/{retry_count}: Connection error: {str(e)}")
+            if attempt < retry_count - 1:
+                await asyncio.sleep(3 * (attempt + 1))
+                continue
+        except Exception as e:
+            last_exception = e
+            if session is not None and is_session_error(e):
+                await chassis_sessions.invalidate(chassis["ip"], session)
+            error_type = type(e).__name__
+            print(f"[POLL] Chassis {chassis['ip']} attempt {attempt + 1}/{retry_count}: {error_type}: {str(e)}")
+            if attempt < retry_count - 1:
+                await asyncio.sleep(2 * (attempt + 1))
+                continue
     
-    # Run the synchronous REST call in a thread pool to avoid blocking
-    return await asyncio.to_thread(_sync_fetch)
+    # If all retries failed, return error response
+    if last_exception is not None:
+        chassis_breaker.record_failure(chassis["ip"], last_exception)
+    print(f"[POLL] Chassis {chassis['ip']} FAILED after {retry_count} attempts. Last error: {type(last_exception).__name__ if last_exception else 'Unknown'}")
+    return unreachable_chassis_summary(chassis["ip"], generation)
+
+
+def poll_generation() -> int:
+    """Generation of a chassis summary poll: wall clock nanoseconds at its start.
+    The summary row of a chassis is only replaced by polls of a newer generation,
+    which orders manual refreshes (API process) and background polls alike."""
+    return time.time_ns()
+
+
+def unreachable_chassis_summary(chassis_ip: str, generation: Optional[int] = None) -> Dict:
+    """Summary record written for a chassis that could not be reached"""
+    # The chassis may be rebooting, so detect its OS again once it is back
+    ixOSRestCaller.forget_chassis_os(chassis_ip)
+    return {
+        "chassisIp": chassis_ip,
+        "pollGeneration": generation or poll_generation(),
+        "chassisSerial#": "NA",
+        "controllerSerial#": "NA",
+        "chassisType": "NA",
+        "physicalCards#": "NA",
+        "chassisStatus": "Not Reachable",
+        "lastUpdatedAt_UTC": "NA",
+        "mem_bytes": "NA", 
+        "mem_bytes_total": "NA", 
+        "cpu_pert_usage": "NA",
+        "os": "NA",
+        "IxOS": "NA",
+        "IxNetwork Protocols": "NA",
+        "IxOS REST": "NA",
+        "chassisRole": "NA"
+    }
 
 
 async def get_chassis_summary_data():
     """This is a call to RestAPI to get chassis summary data - async version"""
-    serv_list = await read_username_password_from_database()
-    if serv_list:
-        chassis_list = json.loads(serv_list)
+    chassis_list = await chassis_config.get()
+    if chassis_list:
+        await chassis_sessions.prune(chassis_list)
         print(f"[POLL] Starting chassis data fetch for {len(chassis_list)} chassis(es)")
-        # Fetch all chassis data concurrently
-        tasks = [fetch_chassis_summary_for_one(chassis) for chassis in chassis_list]
-        list_of_chassis = await asyncio.gather(*tasks)
+        # Chassis suspended by the circuit breaker keep their last data, shown as Suspended
+        started = time.monotonic()
+        poll_list, suspended_ips, unreachable_ips = await select_chassis_to_poll(chassis_list)
+        await mark_chassis_suspended(suspended_ips)
+        if unreachable_ips:
+            await write_data_to_database(table_name="chassis_summary_details", ip_tags_dict={},
+                                         records=[unreachable_chassis_summary(ip) for ip in unreachable_ips])
+        # Fetch all chassis data concurrently, bounded by the poll limiter,
+        # and write each batch as soon as it is complete
+        stats = {"suspended": len(suspended_ips), "unreachable": len(unreachable_ips)}
+        tasks = [poll_limiter.run(chassis["ip"], stats, fetch_chassis_summary_for_one, chassis)
+                 for chassis in poll_list]
+        failed_ips = list(unreachable_ips)
+        
+        def _track_failures(record):
+            if record.get("chassisStatus") == "Not Reachable":
+                failed_ips.append(record["chassisIp"])
+        
+        written = await stream_to_database("chassis_summary_details", tasks, ip_tags_dict={},
+                                           on_result=_track_failures)
+        await save_breaker_state(chassis_list)
+        log_sweep_stats("chassis", len(chassis_list), started, stats)
         
         # Log results
-        successful = [c for c in list_of_chassis if c.get("chassisStatus") != "Not Reachable"]
-        failed = [c for c in list_of_chassis if c.get("chassisStatus") == "Not Reachable"]
-        print(f"[POLL] Chassis fetch completed: {len(successful)} successful, {len(failed)} failed")
-        if failed:
-            failed_ips = [c["chassisIp"] for c in failed]
+        print(f"[POLL] Chassis fetch completed: {written + len(unreachable_ips) - len(failed_ips)} successful, {len(failed_ips)} failed")
+        if failed_ips:
             print(f"[POLL] Failed chassis IPs: {', '.join(failed_ips)}")
-        
-        # Pass all results to write_data_to_database
-        await write_data_to_database(
-            table_name="chassis_summary_details",
-            records=list_of_chassis, 
-            ip_tags_dict={}
-        )
         print(f"[POLL] Chassis data written to database")
     else:
         print("[POLL] No Chassis List found in database")
 
 
-async def fetch_chassis_card_for_one(chassis: Dict, chassis_type: str) -> List[Dict]:
-    """Fetch chassis card data for a single chassis"""
-    def _sync_fetch():
-        try:
-            session = IxRestSession(
-                chassis["ip"], chassis["username"], chassis["password"], verbose=False)
-            out = ixOSRestCaller.get_chassis_cards_information(
-                session, chassis["ip"], chassis_type)
-            return out
-        except Exception:
-            return [{
-                'chassisIp': chassis["ip"], 
-                'chassisType': 'NA', 
-                'cardNumber': 'NA', 
-                'serialNumber': 'NA', 
-                'cardType': 'NA', 
-                'cardState': 'NA', 
-                'numberOfPorts': 'NA', 
-                'lastUpdatedAt_UTC': 'NA'
-            }]
-    
-    return await asyncio.to_thread(_sync_fetch)
+async def fetch_chassis_card_for_one(chassis: Dict, chassis_type: str) -> Optional[Tuple[str, List[Dict]]]:
+    """Fetch chassis card data for a single chassis as (chassis ip, records), or None if it failed"""
+    session = None
+    try:
+        async with chassis_sessions.lease(chassis) as session:
+            result = await ixOSRestCaller.get_chassis_cards_information_async(session, chassis["ip"], chassis_type)
+        chassis_breaker.record_success(chassis["ip"])
+        return chassis["ip"], result
+    except Exception as e:
+        chassis_breaker.record_failure(chassis["ip"], e)
+        if session is not None and is_session_error(e):
+            await chassis_sessions.invalidate(chassis["ip"], session)
+        print(f"[POLL] Chassis {chassis['ip']} card fetch failed, keeping its last rows: {type(e).__name__}: {e}")
+        return None
 
 
 async def get_chassis_card_data():
     """This is a call to RestAPI to get chassis card summary data - async version"""
-    serv_list = await read_username_password_from_database()
-    if serv_list:
-        chassis_list = json.loads(serv_list)
-        # Fetch all chassis types concurrently first
-        chassis_type_tasks = [get_chassis_type_from_ip(chassis["ip"]) for chassis in chassis_list]
-        chassis_types = await asyncio.gather(*chassis_type_tasks)
-        
-        # Fetch all chassis card data concurrently
-        tasks = [fetch_chassis_card_for_one(chassis, chassis_type) 
-                 for chassis, chassis_type in zip(chassis_list, chassis_types)]
-        results = await asyncio.gather(*tasks)
-        # Keep the nested structure (list of lists) as expected by write_data_to_database
-        list_of_cards = results
+    chassis_list = await chassis_config.get()
+    change_detector.sync(chassis_config.version, "chassis_card_details", [chassis["ip"] for chassis in chassis_list])
+    if chassis_list:
+        await chassis_sessions.prune(chassis_list)
+        # Suspended chassis and chassis failing the TCP probe are skipped and keep their last rows
+        started = time.monotonic()
+        poll_list, suspended_ips, unreachable_ips = await select_chassis_to_poll(chassis_list)
+        # Chassis types come from the in-process metadata cache (one query when stale)
+        chassis_types = await get_chassis_types_from_ips([chassis["ip"] for chassis in poll_list])
         
-        await write_data_to_database(
-            table_name="chassis_card_details",
-            records=list_of_cards, 
-            ip_tags_dict={}
-        )
-
-
-async def fetch_chassis_port_for_one(chassis: Dict, chassis_type: str) -> List[Dict]:
-    """Fetch chassis port data for a single chassis"""
-    def _sync_fetch():
-        try:
-            session = IxRestSession(
-                chassis["ip"], chassis["username"], chassis["password"], verbose=False)
-            out = ixOSRestCaller.get_chassis_ports_information(
-                session, chassis["ip"], chassis_type)
-            return out
-        except Exception:
-            return [{
-                'owner': 'NA',
-                'transceiverModel': 'NA',
-                'transceiverManufacturer': 'NA',
-                'portNumber': 'NA',
-                'linkState': 'NA',
-                'cardNumber': 'NA',
-                'lastUpdatedAt_UTC': 'NA',
-                'totalPorts': 'NA',
-                'ownedPorts': 'NA',
-                'freePorts': 'NA',
-                'chassisIp': chassis["ip"],
-                'typeOfChassis': 'NA',
-                'transmitState': 'NA'
-            }]
-    
-    return await asyncio.to_thread(_sync_fetch)
+        # Fetch every chassis concurrently, bounded by the poll limiter, and write
+        # each chassis' list of records in batches as they complete
+        stats = {"suspended": len(suspended_ips), "unreachable": len(unreachable_ips)}
+        tasks = [poll_limiter.run(chassis["ip"], stats, fetch_chassis_card_for_one, chassis, chassis_type)
+                 for chassis, chassis_type in zip(poll_list, chassis_types)]
+        await stream_to_database("chassis_card_details", tasks, ip_tags_dict={}, detect_changes=True, stats=stats)
+        chassis_ips = [chassis["ip"] for chassis in chassis_list]
+        await delete_stale_chassis_rows("chassis_card_details", chassis_ips)
+        await save_breaker_state(chassis_list)
+        log_sweep_stats("cards", len(chassis_list), started, stats)
+
+
+async def fetch_chassis_port_for_one(chassis: Dict, chassis_type: str) -> Optional[Tuple[str, List[Dict]]]:
+    """Fetch chassis port data for a single chassis as (chassis ip, records), or None if it failed"""
+    session = None
+    try:
+        async with chassis_sessions.lease(chassis) as session:
+            result = await ixOSRestCaller.get_chassis_ports_information_async(session, chassis["ip"], chassis_type)
+        chassis_breaker.record_success(chassis["ip"])
+        return chassis["ip"], result
+    except Exception as e:
+        chassis_breaker.record_failure(chassis["ip"], e)
+        if session is not None and is_session_error(e):
+            await chassis_sessions.invalidate(chassis["ip"], session)
+        print(f"[POLL] Chassis {chassis['ip']} port fetch failed, keeping its last rows: {type(e).__name__}: {e}")
+        return None
 
 
 async def get_chassis_port_data():
     """This is a call to RestAPI to get chassis card port summary data - async version"""
-    serv_list = await read_username_password_from_database()
-    if serv_list:
-        chassis_list = json.loads(serv_list)
-        if chassis_list:
-            # Fetch all chassis types concurrently first
-            chassis_type_tasks = [get_chassis_type_from_ip(chassis["ip"]) for chassis in chassis_list]
-            chassis_types = await asyncio.gather(*chassis_type_tasks)
-            
-            # Fetch all chassis port data concurrently
-            tasks = [fetch_chassis_port_for_one(chassis, chassis_type) 
-                     for chassis, chassis_type in zip(chassis_list, chassis_types)]
-            results = await asyncio.gather(*tasks)
-            # Keep the nested structure (list of lists) as expected by write_data_to_database
-            port_list_details = results
-            
-            await write_data_to_database(
-                table_name="chassis_port_details", 
-                records=port_list_details
-            )
-
-
-async def fetch_chassis_license_for_one(chassis: Dict, chassis_type: str) -> List[Dict]:
-    """Fetch chassis license data for a single chassis"""
-    def _sync_fetch():
-        try:
-            session = IxRestSession(
-                chassis["ip"], chassis["username"], chassis["password"], verbose=False)
-            out = ixOSRestCaller.get_license_activation(
-                session, chassis["ip"], chassis_type)
-            return out
-        except Exception:
-            return [{
-                'chassisIp': chassis["ip"],
-                'typeOfChassis': 'NA',
-                'hostId': 'NA',
-                'partNumber': 'NA',
-                'activationCode': 'NA',
-                'quantity': 'NA',
-                'description': 'NA',
-                'maintenanceDate': 'NA',
-                'expiryDate': 'NA',
-                'isExpired': 'NA',
-                'lastUpdatedAt_UTC': 'NA'
-            }]
-    
-    return await asyncio.to_thread(_sync_fetch)
+    chassis_list = await chassis_config.get()
+    change_detector.sync(chassis_config.version, "chassis_port_details", [chassis["ip"] for chassis in chassis_list])
+    if chassis_list:
+        await chassis_sessions.prune(chassis_list)
+        # Suspended chassis and chassis failing the TCP probe are skipped and keep their last rows
+        started = time.monotonic()
+        poll_list, suspended_ips, unreachable_ips = await select_chassis_to_poll(chassis_list)
+        # Chassis types come from the in-process metadata cache (one query when stale)
+        chassis_types = await get_chassis_types_from_ips([chassis["ip"] for chassis in poll_list])
+        
+        # Fetch every chassis concurrently, bounded by the poll limiter, and write
+        # each chassis' list of records in batches as they complete
+        stats = {"suspended": len(suspended_ips), "unreachable": len(unreachable_ips)}
+        tasks = [poll_limiter.run(chassis["ip"], stats, fetch_chassis_port_for_one, chassis, chassis_type)
+                 for chassis, chassis_type in zip(poll_list, chassis_types)]
+        await stream_to_database("chassis_port_details", tasks, detect_changes=True, stats=stats)
+        chassis_ips = [chassis["ip"] for chassis in chassis_list]
+        await delete_stale_chassis_rows("chassis_port_details", chassis_ips)
+        await save_breaker_state(chassis_list)
+        log_sweep_stats("ports", len(chassis_list), started, stats)
+
+
+async def fetch_chassis_license_for_one(chassis: Dict, chassis_type: str) -> Optional[Tuple[str, List[Dict]]]:
+    """Fetch chassis license data for a single chassis as (chassis ip, records), or None if it failed"""
+    session = None
+    try:
+        async with chassis_sessions.lease(chassis) as session:
+            result = await ixOSRestCaller.get_license_activation_async(session, chassis["ip"], chassis_type)
+        chassis_breaker.record_success(chassis["ip"])
+        return chassis["ip"], result
+    except Exception as e:
+        chassis_breaker.record_failure(chassis["ip"], e)
+        if session is not None and is_session_error(e):
+            await chassis_sessions.invalidate(chassis["ip"], session)
+        print(f"[POLL] Chassis {chassis['ip']} license fetch failed, keeping its last rows: {type(e).__name__}: {e}")
+        return None
 
 
 async def get_chassis_licensing_data():
     """This is a call to RestAPI to get chassis licensing data - async version"""
-    serv_list = await read_username_password_from_database()
-    if serv_list:
-        chassis_list = json.loads(serv_list)
-        # Fetch all chassis types concurrently first
-        chassis_type_tasks = [get_chassis_type_from_ip(chassis["ip"]) for chassis in chassis_list]
-        chassis_types = await asyncio.gather(*chassis_type_tasks)
-        
-        # Fetch all chassis license data concurrently
-        tasks = [fetch_chassis_license_for_one(chassis, chassis_type) 
-                 for chassis, chassis_type in zip(chassis_list, chassis_types)]
-        results = await asyncio.gather(*tasks)
-        # Keep the nested structure (list of lists) as expected by write_data_to_database
-        list_of_licenses = results
+    chassis_list = await chassis_config.get()
+    change_detector.sync(chassis_config.version, "license_details_records", [chassis["ip"] for chassis in chassis_list])
+    if chassis_list:
+        await chassis_sessions.prune(chassis_list)
+        # Suspended chassis and chassis failing the TCP probe are skipped and keep their last rows
+        started = time.monotonic()
+        poll_list, suspended_ips, unreachable_ips = await select_chassis_to_poll(chassis_list)
+        # Chassis types come from the in-process metadata cache (one query when stale)
+        chassis_types = await get_chassis_types_from_ips([chassis["ip"] for chassis in poll_list])
         
-        await write_data_to_database(
-            table_name="license_details_records", 
-            records=list_of_licenses
-        )
-
-
-async def fetch_sensor_info_for_one(chassis: Dict, chassis_type: str) -> List[Dict]:
-    """Fetch sensor information for a single chassis"""
-    def _sync_fetch():
-        try:
-            session = IxRestSession(
-                chassis["ip"], chassis["username"], chassis["password"], verbose=False)
-            out = ixOSRestCaller.get_sensor_information(
-                session, chassis["ip"], chassis_type)
-            return out
-        except Exception:
-            return [{
-                'type': 'NA',
-                'unit': 'NA',
-                'name': 'NA',
-                'value': 'NA',
-                'chassisIp': chassis["ip"],
-                'typeOfChassis': 'NA',
-                'lastUpdatedAt_UTC': 'NA'
-            }]
-    
-    return await asyncio.to_thread(_sync_fetch)
+        # Fetch every chassis concurrently, bounded by the poll limiter, and write
+        # each chassis' list of records in batches as they complete
+        stats = {"suspended": len(suspended_ips), "unreachable": len(unreachable_ips)}
+        tasks = [poll_limiter.run(chassis["ip"], stats, fetch_chassis_license_for_one, chassis, chassis_type)
+                 for chassis, chassis_type in zip(poll_list, chassis_types)]
+        await stream_to_database("license_details_records", tasks, detect_changes=True, stats=stats)
+        chassis_ips = [chassis["ip"] for chassis in chassis_list]
+        await delete_stale_chassis_rows("license_details_records", chassis_ips)
+        await save_breaker_state(chassis_list)
+        log_sweep_stats("licensing", len(chassis_list), started, stats)
+
+
+async def fetch_sensor_info_for_one(chassis: Dict, chassis_type: str) -> Optional[Tuple[str, List[Dict]]]:
+    """Fetch sensor information for a single chassis as (chassis ip, records), or None if it failed"""
+    session = None
+    try:
+        async with chassis_sessions.lease(chassis) as session:
+            result = await ixOSRestCaller.get_sensor_information_async(session, chassis["ip"], chassis_type)
+        chassis_breaker.record_success(chassis["ip"])
+        return chassis["ip"], result
+    except Exception as e:
+        chassis_breaker.record_failure(chassis["ip"], e)
+        if session is not None and is_session_error(e):
+            await chassis_sessions.invalidate(chassis["ip"], session)
+        print(f"[POLL] Chassis {chassis['ip']} sensor fetch failed, keeping its last rows: {type(e).__name__}: {e}")
+        return None
 
 
 async def get_sensor_information():
     """This is a call to RestAPI to get chassis sensors summary data - async version"""
-    serv_list = await read_username_password_from_database()
-    if serv_list:
-        chassis_list = json.loads(serv_list)
-        # Fetch all chassis types concurrently first
-        chassis_type_tasks = [get_chassis_type_from_ip(chassis["ip"]) for chassis in chassis_list]
-        chassis_types = await asyncio.gather(*chassis_type_tasks)
-        
-        # Fetch all chassis sensor data concurrently
-        tasks = [fetch_sensor_info_for_one(chassis, chassis_type) 
-                 for chassis, chassis_type in zip(chassis_list, chassis_types)]
-        results = await asyncio.gather(*tasks)
-        # Keep the nested structure (list of lists) as expected by write_data_to_database
-        sensor_list_details = results
+    chassis_list = await chassis_config.get()
+    change_detector.sync(chassis_config.version, "chassis_sensor_details", [chassis["ip"] for chassis in chassis_list])
+    if chassis_list:
+        await chassis_sessions.prune(chassis_list)
+        # Suspended chassis and chassis failing the TCP probe are skipped and keep their last rows
+        started = time.monotonic()
+        poll_list, suspended_ips, unreachable_ips = await select_chassis_to_poll(chassis_list)
+        # Chassis types come from the in-process metadata cache (one query when stale)
+        chassis_types = await get_chassis_types_from_ips([chassis["ip"] for chassis in poll_list])
         
-        await write_data_to_database(
-            table_name="chassis_sensor_details", 
-            records=sensor_list_details
-        )
-
-
-async def fetch_perf_metrics_for_one(chassis: Dict) -> Dict:
-    """Fetch performance metrics for a single chassis"""
-    def _sync_fetch():
-        try:
-            session = IxRestSession(
-                chassis["ip"], chassis["username"], chassis["password"], verbose=False)
-            out = ixOSRestCaller.get_perf_metrics(session, chassis["ip"])
-            return out
-        except Exception:
-            return {
-                'chassisIp': chassis["ip"], 
-                'mem_utilization': 0, 
-                'cpu_utilization': 0, 
-                'lastUpdatedAt_UTC': '03/15/2023, 03:31:47'
-            }
-    
-    return await asyncio.to_thread(_sync_fetch)
+        # Fetch every chassis concurrently, bounded by the poll limiter, and write
+        # each chassis' list of records in batches as they complete
+        stats = {"suspended": len(suspended_ips), "unreachable": len(unreachable_ips)}
+        tasks = [poll_limiter.run(chassis["ip"], stats, fetch_sensor_info_for_one, chassis, chassis_type)
+                 for chassis, chassis_type in zip(poll_list, chassis_types)]
+        await stream_to_database("chassis_sensor_details", tasks, detect_changes=True, stats=stats)
+        chassis_ips = [chassis["ip"] for chassis in chassis_list]
+        await delete_stale_chassis_rows("chassis_sensor_details", chassis_ips)
+        await save_breaker_state(chassis_list)
+        log_sweep_stats("sensors", len(chassis_list), started, stats)
+
+
+async def fetch_perf_metrics_for_one(chassis: Dict) -> Optional[Dict]:
+    """Fetch performance metrics for a single chassis, or None if it failed"""
+    session = None
+    try:
+        async with chassis_sessions.lease(chassis) as session:
+            result = await ixOSRestCaller.get_perf_metrics_async(session, chassis["ip"])
+        chassis_breaker.record_success(chassis["ip"])
+        # None when the chassis has no perf counters (Windows chassis)
+        return result
+    except Exception as e:
+        chassis_breaker.record_failure(chassis["ip"], e)
+        if session is not None and is_session_error(e):
+            await chassis_sessions.invalidate(chassis["ip"], session)
+        print(f"[POLL] Chassis {chassis['ip']} perf metrics fetch failed, no sample written: {type(e).__name__}: {e}")
+        return None
 
 
 async def get_perf_metrics():
     """This is a call to RestAPI to get chassis performance metrics data - async version"""
-    serv_list = await read_username_password_from_database()
-    perf_list_details = []
-    if serv_list:
-        chassis_list = json.loads(serv_list)
-        # Fetch all chassis performance metrics concurrently
-        tasks = [fetch_perf_metrics_for_one(chassis) for chassis in chassis_list]
-        perf_list_details = await asyncio.gather(*tasks)
-        
-        await write_data_to_database(
-            table_name="chassis_utilization_details", 
-            records=perf_list_details
-        )
-        
+    chassis_list = await chassis_config.get()
+    if chassis_list:
+        await chassis_sessions.prune(chassis_list)
+        started = time.monotonic()
+        poll_list, suspended_ips, unreachable_ips = await select_chassis_to_poll(chassis_list)
+        # Fetch all chassis performance metrics concurrently, bounded by the poll limiter
+        stats = {"suspended": len(suspended_ips), "unreachable": len(unreachable_ips)}
+        tasks = [poll_limiter.run(chassis["ip"], stats, fetch_perf_metrics_for_one, chassis)
+                 for chassis in poll_list]
+        await stream_to_database("chassis_utilization_details", tasks, stats=stats)
+        await save_breaker_state(chassis_list)
+        try:
+            await rollup_performance_metrics()
+        except Exception as e:
+            print(f"[POLL] Failed to roll up performance metrics: {e}")
+        log_sweep_stats("perf", len(chassis_list), started, stats)
+
 
-async def delete_half_metric_records_weekly():
-    """This method will do periodic cleanup of inventord DB performance metrics data"""
-    await delete_half_data_from_performance_metric_table()
+async def purge_performance_metrics():
+    """This method will do periodic cleanup of inventord DB performance metrics data
+    
+    Rolls up any pending samples first so nothing is purged before it is aggregated.
+    """
+    await rollup_performance_metrics()
+    deleted = await purge_expired_performance_metrics()
+    print("[POLL] data_purge: deleted " + ", ".join(f"{count} from {table}" for table, count in deleted.items()))
 
 
 # =====================================================================
@@ -418,9 +848,12 @@ async def get_ixnetwork_server_data():
         server_list = json.loads(serv_list)
         print(f"[POLL] Starting IxNetwork API server data fetch for {len(server_list)} server(s)")
         
-        # Fetch all server data concurrently
-        tasks = [fetch_ixnetwork_server_for_one(server) for server in server_list]
+        # Fetch all server data concurrently, bounded by the poll limiter
+        started, stats = time.monotonic(), {}
+        tasks = [poll_limiter.run(server["ip"], stats, fetch_ixnetwork_server_for_one, server)
+                 for server in server_list]
         list_of_servers = await asyncio.gather(*tasks)
+        log_sweep_stats("ixnetwork", len(server_list), started, stats)
         
         # Log results
         successful = [s for s in list_of_servers if s.get("ixnetwork_api_server_sessions") != "0"]
@@ -449,14 +882,90 @@ categoryToFuntionMap = {
     "licensing": get_chassis_licensing_data,
     "sensors": get_sensor_information,
     "perf": get_perf_metrics,
-    "data_purge": delete_half_metric_records_weekly,
+    "data_purge": purge_performance_metrics,
     "ixnetwork": get_ixnetwork_server_data
 }
 
 
 
+# Default intervals (in seconds) used when poll_setting has no value for a category.
+# data_purge is expressed in days, as in the poll_setting table.
+DEFAULT_POLL_INTERVALS = {
+    "chassis": 60,
+    "cards": 120,
+    "ports": 120,
+    "licensing": 300,
+    "sensors": 180,
+    "perf": 60,
+    "data_purge": 1,
+    "ixnetwork": 60
+}
+
+
+def resolve_poll_interval(category: str, poll_setting: Dict = None, interval="") -> int:
+    """Return the sleep interval in seconds for a category.
+
+    Priority: poll_setting row in the database, then the --interval option,
+    then DEFAULT_POLL_INTERVALS. data_purge values are days and converted here.
+    """
+    value = None
+    if poll_setting and poll_setting.get(category) is not None:
+        value = poll_setting[category]
+    elif interval not in (None, ""):
+        value = interval
+    try:
+        interval_seconds = int(value) if value is not None else DEFAULT_POLL_INTERVALS.get(category, 60)
+    except (TypeError, ValueError):
+        print(f"Error: Invalid interval value '{value}'. Using default for category '{category}'.")
+        interval_seconds = DEFAULT_POLL_INTERVALS.get(category, 60)
+    if category == "data_purge":
+        interval_seconds = interval_seconds * 24 * 60 * 60  # Convert days to seconds
+    return interval_seconds
+
+
+async def run_category_loop(category: str, interval="", start_delay: float = 0):
+    """Poll one category forever on the running event loop, sleeping its own interval between runs"""
+    if start_delay:
+        await asyncio.sleep(start_delay)
+    while True:
+        try:
+            poll_setting = await read_poll_setting_from_database()
+            interval_seconds = resolve_poll_interval(category, poll_setting, interval)
+            await poll_limiter.configure(poll_setting)
+            await categoryToFuntionMap[category]()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error during polling for category '{category}': {e}")
+            import traceback
+            traceback.print_exc()
+            # Sleep a bit before retrying
+            interval_seconds = 60
+        await asyncio.sleep(interval_seconds)
+
+
+async def run_scheduler(categories: List[str], interval=""):
+    """Run every requested category as a timed job on a single event loop.
+
+    All categories share one interpreter, so imports, database access and
+    chassis lookups are paid once per process instead of once per category.
+    Start times are staggered by a second to avoid every category hitting
+    the chassis at the same moment.
+    """
+    print(f"[POLL] Scheduler starting categories: {', '.join(categories)}")
+    tasks = [
+        asyncio.create_task(run_category_loop(category, interval, start_delay=index))
+        for index, category in enumerate(categories)
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        await close_db_pool()
+
+
 @click.command()
-@click.option('--category', default="", help='What chassis aspect to poll. chassis, cards, ports, licensing')
+@click.option('--category', default="", help='What chassis aspect to poll. chassis, cards, ports, licensing, ... '
+              'Use "all" (or a comma separated list) to run several categories in one process')
 @click.option('--interval', default="", help='Interval between Polls')
 def start_poller(category, interval): 
     """Since not all the parameters are modified with same interval, this way, we can specify exactly what we want to monitor at what interval
@@ -465,54 +974,24 @@ def start_poller(category, interval):
         interval (_type_): _description_
     """
     if not category:
-        print("Error: --category is required. Options: chassis, cards, ports, licensing, sensors, perf, data_purge")
+        print(f"Error: --category is required. Options: all, {', '.join(categoryToFuntionMap.keys())}")
         return
     
-    if category not in categoryToFuntionMap:
-        print(f"Error: Invalid category '{category}'. Options: {', '.join(categoryToFuntionMap.keys())}")
+    if category == "all":
+        categories = list(categoryToFuntionMap.keys())
+    else:
+        categories = [c.strip() for c in category.split(",") if c.strip()]
+    
+    invalid = [c for c in categories if c not in categoryToFuntionMap]
+    if invalid:
+        print(f"Error: Invalid category '{', '.join(invalid)}'. Options: all, {', '.join(categoryToFuntionMap.keys())}")
         return
     
-    # Default intervals (in seconds) if not provided
-    default_intervals = {
-        "chassis": 60,
-        "cards": 120,
-        "ports": 120,
-        "licensing": 300,
-        "sensors": 180,
-        "perf": 60,
-        "data_purge": 86400,
-        "ixnetwork": 60
-    }
+    # --interval only makes sense when a single category is polled
+    if len(categories) > 1:
+        interval = ""
     
-    while True:
-        poll_interval = asyncio.run(read_poll_setting_from_database())
-        if poll_interval and category in poll_interval:
-            interval = poll_interval[category]
-        elif not interval or interval == "":
-            # Use default if not set
-            interval = default_intervals.get(category, 60)
-        
-        try:
-            # Convert to int and handle data_purge special case
-            interval_seconds = int(interval)
-            if category == "data_purge":
-                interval_seconds = interval_seconds * 24 * 60 * 60  # Convert days to seconds
-            
-            # Execute the polling function
-            asyncio.run(categoryToFuntionMap[category]())
-            
-            # Sleep for the interval
-            time.sleep(interval_seconds)
-        except ValueError:
-            print(f"Error: Invalid interval value '{interval}'. Using default for category '{category}'.")
-            interval = default_intervals.get(category, 60)
-            time.sleep(int(interval))
-        except Exception as e:
-            print(f"Error during polling for category '{category}': {e}")
-            import traceback
-            traceback.print_exc()
-            # Sleep a bit before retrying
-            time.sleep(60)
+    asyncio.run(run_scheduler(categories, interval))
 
 
 if __name__ == '__main__':
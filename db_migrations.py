@@ -0,0 +1,141 @@
+"""
+Numbered schema migrations for the inventory database.
+
+init_db.py creates the tables from db_queries.py and then calls migrate(),
+which applies every migration newer than the version recorded in the
+schema_version table, each in its own transaction. Existing databases are
+upgraded in place; new migrations are appended to MIGRATIONS with the next
+version number and must never be renumbered or edited once released.
+"""
+
+import json
+import sqlite3
+from typing import Callable, List, Tuple
+
+import db_queries
+
+
+def _column_exists(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    return any(row[1] == column for row in conn.execute(f"PRAGMA table_info({table})"))
+
+
+def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone() is not None
+
+
+def _add_column(conn: sqlite3.Connection, table: str, column: str, column_type: str):
+    # Databases created before the migrations existed may already have the column
+    if not _column_exists(conn, table, column):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+
+def _add_chassis_role(conn: sqlite3.Connection):
+    _add_column(conn, "chassis_summary_details", "chassisRole", "TEXT")
+
+
+def _add_poll_concurrency_limits(conn: sqlite3.Connection):
+    _add_column(conn, "poll_setting", "max_concurrency", "INTEGER")
+    _add_column(conn, "poll_setting", "per_chassis_concurrency", "INTEGER")
+
+
+def _add_inventory_keys(conn: sqlite3.Connection):
+    for table, index, columns in db_queries.inventory_key_indexes:
+        conn.execute(db_queries.dedupe_inventory_keys_sql.format(table=table, columns=columns))
+        conn.execute(db_queries.create_inventory_key_index_sql.format(index=index, table=table, columns=columns))
+
+
+def _add_lookup_indexes(conn: sqlite3.Connection):
+    for statement in db_queries.lookup_indexes:
+        conn.execute(statement)
+
+
+def _add_utilization_epoch(conn: sqlite3.Connection):
+    # Tables created by a current init_db already have the typed columns
+    if not _column_exists(conn, "chassis_utilization_details", "sampledAt"):
+        conn.execute("ALTER TABLE chassis_utilization_details RENAME TO chassis_utilization_details_legacy")
+        conn.execute(db_queries.create_usage_metrics)
+        conn.execute(db_queries.copy_legacy_usage_metrics_sql)
+        conn.execute("DROP TABLE chassis_utilization_details_legacy")
+    for statement in db_queries.utilization_indexes:
+        conn.execute(statement)
+
+
+def _add_utilization_rollups(conn: sqlite3.Connection):
+    conn.execute(db_queries.create_utilization_rollup_state_table)
+    for table in db_queries.utilization_rollup_tables:
+        conn.execute(db_queries.create_utilization_rollup_sql.format(table=table))
+        conn.execute(db_queries.create_utilization_rollup_index_sql.format(table=table))
+
+
+def _move_credentials_out_of_user_db(conn: sqlite3.Connection):
+    conn.execute(db_queries.create_chassis_credentials_table)
+    conn.execute(db_queries.create_chassis_credentials_version_table)
+    if _table_exists(conn, "user_db"):
+        for (servers_json,) in conn.execute("SELECT ixia_servers_json FROM user_db").fetchall():
+            for chassis in json.loads(servers_json or "[]"):
+                conn.execute("""INSERT OR REPLACE INTO chassis_credentials (ip, username, password, lastUpdatedAt_UTC)
+                             VALUES (?, ?, ?, datetime('now'))""",
+                             (chassis["ip"], chassis["username"], chassis["password"]))
+        conn.execute("DROP TABLE user_db")
+    conn.execute("INSERT OR IGNORE INTO chassis_credentials_version (id, version) VALUES (1, 0)")
+    conn.execute("UPDATE chassis_credentials_version SET version = version + 1")
+
+
+def _add_summary_poll_generation(conn: sqlite3.Connection):
+    _add_column(conn, "chassis_summary_details", "pollGeneration", "INTEGER NOT NULL DEFAULT 0")
+    table, index, columns = db_queries.summary_key_index
+    conn.execute(db_queries.dedupe_inventory_keys_sql.format(table=table, columns=columns))
+    conn.execute(db_queries.create_inventory_key_index_sql.format(index=index, table=table, columns=columns))
+    # Superseded by the unique index
+    conn.execute("DROP INDEX IF EXISTS ix_chassis_summary_details_ip")
+
+
+def _add_inventory_generation(conn: sqlite3.Connection):
+    conn.execute(db_queries.create_inventory_generation_table)
+
+
+# (version, description, migration)
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "chassisRole column on chassis_summary_details", _add_chassis_role),
+    (2, "poll concurrency limits on poll_setting", _add_poll_concurrency_limits),
+    (3, "natural key unique indexes on cards, ports and sensors", _add_inventory_keys),
+    (4, "chassis IP and time column indexes", _add_lookup_indexes),
+    (5, "REAL utilization and epoch sampledAt on chassis_utilization_details", _add_utilization_epoch),
+    (6, "5 minute and 1 hour utilization rollup tables", _add_utilization_rollups),
+    (7, "chassis_credentials table replacing the user_db JSON list", _move_credentials_out_of_user_db),
+    (8, "pollGeneration column and unique ip on chassis_summary_details", _add_summary_poll_generation),
+    (9, "inventory_generation table for API inventory views", _add_inventory_generation),
+]
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    """Return the highest migration version applied to the database"""
+    conn.execute(db_queries.create_schema_version_table)
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Apply pending migrations in order and return the resulting schema version"""
+    version = current_version(conn)
+    isolation_level = conn.isolation_level
+    # Manage transactions explicitly so DDL and the version row commit together
+    conn.isolation_level = None
+    try:
+        for number, description, migration in MIGRATIONS:
+            if number <= version:
+                continue
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                migration(conn)
+                conn.execute("INSERT INTO schema_version (version, description, appliedAt_UTC) VALUES (?, ?, datetime('now'))",
+                             (number, description))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            version = number
+            print(f"[INIT] Applied schema migration {number}: {description}")
+    finally:
+        conn.isolation_level = isolation_level
+    return version
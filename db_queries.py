@@ -14,7 +14,8 @@ create_chassis_summary_sql = """CREATE TABLE IF NOT EXISTS chassis_summary_detai
                                 mem_bytes_total TEXT,
                                 cpu_pert_usage TEXT,
                                 os TEXT,
-                                chassisRole TEXT
+                                chassisRole TEXT,
+                                pollGeneration INTEGER NOT NULL DEFAULT 0
                                 );"""
                             
                                             
@@ -73,13 +74,84 @@ create_sensor_details_sql = """CREATE TABLE IF NOT EXISTS chassis_sensor_details
                                 unit TEXT,
                                 lastUpdatedAt_UTC TEXT
                                 );"""
-                                            
+
+# Natural keys of the polled inventory tables, written with INSERT ... ON CONFLICT DO UPDATE.
+# Each entry removes duplicate keys left by the old delete-and-insert writes (keeping the
+# newest row) before creating the unique index.
+inventory_key_indexes = [
+    ("chassis_card_details", "ux_chassis_card_details_key", "chassisIp, cardNumber"),
+    ("chassis_port_details", "ux_chassis_port_details_key", "chassisIp, cardNumber, portNumber"),
+    ("chassis_sensor_details", "ux_chassis_sensor_details_key", "chassisIp, sensorName"),
+]
+
+dedupe_inventory_keys_sql = """DELETE FROM {table} WHERE rowid NOT IN
+                                (SELECT MAX(rowid) FROM {table} GROUP BY {columns});"""
+
+create_inventory_key_index_sql = """CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {table} ({columns});"""
+
+# One summary row per chassis, upserted only by newer poll generations
+summary_key_index = ("chassis_summary_details", "ux_chassis_summary_details_ip", "ip")
+
+# Indexes for lookups by chassis IP (per-chassis reads and deletes).
+# Cards, ports and sensors are covered by their keys.
+lookup_indexes = [
+    "CREATE INDEX IF NOT EXISTS ix_chassis_summary_details_ip ON chassis_summary_details (ip);",
+    "CREATE INDEX IF NOT EXISTS ix_license_details_records_chassisIp ON license_details_records (chassisIp);",
+    "CREATE INDEX IF NOT EXISTS ix_user_ip_tags_ip ON user_ip_tags (ip);",
+    "CREATE INDEX IF NOT EXISTS ix_user_card_tags_serialNumber ON user_card_tags (serialNumber);",
+]
+
+# Performance metrics: utilization as REAL and the sample time as unix epoch seconds (UTC),
+# so per-chassis range reads and the oldest-first purge are index scans in time order.
 create_usage_metrics = """CREATE TABLE IF NOT EXISTS chassis_utilization_details (
                                             chassisIp VARCHAR(255) NOT NULL,
-                                            mem_utilization TEXT, 
-                                            cpu_utilization TEXT,
-                                            lastUpdatedAt_UTC TEXT
+                                            mem_utilization REAL, 
+                                            cpu_utilization REAL,
+                                            sampledAt INTEGER NOT NULL
                                             );"""
+
+utilization_indexes = [
+    "CREATE INDEX IF NOT EXISTS ix_chassis_utilization_details_chassisIp ON chassis_utilization_details (chassisIp, sampledAt);",
+    "CREATE INDEX IF NOT EXISTS ix_chassis_utilization_details_time ON chassis_utilization_details (sampledAt);",
+]
+
+# 5 minute and 1 hour min/avg/max rollups of chassis_utilization_details. Raw samples
+# are rolled into 5 minute buckets and those into 1 hour buckets, each bucket keyed by
+# its start in epoch seconds. samples is the number of raw samples in the bucket.
+create_utilization_rollup_sql = """CREATE TABLE IF NOT EXISTS {table} (
+                                    chassisIp VARCHAR(255) NOT NULL,
+                                    bucketStart INTEGER NOT NULL,
+                                    samples INTEGER NOT NULL,
+                                    mem_min REAL,
+                                    mem_avg REAL,
+                                    mem_max REAL,
+                                    cpu_min REAL,
+                                    cpu_avg REAL,
+                                    cpu_max REAL,
+                                    PRIMARY KEY (chassisIp, bucketStart)
+                                    );"""
+
+utilization_rollup_tables = ["chassis_utilization_rollup_5m", "chassis_utilization_rollup_1h"]
+
+create_utilization_rollup_index_sql = """CREATE INDEX IF NOT EXISTS ix_{table}_time ON {table} (bucketStart);"""
+
+# Rollup watermark per bucket size: everything before it has been rolled up
+create_utilization_rollup_state_table = """CREATE TABLE IF NOT EXISTS utilization_rollup_state (
+                                bucketSeconds INTEGER NOT NULL PRIMARY KEY,
+                                watermark INTEGER NOT NULL
+                                );"""
+
+# Copies rows of the pre-epoch table (TEXT utilization, "%m/%d/%Y, %H:%M:%S" timestamps)
+# into the rebuilt one. Rows whose timestamp does not parse are dropped.
+copy_legacy_usage_metrics_sql = """INSERT INTO chassis_utilization_details (chassisIp, mem_utilization, cpu_utilization, sampledAt)
+                                SELECT chassisIp, mem_utilization, cpu_utilization, sampledAt FROM (
+                                    SELECT chassisIp,
+                                           CAST(mem_utilization AS REAL) AS mem_utilization,
+                                           CAST(cpu_utilization AS REAL) AS cpu_utilization,
+                                           CAST(strftime('%s', substr(lastUpdatedAt_UTC, 7, 4) || '-' || substr(lastUpdatedAt_UTC, 1, 2) || '-' ||
+                                                substr(lastUpdatedAt_UTC, 4, 2) || ' ' || substr(lastUpdatedAt_UTC, 13, 8)) AS INTEGER) AS sampledAt
+                                    FROM chassis_utilization_details_legacy ORDER BY rowid)
+                                WHERE sampledAt IS NOT NULL;"""
                                             
 
 create_ip_tags_sql = """CREATE TABLE IF NOT EXISTS user_ip_tags (
@@ -99,8 +171,25 @@ create_perf_metrics_sql = """CREATE TABLE IF NOT EXISTS perf_metrics (
                                 cpu_pert_usage TEXT
                                 );"""
                                 
-create_usenname_password_table = """CREATE TABLE IF NOT EXISTS user_db (
-                                ixia_servers_json TEXT
+# Chassis credentials, one row per chassis in the order they were added. Every change
+# bumps chassis_credentials_version so pollers only re-read the list when it moved.
+create_chassis_credentials_table = """CREATE TABLE IF NOT EXISTS chassis_credentials (
+                                ip VARCHAR(255) NOT NULL PRIMARY KEY,
+                                username TEXT NOT NULL,
+                                password TEXT NOT NULL,
+                                lastUpdatedAt_UTC TEXT
+                                );"""
+
+create_chassis_credentials_version_table = """CREATE TABLE IF NOT EXISTS chassis_credentials_version (
+                                id INTEGER NOT NULL PRIMARY KEY CHECK (id = 1),
+                                version INTEGER NOT NULL
+                                );"""
+
+# Generation counter per inventory table, bumped in the same transaction as every write
+# to it. The API rebuilds its in-memory views of a table only when its generation moved.
+create_inventory_generation_table = """CREATE TABLE IF NOT EXISTS inventory_generation (
+                                tableName TEXT NOT NULL PRIMARY KEY,
+                                generation INTEGER NOT NULL
                                 );"""
 
 create_poll_settings_table = """CREATE TABLE IF NOT EXISTS poll_setting (
@@ -111,11 +200,23 @@ create_poll_settings_table = """CREATE TABLE IF NOT EXISTS poll_setting (
                                 perf INTEGER,
                                 licensing INTEGER,
                                 data_purge INTEGER,
-                                alertMonitor INTEGER
+                                alertMonitor INTEGER,
+                                max_concurrency INTEGER,
+                                per_chassis_concurrency INTEGER
+                                );"""
+
+# Circuit breaker state of each chassis, written by the poller and shown by the UI
+create_chassis_poll_state_table = """CREATE TABLE IF NOT EXISTS chassis_poll_state (
+                                ip VARCHAR(255) NOT NULL PRIMARY KEY,
+                                state TEXT,
+                                consecutiveFailures INTEGER,
+                                nextProbeAt TEXT,
+                                lastError TEXT,
+                                lastUpdatedAt_UTC TEXT
                                 );"""
 
 # IxNetwork API Server tables
-# Stores credentials for IxNetwork API Servers (similar to user_db for chassis)
+# Stores credentials for IxNetwork API Servers as a JSON list
 create_ixnetwork_user_db_table = """CREATE TABLE IF NOT EXISTS ixnetwork_user_db (
                                 ixnetwork_servers_json TEXT
                                 );"""
@@ -125,4 +226,11 @@ create_ixnetwork_api_server_details_table = """CREATE TABLE IF NOT EXISTS ixnetw
                                 ixnetwork_api_server_ip VARCHAR(255) NOT NULL,
                                 ixnetwork_api_server_sessions TEXT,
                                 lastUpdatedAt_UTC TEXT
-                                );"""
\ No newline at end of file
+                                );"""
+
+# Migrations applied by db_migrations.migrate()
+create_schema_version_table = """CREATE TABLE IF NOT EXISTS schema_version (
+                                version INTEGER NOT NULL PRIMARY KEY,
+                                description TEXT,
+                                appliedAt_UTC TEXT
+                                );"""
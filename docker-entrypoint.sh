@@ -69,6 +69,12 @@ conn.close()
 print('[INIT] Verified WAL mode is enabled')
 " 2>/dev/null || true
     fi
+else
+    # Existing database: init_db.py only creates what is missing and migrates
+    # tables, columns and indexes added since the database was created
+    echo "[INIT] Updating database schema at $DB_PATH..."
+    export DATABASE_PATH="$DB_PATH"
+    python3 /app/init_db.py
 fi
 
 # Create symlink for compatibility (if needed)
@@ -79,47 +85,20 @@ fi
 
 # Start background polling processes (only if not in minimal mode)
 if [ "${MINIMAL_MODE:-false}" != "true" ]; then
-    echo "[INIT] Starting background polling processes..."
-python3 /app/data_poller.py --category=chassis &
-CHASSIS_PID=$!
-    sleep 1
-
-python3 /app/data_poller.py --category=cards &
-CARDS_PID=$!
-    sleep 1
-
-python3 /app/data_poller.py --category=ports &
-PORTS_PID=$!
-    sleep 1
-
-python3 /app/data_poller.py --category=licensing &
-LICENSING_PID=$!
-    sleep 1
-
-python3 /app/data_poller.py --category=perf &
-PERF_PID=$!
-    sleep 1
-
-python3 /app/data_poller.py --category=sensors &
-SENSORS_PID=$!
-    sleep 1
-
-python3 /app/data_poller.py --category=data_purge &
-PURGE_PID=$!
-    sleep 1
-
-python3 /app/data_poller.py --category=ixnetwork &
-IXNETWORK_PID=$!
+    echo "[INIT] Starting background poller..."
+    # One scheduler process runs every poll category on a single event loop
+python3 /app/data_poller.py --category=all &
+POLLER_PID=$!
 
-    echo "[INIT] Background polling processes started"
+    echo "[INIT] Background poller started"
 else
     echo "[INIT] Minimal mode: Skipping background polling"
 fi
 
 # Function to handle shutdown
 cleanup() {
-    echo "[SHUTDOWN] Shutting down background processes..."
-    kill $CHASSIS_PID $CARDS_PID $PORTS_PID $LICENSING_PID $PERF_PID $SENSORS_PID $PURGE_PID $IXNETWORK_PID 2>/dev/null || true
+    echo "[SHUTDOWN] Shutting down background poller..."
+    kill $POLLER_PID 2>/dev/null || true
     wait
     exit 0
 }
@@ -15,6 +15,7 @@ import sqlite3
 from sqlite3 import Error
 import os
 import db_queries
+import db_migrations
 
 
 def create_connection(db_file):
@@ -46,8 +47,16 @@ def delete_table(conn):
             "DROP TABLE IF EXISTS chassis_sensor_details",
             "DROP TABLE IF EXISTS license_details_records",
             "DROP TABLE IF EXISTS user_db",
+            "DROP TABLE IF EXISTS chassis_credentials",
+            "DROP TABLE IF EXISTS chassis_credentials_version",
             "DROP TABLE IF EXISTS poll_setting",
             "DROP TABLE IF EXISTS chassis_utilization_details",
+            "DROP TABLE IF EXISTS chassis_utilization_rollup_5m",
+            "DROP TABLE IF EXISTS chassis_utilization_rollup_1h",
+            "DROP TABLE IF EXISTS utilization_rollup_state",
+            "DROP TABLE IF EXISTS chassis_poll_state",
+            "DROP TABLE IF EXISTS inventory_generation",
+            "DROP TABLE IF EXISTS schema_version",
             "DROP TABLE IF EXISTS ixnetwork_user_db",
             "DROP TABLE IF EXISTS ixnetwork_api_server_details"]
     try:
@@ -82,16 +91,10 @@ def create_data_tables():
     if conn is not None:
         
         # delete_table(conn)
-        create_table(conn, db_queries.create_usenname_password_table)
+        create_table(conn, db_queries.create_chassis_credentials_table)
+        create_table(conn, db_queries.create_chassis_credentials_version_table)
         
         create_table(conn, db_queries.create_chassis_summary_sql)
-        # Migrate existing DB: add chassisRole if missing
-        try:
-            conn.execute("ALTER TABLE chassis_summary_details ADD COLUMN chassisRole TEXT")
-            conn.commit()
-            print("[INIT] Added chassisRole column to chassis_summary_details")
-        except Exception:
-            pass  # Column already exists
         create_table(conn, db_queries.create_card_details_records_sql)
         create_table(conn, db_queries.create_port_details_records_sql)
         create_table(conn, db_queries.create_license_details_records_sql)
@@ -101,14 +104,29 @@ def create_data_tables():
         create_table(conn, db_queries.create_ip_tags_sql)
         create_table(conn, db_queries.create_card_tags_sql)
         create_table(conn, db_queries.create_usage_metrics)
+        create_table(conn, db_queries.create_utilization_rollup_state_table)
+        for table in db_queries.utilization_rollup_tables:
+            create_table(conn, db_queries.create_utilization_rollup_sql.format(table=table))
+        create_table(conn, db_queries.create_chassis_poll_state_table)
+        create_table(conn, db_queries.create_inventory_generation_table)
         create_table(conn, db_queries.create_poll_settings_table)
         
         # IxNetwork API Server tables
         create_table(conn, db_queries.create_ixnetwork_user_db_table)
         create_table(conn, db_queries.create_ixnetwork_api_server_details_table)
         
-        # Close the connection
-        conn.close()
+        # Upgrade existing databases in place: columns and indexes added since creation.
+        # A failed migration is fatal: the app must not start on an unknown schema_version
+        # (docker-entrypoint.sh runs under set -e and stops on the non-zero exit)
+        try:
+            version = db_migrations.migrate(conn)
+            print(f"[INIT] Database schema version {version}")
+        except Exception as e:
+            print(f"[INIT] Schema migration failed: {e}")
+            raise
+        finally:
+            # Close the connection
+            conn.close()
         print(f"[INIT] Database tables created successfully")
     else:
         print("[INIT] Error: Could not create database connection")
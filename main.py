@@ -2,11 +2,21 @@ from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 import os
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    yield
+    # Close the pooled SQLite connections (see app.database.ConnectionPool)
+    from app.database import close_db_pool
+    await close_db_pool()
+
+
 app = FastAPI(
     title="Ixia Inventory Explorer",
     version="2.0.0",
@@ -14,7 +24,8 @@ app = FastAPI(
     # IMPORTANT: Disable redirect_slashes to prevent 307 redirects
     # that break reverse proxy/ngrok setups (the redirect URL contains 
     # the internal server address which clients can't reach)
-    redirect_slashes=False
+    redirect_slashes=False,
+    lifespan=lifespan
 )
 
 # CORS configuration - Deployment Agnostic
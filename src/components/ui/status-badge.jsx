@@ -16,6 +16,7 @@ const statusMap = {
   init:            'badge-amber',
   configuring:     'badge-amber',
   testing:         'badge-amber',
+  suspended:       'badge-amber',
 }
 
 function normalizeStatus(status) {
@@ -24,6 +24,7 @@ export const pollSensors = () => api.post('/api/poll/sensors')
 // Performance endpoints
 export const getChassisList = () => api.get('/api/performance/chassis-list')
 export const getPerformanceMetrics = (ip) => api.get(`/api/performance/metrics/${ip}`)
+export const getFleetMetrics = (params) => api.get('/api/performance/fleet', { params })
 
 // Tags endpoints
 export const addTags = (data) => api.post('/api/tags/add', data)
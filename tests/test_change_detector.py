@@ -0,0 +1,89 @@
+"""
+Card rows skipped by the poller's change detection come back after the
+inventory was emptied outside the poller (reset, chassis deleted or re-added).
+"""
+import asyncio
+
+import pytest
+
+import app.database as database
+import data_poller
+
+CHASSIS_IP = "10.0.0.1"
+
+
+def _cards(chassis_ip):
+    return [{
+        "chassisIp": chassis_ip, "chassisType": "XGS12", "cardNumber": number,
+        "serialNumber": f"SN{number}", "cardType": "NOVUS", "cardState": "UP", "numberOfPorts": 4
+    } for number in (1, 2)]
+
+
+@pytest.fixture
+def poller(tmp_path, monkeypatch):
+    path = str(tmp_path / "inventory.db")
+    monkeypatch.setenv("DATABASE_PATH", path)
+    monkeypatch.setattr(database, "DATABASE_PATH", path)
+    monkeypatch.chdir(tmp_path)
+    # init_db creates the tables on import, only once DATABASE_PATH points at tmp_path
+    import init_db
+    init_db.create_data_tables()
+
+    async def fake_session(chassis):
+        return object()
+
+    async def fake_cards(session, chassis_ip, chassis_type):
+        return _cards(chassis_ip)
+
+    monkeypatch.setattr(data_poller.chassis_sessions, "get", fake_session)
+    monkeypatch.setattr(data_poller.ixOSRestCaller, "get_chassis_cards_information_async", fake_cards)
+    monkeypatch.setattr(data_poller, "change_detector", data_poller.ChangeDetector(max_age=900))
+    monkeypatch.setattr(data_poller, "chassis_config", data_poller.ChassisListCache())
+    return data_poller
+
+
+async def _card_count():
+    return len(await database.read_data_from_database("chassis_card_details"))
+
+
+def test_cards_written_again_after_reset_and_re_add(poller):
+    async def scenario():
+        try:
+            await database.write_username_password_to_database(f"ADD,{CHASSIS_IP},admin,admin")
+            await poller.get_chassis_card_data()
+            assert await _card_count() == 2
+
+            # Unchanged cards are skipped while the rows are still there
+            stats = {}
+            await poller.stream_to_database("chassis_card_details",
+                                            [poller.fetch_chassis_card_for_one({"ip": CHASSIS_IP, "username": "admin",
+                                                                                "password": "admin"}, "XGS12")],
+                                            detect_changes=True, stats=stats)
+            assert stats.get("unchanged") == 1
+
+            await database.reset_database()
+            # An empty sweep runs while no chassis is configured
+            await poller.get_chassis_card_data()
+            await database.write_username_password_to_database(f"ADD,{CHASSIS_IP},admin,admin")
+            await poller.get_chassis_card_data()
+            assert await _card_count() == 2
+        finally:
+            await database.close_db_pool()
+
+    asyncio.run(scenario())
+
+
+def test_cards_written_again_after_chassis_delete(poller):
+    async def scenario():
+        try:
+            await database.write_username_password_to_database(f"ADD,{CHASSIS_IP},admin,admin")
+            await poller.get_chassis_card_data()
+            await database.delete_chassis_from_database(CHASSIS_IP)
+            assert await _card_count() == 0
+
+            await poller.get_chassis_card_data()
+            assert await _card_count() == 2
+        finally:
+            await database.close_db_pool()
+
+    asyncio.run(scenario())